@@ -0,0 +1,57 @@
+"""Compare single-shot and chunked add-documents throughput.
+
+The stand-in server charges a fixed 20ms per request plus transfer time at
+~100MB/s, roughly what a Meilisearch node on the same network looks like.
+
+    python -m benchmarks.chunked_upload
+"""
+
+import asyncio
+import time
+
+import httpx
+
+from src.meilisearch_mcp.client import MeilisearchClient
+
+DOCUMENTS = 200_000
+REQUEST_OVERHEAD = 0.02
+BYTES_PER_SECOND = 100 * 1024 * 1024
+
+
+async def handler(request: httpx.Request) -> httpx.Response:
+    body = await request.aread()
+    await asyncio.sleep(REQUEST_OVERHEAD + len(body) / BYTES_PER_SECOND)
+    return httpx.Response(202, json={"taskUid": 1, "status": "enqueued"})
+
+
+def make_documents():
+    return [
+        {"id": i, "title": f"Document {i}", "body": "lorem ipsum " * 40}
+        for i in range(DOCUMENTS)
+    ]
+
+
+async def main():
+    client = MeilisearchClient(
+        "http://meili.bench", http_transport=httpx.MockTransport(handler)
+    )
+    documents = make_documents()
+
+    start = time.perf_counter()
+    await client.transport.post("/indexes/bench/documents", documents)
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = await client.documents.add_documents("bench", documents)
+    chunked = time.perf_counter() - start
+    await client.close()
+
+    print(f"single-shot: {DOCUMENTS / single:,.0f} docs/s ({single:.2f}s)")
+    print(
+        f"    chunked: {DOCUMENTS / chunked:,.0f} docs/s ({chunked:.2f}s, "
+        f"{result['chunks']} chunks)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
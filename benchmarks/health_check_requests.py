@@ -0,0 +1,63 @@
+"""Count upstream requests and time per get-health-status call.
+
+The stand-in server answers every request after 5ms, and the database holds
+INDEXES indexes. The previous implementation issued 2 + INDEXES serial requests.
+
+    python -m benchmarks.health_check_requests
+"""
+
+import asyncio
+import time
+
+import httpx
+
+from src.meilisearch_mcp.client import MeilisearchClient
+
+INDEXES = 300
+LATENCY = 0.005
+
+STATS = {
+    "databaseSize": 1 << 30,
+    "lastUpdate": "2024-01-01T10:00:00Z",
+    "indexes": {
+        f"index-{i}": {"numberOfDocuments": i, "isIndexing": False}
+        for i in range(INDEXES)
+    },
+}
+
+
+async def main():
+    requests = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal requests
+        requests += 1
+        await asyncio.sleep(LATENCY)
+        if request.url.path == "/stats":
+            return httpx.Response(200, json=STATS)
+        return httpx.Response(
+            200,
+            json={
+                "numberOfDocuments": 1,
+                "isIndexing": False,
+                "fieldDistribution": {"id": 1},
+            },
+        )
+
+    client = MeilisearchClient(
+        "http://meili.bench", http_transport=httpx.MockTransport(handler)
+    )
+    for detailed in (False, True):
+        requests = 0
+        start = time.perf_counter()
+        await client.monitoring.get_health_status(detailed)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(
+            f"detailed={detailed!s:<5} requests={requests:<4} "
+            f"time={elapsed:.1f}ms (previously {2 + INDEXES} serial requests)"
+        )
+    await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
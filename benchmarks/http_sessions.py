@@ -0,0 +1,131 @@
+"""Load test the HTTP transport: many MCP sessions against one server process.
+
+The server runs in a child process against a stand-in Meilisearch that
+answers after 5ms. Each session connects over streamable HTTP, initializes,
+runs CALLS searches and disconnects, with SESSIONS sessions in flight at
+once. All sessions share the server's client, so cached searches and pooled
+connections are reused across sessions.
+
+    python -m benchmarks.http_sessions
+"""
+
+import asyncio
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+import uvicorn
+from mcp import ClientSession
+
+try:
+    from mcp.client.streamable_http import streamable_http_client
+except ImportError:  # SDK versions before the rename
+    from mcp.client.streamable_http import (
+        streamablehttp_client as streamable_http_client,
+    )
+
+from src.meilisearch_mcp.client import MeilisearchClient
+from src.meilisearch_mcp.server import create_server
+
+TOTAL_SESSIONS = 100
+SESSIONS = 20
+CALLS = 10
+QUERIES = 5
+LATENCY = 0.005
+
+
+async def handler(request: httpx.Request) -> httpx.Response:
+    await asyncio.sleep(LATENCY)
+    return httpx.Response(200, json={"hits": [{"id": 1, "title": "Dune"}]})
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def session(url: str, latencies: list):
+    async with streamable_http_client(url) as (read_stream, write_stream, _):
+        async with ClientSession(read_stream, write_stream) as client:
+            await client.initialize()
+            for i in range(CALLS):
+                start = time.perf_counter()
+                await client.call_tool(
+                    "search", {"query": f"query {i % QUERIES}", "indexUid": "movies"}
+                )
+                latencies.append(time.perf_counter() - start)
+
+
+async def serve(port: int):
+    server = create_server()
+    server.meili_client = MeilisearchClient(
+        "http://meili.bench", http_transport=httpx.MockTransport(handler)
+    )
+    config = uvicorn.Config(
+        server.create_http_app(), host="127.0.0.1", port=port, log_level="error"
+    )
+    try:
+        await uvicorn.Server(config).serve()
+    finally:
+        await server.cleanup()
+
+
+async def wait_for_port(port: int):
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.05)
+
+
+async def main():
+    port = free_port()
+    child = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.http_sessions", str(port)],
+        stderr=subprocess.DEVNULL,
+    )
+    await wait_for_port(port)
+
+    url = f"http://127.0.0.1:{port}/mcp"
+    latencies = []
+    semaphore = asyncio.Semaphore(SESSIONS)
+
+    async def bounded():
+        async with semaphore:
+            await session(url, latencies)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(bounded() for _ in range(TOTAL_SESSIONS)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(
+        f"{TOTAL_SESSIONS} sessions ({SESSIONS} concurrent, {CALLS} calls each) "
+        f"in {elapsed:.2f}s: {TOTAL_SESSIONS / elapsed:.1f} sessions/s"
+    )
+    print(
+        f"call latency p50={statistics.median(latencies) * 1000:.1f}ms "
+        f"p99={latencies[int(len(latencies) * 0.99)] * 1000:.1f}ms"
+    )
+
+    # One more session reads the cache counters every session contributed to
+    async with streamable_http_client(url) as (read_stream, write_stream, _):
+        async with ClientSession(read_stream, write_stream) as client:
+            await client.initialize()
+            stats = await client.call_tool("get-cache-stats", {})
+    print(stats.content[0].text)
+    child.terminate()
+    child.wait()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        asyncio.run(serve(int(sys.argv[1])))
+    else:
+        asyncio.run(main())
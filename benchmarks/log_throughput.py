@@ -0,0 +1,54 @@
+"""Measure structured log records written per second by the file handler.
+
+The previous handler opened, appended to and closed the log file for every
+record, after formatting the date to check for rotation. That loop is timed
+inline here against FileLogHandler, which keeps the file open and writes
+batches.
+
+    python -m benchmarks.log_throughput
+"""
+
+import json
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from src.meilisearch_mcp.logging import FileLogHandler
+
+RECORDS = 50_000
+RECORD = {
+    "timestamp": "2024-01-01T10:00:00",
+    "level": "INFO",
+    "message": "Tool call",
+    "tool": "search",
+}
+
+
+def per_record(log_dir: Path) -> float:
+    start = time.perf_counter()
+    for _ in range(RECORDS):
+        date_str = datetime.now().strftime("%Y-%m-%d")
+        with open(log_dir / f"meilisearch-mcp-{date_str}.log", "a") as f:
+            f.write(json.dumps(RECORD) + "\n")
+    return time.perf_counter() - start
+
+
+def batched(log_dir: Path) -> float:
+    start = time.perf_counter()
+    handler = FileLogHandler(str(log_dir), max_buffer=RECORDS)
+    for _ in range(RECORDS):
+        handler.emit(RECORD)
+    handler.shutdown()
+    return time.perf_counter() - start
+
+
+def main():
+    for name, run in (("per-record open/close", per_record), ("batched", batched)):
+        with tempfile.TemporaryDirectory() as log_dir:
+            elapsed = run(Path(log_dir))
+        print(f"{name:<22} {RECORDS / elapsed:>10,.0f} records/s")
+
+
+if __name__ == "__main__":
+    main()
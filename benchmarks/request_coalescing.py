@@ -0,0 +1,78 @@
+"""Upstream requests and wall time for bursts of identical concurrent reads.
+
+CALLERS agents issue the same get-settings, get-stats, list-indexes and
+search call at once against a stand-in server that answers after 20ms, with
+single-flight coalescing off and on.
+
+    python -m benchmarks.request_coalescing
+"""
+
+import asyncio
+import time
+
+import httpx
+
+from src.meilisearch_mcp.client import MeilisearchClient
+
+CALLERS = 50
+ROUNDS = 20
+LATENCY = 0.02
+
+RESPONSES = {
+    "/stats": {"databaseSize": 1 << 30, "indexes": {"movies": {}}},
+    "/indexes": {
+        "results": [{"uid": "movies", "primaryKey": "id"}],
+        "offset": 0,
+        "limit": 20,
+        "total": 1,
+    },
+    "/indexes/movies/settings": {"rankingRules": ["words", "typo"]},
+    "/indexes/movies/search": {"hits": [{"id": 1}], "query": "dune"},
+}
+
+CALLS = {
+    "get-settings": lambda client: client.settings.get_settings("movies"),
+    "get-stats": lambda client: client.get_stats(),
+    "list-indexes": lambda client: client.get_indexes(),
+    # A fresh cache per round, so every search reaches the transport
+    "search": lambda client: client.search("dune", index_uid="movies"),
+}
+
+
+async def run(name: str, coalesce: bool):
+    requests = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal requests
+        requests += 1
+        await asyncio.sleep(LATENCY)
+        return httpx.Response(200, json=RESPONSES[request.url.path])
+
+    client = MeilisearchClient(
+        "http://meili.bench", http_transport=httpx.MockTransport(handler)
+    )
+    client.transport.flights.enabled = coalesce
+
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        client.search_cache.invalidate()
+        await asyncio.gather(*(CALLS[name](client) for _ in range(CALLERS)))
+    elapsed = time.perf_counter() - start
+    stats = client.transport.flights.get_stats()
+    await client.close()
+    return requests, elapsed, stats["coalesced"]
+
+
+async def main():
+    for name in CALLS:
+        for coalesce in (False, True):
+            requests, elapsed, coalesced = await run(name, coalesce)
+            print(
+                f"{name:<13} coalesce={coalesce!s:<5} requests={requests:<5} "
+                f"coalesced={coalesced:<5} time={elapsed * 1000:.0f}ms "
+                f"({ROUNDS} rounds of {CALLERS} callers)"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,75 @@
+"""Compare response encodings of large search and document results.
+
+Tools used to return either a Python repr (str(dict)) or json.dumps with
+indent=2. encode_response emits compact JSON, through orjson when installed.
+
+    python -m benchmarks.response_encoding
+"""
+
+import json
+import time
+
+from src.meilisearch_mcp import encoding
+from src.meilisearch_mcp.encoding import encode_response, json_serializer
+
+ROUNDS = 20
+
+SEARCH = {
+    "hits": [
+        {
+            "id": i,
+            "title": f"Movie {i}",
+            "overview": "A long overview of the plot " * 8,
+            "genres": ["Drama", "Science Fiction"],
+            "release_date": 1_600_000_000 + i,
+            "_rankingScore": 1 / (i + 1),
+        }
+        for i in range(1000)
+    ],
+    "query": "movie",
+    "processingTimeMs": 3,
+    "limit": 1000,
+    "offset": 0,
+    "estimatedTotalHits": 5000,
+}
+
+DOCUMENTS = {
+    "results": [{"id": i, "title": f"Book {i}", "pages": i % 900} for i in range(5000)],
+    "offset": 0,
+    "limit": 5000,
+    "total": 5000,
+}
+
+
+def measure(encode, value):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        text = encode(value)
+    return (time.perf_counter() - start) / ROUNDS * 1000, len(text)
+
+
+def stdlib_compact(value):
+    fast, encoding.orjson = encoding.orjson, None
+    try:
+        return encode_response(value)
+    finally:
+        encoding.orjson = fast
+
+
+def main():
+    encoders = [
+        ("str(dict)", str),
+        ("json indent=2", lambda v: json.dumps(v, indent=2, default=json_serializer)),
+        ("compact (json)", stdlib_compact),
+    ]
+    if encoding.orjson is not None:
+        encoders.append(("compact (orjson)", encode_response))
+    for name, value in (("search, 1000 hits", SEARCH), ("documents, 5000", DOCUMENTS)):
+        print(name)
+        for label, encode in encoders:
+            ms, size = measure(encode, value)
+            print(f"  {label:<18} {ms:>7.2f}ms  {size / 1024:>7.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Measure search latency while a bulk ingest is in flight.
+
+Runs against an in-process stand-in for Meilisearch that answers searches in
+~5ms and document uploads in ~2s, so the numbers isolate the MCP client side.
+Every search uses a distinct query, so each one misses the search cache and
+reaches the transport.
+
+    python -m benchmarks.search_under_ingest
+"""
+
+import asyncio
+import statistics
+import time
+
+import httpx
+
+from src.meilisearch_mcp.client import MeilisearchClient
+
+SEARCH_LATENCY = 0.005
+INGEST_LATENCY = 2.0
+SEARCHES = 200
+
+
+async def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/documents"):
+        await asyncio.sleep(INGEST_LATENCY)
+        return httpx.Response(202, json={"taskUid": 1, "status": "enqueued"})
+    await asyncio.sleep(SEARCH_LATENCY)
+    return httpx.Response(200, json={"hits": [], "query": "bench"})
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def measure(client: MeilisearchClient, phase: str):
+    samples = []
+    for i in range(SEARCHES):
+        start = time.perf_counter()
+        await client.search(f"bench {phase} {i}", index_uid="movies")
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+async def main():
+    client = MeilisearchClient(
+        "http://meili.bench", http_transport=httpx.MockTransport(handler)
+    )
+
+    idle = await measure(client, "idle")
+
+    ingest = asyncio.create_task(
+        client.documents.add_documents("movies", [{"id": i} for i in range(10_000)])
+    )
+    busy = await measure(client, "busy")
+    await ingest
+    cache_hits = client.search_cache.get_stats()["hits"]
+    await client.close()
+    assert cache_hits == 0, "searches must reach the transport"
+
+    for label, samples in (("idle", idle), ("during ingest", busy)):
+        print(
+            f"{label:>14}: p50={statistics.median(samples):.2f}ms "
+            f"p99={percentile(samples, 99):.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,159 @@
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Set
+
+
+@dataclass
+class CacheEntry:
+    """A cached search response"""
+
+    value: Dict[str, Any]
+    index_uid: Optional[str]
+    size: int
+    expires_at: float
+
+
+class SearchCache:
+    """
+    LRU + TTL cache for search responses, bounded by entry count and bytes.
+    Entries are tracked per index so writes can invalidate them; entries for
+    cross-index searches (index_uid None) are dropped on any invalidation.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        max_bytes: int = 8 * 1024 * 1024,
+        ttl: float = 60.0,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._by_index: Dict[Optional[str], Set[str]] = {}
+        self._last_task_uid: Dict[Optional[str], int] = {}
+        # Bumped on every invalidation so responses fetched before a write
+        # are not stored after it
+        self.generation = 0
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(index_uid: Optional[str], query: str, params: Dict[str, Any]) -> str:
+        """Build a cache key from normalized search parameters"""
+        return json.dumps(
+            {"index": index_uid, "q": query, "params": params},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached response, or None on a miss"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def put(
+        self,
+        key: str,
+        index_uid: Optional[str],
+        value: Dict[str, Any],
+        generation: Optional[int] = None,
+    ):
+        """Store a response, evicting least recently used entries to fit"""
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+        if generation is not None and generation != self.generation:
+            return
+        size = len(json.dumps(value, separators=(",", ":"), default=str))
+        if size > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = CacheEntry(
+            value, index_uid, size, time.monotonic() + self.ttl
+        )
+        self._by_index.setdefault(index_uid, set()).add(key)
+        self.size += size
+
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, index_uid: Optional[str] = None):
+        """Drop entries for one index (plus cross-index entries), or everything"""
+        self.generation += 1
+        if index_uid is None:
+            keys = list(self._entries)
+        else:
+            keys = list(self._by_index.get(index_uid, ()))
+            keys.extend(self._by_index.get(None, ()))
+        for key in keys:
+            self._remove(key)
+        self.invalidations += len(keys)
+
+    def reset(self):
+        """Forget all entries and observed tasks, e.g. after switching servers"""
+        self.invalidate()
+        self._last_task_uid.clear()
+
+    def observe_task(self, task: Dict[str, Any]):
+        """Invalidate the affected index the first time its task is seen succeeded"""
+        if not isinstance(task, dict) or task.get("status") != "succeeded":
+            return
+        index_uid = task.get("indexUid")
+        if index_uid is None and task.get("type") != "indexSwap":
+            return
+        task_uid = task.get("uid", task.get("taskUid", -1))
+        if task_uid <= self._last_task_uid.get(index_uid, -1):
+            return
+        self._last_task_uid[index_uid] = task_uid
+
+        if index_uid is not None:
+            self.invalidate(index_uid)
+            return
+        for swap in (task.get("details") or {}).get("swaps", []):
+            for swapped_uid in swap.get("indexes", []):
+                self.invalidate(swapped_uid)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self.size -= entry.size
+        keys = self._by_index.get(entry.index_uid)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._by_index[entry.index_uid]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache counters"""
+        return {
+            "entries": len(self._entries),
+            "bytes": self.size,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
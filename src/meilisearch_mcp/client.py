@@ -1,7 +1,12 @@
+import asyncio
+import heapq
 import httpx
-from meilisearch import Client
 from typing import Optional, Dict, Any, List
 
+from .errors import MeilisearchConnectionError, operation_failed
+from .resilience import ResilienceConfig
+from .transport import MeilisearchTransport, MeilisearchApiError, PoolConfig
+from .cache import SearchCache
 from .indexes import IndexManager
 from .documents import DocumentManager
 from .tasks import TaskManager
@@ -12,37 +17,109 @@ from .monitoring import MonitoringManager
 
 logger = MCPLogger()
 
+# Maximum number of per-index searches in flight when /multi-search is unusable
+SEARCH_FANOUT_CONCURRENCY = 8
+
+
+def merge_ranked_hits(
+    results: Dict[str, Any], limit: int, offset: int = 0
+) -> List[Dict[str, Any]]:
+    """
+    Merge per-index search results into one list ordered by _rankingScore.
+    Only the best limit + offset hits are held at any time, each tagged with
+    the uid of the index it came from.
+    """
+    keep = limit + offset
+    if keep <= 0:
+        return []
+
+    heap = []
+    sequence = 0
+    for index_uid, result in results.items():
+        for hit in result["hits"]:
+            # The negated sequence breaks score ties in favour of earlier hits
+            entry = (hit.get("_rankingScore", 0.0), -sequence, index_uid, hit)
+            sequence += 1
+            if len(heap) < keep:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+
+    ranked = sorted(heap, key=lambda entry: entry[:2], reverse=True)[offset:]
+    return [{**hit, "_indexUid": index_uid} for _, _, index_uid, hit in ranked]
+
 
 class MeilisearchClient:
     def __init__(
-        self, url: str = "http://localhost:7700", api_key: Optional[str] = None
+        self,
+        url: str = "http://localhost:7700",
+        api_key: Optional[str] = None,
+        http_transport: Optional[httpx.AsyncBaseTransport] = None,
+        default_fields: Optional[Dict[str, List[str]]] = None,
+        pool: Optional[PoolConfig] = None,
+        replicas: Optional[List[str]] = None,
+        resilience: Optional[ResilienceConfig] = None,
     ):
         """Initialize Meilisearch client"""
         self.url = url
         self.api_key = api_key
-        self.client = Client(url, api_key)
-        self.indexes = IndexManager(self.client)
-        self.documents = DocumentManager(self.client)
-        self.settings = SettingsManager(self.client)
-        self.tasks = TaskManager(self.client)
-        self.keys = KeyManager(self.client)
-        self.monitoring = MonitoringManager(self.client)
+        # Attributes returned per index when a call does not choose its own
+        self.default_fields = default_fields or {}
+        self.transport = MeilisearchTransport(
+            url,
+            api_key,
+            http_transport=http_transport,
+            pool=pool,
+            replicas=replicas,
+            resilience=resilience,
+        )
+        self.search_cache = SearchCache()
+        self.indexes = IndexManager(self.transport, self.search_cache)
+        self.documents = DocumentManager(
+            self.transport, self.search_cache, self.default_fields
+        )
+        self.settings = SettingsManager(self.transport, self.search_cache)
+        self.tasks = TaskManager(self.transport, self.search_cache)
+        self.keys = KeyManager(self.transport)
+        self.monitoring = MonitoringManager(self.transport)
+
+    async def close(self):
+        """Stop background work and close the shared HTTP connection pool"""
+        await self.tasks.close()
+        await self.monitoring.sampler.stop()
+        await self.transport.aclose()
+
+    async def update_connection(
+        self, url: Optional[str] = None, api_key: Optional[str] = None
+    ) -> bool:
+        """
+        Switch to a new URL or API key, keeping the connection pool and
+        managers. Cached searches are dropped, since a key may see different
+        indexes. Returns whether the URL changed, in which case task waits and
+        metric samples of the old server are dropped too.
+        """
+        previous_url = self.transport.url
+        self.transport.reconfigure(url, api_key)
+        self.url = self.transport.url
+        self.api_key = self.transport.api_key
+        self.search_cache.reset()
+        if self.url == previous_url:
+            return False
+        await self.tasks.reset(f"Connection switched to {self.url}")
+        self.monitoring.sampler.reset()
+        return True
 
     async def health_check(self) -> bool:
         """Check if Meilisearch is healthy"""
-        try:
-            response = self.client.health()
-            return response.get("status") == "available"
-        except Exception:
-            return False
+        return await self.transport.check_health()
 
     async def get_version(self) -> Dict[str, Any]:
         """Get Meilisearch version information"""
-        return self.client.get_version()
+        return await self.transport.get("/version")
 
     async def get_stats(self) -> Dict[str, Any]:
         """Get database stats"""
-        return self.client.get_all_stats()
+        return await self.transport.get("/stats")
 
     async def search(
         self,
@@ -52,12 +129,14 @@ class MeilisearchClient:
         offset: Optional[int] = 0,
         filter: Optional[str] = None,
         sort: Optional[List[str]] = None,
+        merge: bool = False,
         **kwargs
     ) -> Dict[str, Any]:
         """
         Search through Meilisearch indices.
         If index_uid is provided, search in that specific index.
-        If not provided, search across all available indices.
+        If not provided, search across all available indices. With merge, the
+        hits of all indices are ranked together and only the global top limit kept.
         """
         try:
             # Prepare search parameters, removing None values
@@ -74,45 +153,150 @@ class MeilisearchClient:
             # Add any additional parameters
             search_params.update({k: v for k, v in kwargs.items() if v is not None})
 
+            cache_index = index_uid or None
+            cache_key = self.search_cache.make_key(
+                cache_index, query, {**search_params, "merge": merge}
+            )
+            cached = self.search_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            generation = self.search_cache.generation
+
             if index_uid:
                 # Search in specific index
-                index = self.client.index(index_uid)
-                return index.search(query, search_params)
+                result = await self.transport.post(
+                    f"/indexes/{index_uid}/search",
+                    {"q": query, **self._projected(index_uid, search_params)},
+                )
+            elif merge:
+                # Ask every index for enough scored hits to fill the global page
+                limit, offset = search_params["limit"], search_params["offset"]
+                results = await self._search_all_indexes(
+                    query,
+                    {
+                        **search_params,
+                        "limit": limit + offset,
+                        "offset": 0,
+                        "showRankingScore": True,
+                    },
+                )
+                result = {
+                    "multi_index": True,
+                    "merged": True,
+                    "query": query,
+                    "limit": limit,
+                    "offset": offset,
+                    "hits": merge_ranked_hits(results, limit, offset),
+                }
             else:
                 # Search across all indices
-                results = {}
-                indexes = self.client.get_indexes()
-                
-                for index in indexes["results"]:
-                    try:
-                        search_result = index.search(query, search_params)
-                        if search_result["hits"]:  # Only include indices with matches
-                            results[index.uid] = search_result
-                    except Exception as e:
-                        logger.warning(f"Failed to search index {index.uid}: {str(e)}")
-                        continue
-                
-                return {
+                results = await self._search_all_indexes(query, search_params)
+                result = {
                     "multi_index": True,
                     "query": query,
                     "results": results
                 }
-                
+
+            self.search_cache.put(cache_key, cache_index, result, generation)
+            return result
+
         except Exception as e:
-            raise Exception(f"Search failed: {str(e)}")
+            raise operation_failed("Search failed", e)
+
+    def _projected(
+        self, index_uid: str, search_params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Apply the index's default projection unless the call chose attributes"""
+        fields = self.default_fields.get(index_uid)
+        if fields is None or "attributesToRetrieve" in search_params:
+            return search_params
+        return {**search_params, "attributesToRetrieve": fields}
+
+    async def _list_index_uids(self) -> List[str]:
+        """Collect the uid of every index, following pagination"""
+        uids = []
+        offset = 0
+        while True:
+            page = await self.indexes.list_indexes({"offset": offset, "limit": 1000})
+            uids.extend(index["uid"] for index in page["results"])
+            offset += len(page["results"])
+            if not page["results"] or offset >= page["total"]:
+                return uids
+
+    async def _search_all_indexes(
+        self, query: str, search_params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Search every index in one /multi-search request, keeping indexes with hits"""
+        index_uids = await self._list_index_uids()
+        if not index_uids:
+            return {}
+
+        try:
+            response = await self.transport.post(
+                "/multi-search",
+                {
+                    "queries": [
+                        {
+                            "indexUid": uid,
+                            "q": query,
+                            **self._projected(uid, search_params),
+                        }
+                        for uid in index_uids
+                    ]
+                },
+            )
+            # Responses may be shared by coalesced callers, so copy, don't pop
+            per_index = {
+                result["indexUid"]: {
+                    key: value for key, value in result.items() if key != "indexUid"
+                }
+                for result in response["results"]
+            }
+        except MeilisearchConnectionError:
+            raise
+        except MeilisearchApiError as e:
+            # Older servers lack /multi-search, and one invalid query (e.g. a filter
+            # on an attribute only some indexes allow) rejects the whole batch.
+            logger.info(f"Multi-search unavailable, searching per index: {str(e)}")
+            per_index = await self._fan_out_search(index_uids, query, search_params)
+
+        return {uid: result for uid, result in per_index.items() if result["hits"]}
+
+    async def _fan_out_search(
+        self, index_uids: List[str], query: str, search_params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Search indexes concurrently with a bounded number of requests in flight"""
+        semaphore = asyncio.Semaphore(SEARCH_FANOUT_CONCURRENCY)
+
+        async def search_index(uid: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await self.transport.post(
+                        f"/indexes/{uid}/search",
+                        {"q": query, **self._projected(uid, search_params)},
+                    )
+                except Exception as e:
+                    logger.warning(f"Failed to search index {uid}: {str(e)}")
+                    return None
+
+        responses = await asyncio.gather(*(search_index(uid) for uid in index_uids))
+        return {
+            uid: result
+            for uid, result in zip(index_uids, responses)
+            if result is not None
+        }
 
     async def get_indexes(self) -> Dict[str, Any]:
         """Get all indexes"""
-        indexes = self.client.get_indexes()
-        # Convert Index objects to serializable dictionaries
+        indexes = await self.indexes.list_indexes()
         serialized_indexes = []
         for index in indexes["results"]:
             serialized_indexes.append(
                 {
-                    "uid": index.uid,
-                    "primaryKey": index.primary_key,
-                    "createdAt": index.created_at,
-                    "updatedAt": index.updated_at,
+                    "uid": index["uid"],
+                    "primaryKey": index.get("primaryKey"),
+                    "createdAt": index.get("createdAt"),
+                    "updatedAt": index.get("updatedAt"),
                 }
             )
 
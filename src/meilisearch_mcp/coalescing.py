@@ -0,0 +1,50 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Share one in-flight call among concurrent callers asking for the same
+    key. The call is forgotten as soon as it completes, so results are never
+    served after the fact: a later caller starts a new call.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._flights: Dict[Hashable, asyncio.Future] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        """Run call, or join the identical call already in flight"""
+        if not self.enabled:
+            self.calls += 1
+            return await call()
+        flight = self._flights.get(key)
+        if flight is None:
+            self.calls += 1
+            # Run as a task so a cancelled caller does not fail the others
+            flight = asyncio.ensure_future(call())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done: self._land(key, done))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(flight)
+
+    def _land(self, key: Hashable, flight: asyncio.Future):
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.cancelled():
+            # Mark the error retrieved when every caller has gone away
+            flight.exception()
+
+    def forget(self):
+        """Make later callers start new calls, e.g. after a write"""
+        self._flights.clear()
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "inFlight": len(self._flights),
+        }
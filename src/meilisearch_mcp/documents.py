@@ -1,12 +1,75 @@
-from typing import Dict, Any, List, Optional, Union
-from meilisearch import Client
+import asyncio
+import contextlib
+import json
+import time
+from collections import deque
+from typing import (
+    Dict,
+    Any,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+
+from .errors import operation_failed
+from .transport import MeilisearchTransport
+from .cache import SearchCache
+from .streams import DocumentFileReader, DocumentFileWriter
+
+
+# Upper bounds for a single add-documents payload
+MAX_CHUNK_BYTES = 8 * 1024 * 1024
+MAX_CHUNK_DOCUMENTS = 10_000
+# Payloads serialized ahead of the upload in progress
+UPLOAD_PREFETCH = 4
+# Documents per page and pages fetched ahead while exporting
+EXPORT_PAGE_SIZE = 1000
+EXPORT_PREFETCH = 2
+
+
+def chunk_documents(
+    documents: Iterable[Dict[str, Any]],
+    max_bytes: int = MAX_CHUNK_BYTES,
+    max_documents: int = MAX_CHUNK_DOCUMENTS,
+) -> Iterator[bytes]:
+    """
+    Serialize documents into JSON array payloads bounded by byte size and
+    document count. A single document larger than max_bytes is sent alone.
+    """
+    batch = []
+    size = 2
+    for document in documents:
+        encoded = json.dumps(
+            document, separators=(",", ":"), ensure_ascii=False
+        ).encode()
+        if batch and (
+            len(batch) >= max_documents or size + len(encoded) + 1 > max_bytes
+        ):
+            yield b"[" + b",".join(batch) + b"]"
+            batch = []
+            size = 2
+        batch.append(encoded)
+        size += len(encoded) + 1
+    if batch:
+        yield b"[" + b",".join(batch) + b"]"
 
 
 class DocumentManager:
     """Manage documents within Meilisearch indexes"""
 
-    def __init__(self, client: Client):
-        self.client = client
+    def __init__(
+        self,
+        transport: MeilisearchTransport,
+        search_cache: SearchCache,
+        default_fields: Optional[Dict[str, List[str]]] = None,
+    ):
+        self.transport = transport
+        self.search_cache = search_cache
+        self.default_fields = default_fields if default_fields is not None else {}
 
     async def get_documents(
         self,
@@ -15,72 +78,297 @@ class DocumentManager:
         limit: Optional[int] = None,
         fields: Optional[List[str]] = None,
     ) -> Dict[str, Any]:
-        """Get documents from an index"""
+        """Get documents from an index, limited to the index's default fields if set"""
+        if fields is None:
+            fields = self.default_fields.get(index_uid)
         try:
-            index = self.client.index(index_uid)
-            return index.get_documents(
-                {"offset": offset, "limit": limit, "fields": fields}
+            return await self.transport.get(
+                f"/indexes/{index_uid}/documents",
+                {"offset": offset, "limit": limit, "fields": fields},
             )
         except Exception as e:
-            raise Exception(f"Failed to get documents: {str(e)}")
+            raise operation_failed("Failed to get documents", e)
+
+    async def _fetch_documents(
+        self,
+        index_uid: str,
+        offset: int,
+        limit: int,
+        fields: Optional[List[str]] = None,
+        filter: Optional[Any] = None,
+    ) -> Dict[str, Any]:
+        """Fetch one page of documents, using the fetch route when filtering"""
+        if filter is None:
+            return await self.transport.get(
+                f"/indexes/{index_uid}/documents",
+                {"offset": offset, "limit": limit, "fields": fields},
+            )
+        body = {"offset": offset, "limit": limit, "filter": filter}
+        if fields is not None:
+            body["fields"] = fields
+        return await self.transport.post(
+            f"/indexes/{index_uid}/documents/fetch", body
+        )
+
+    async def export_documents(
+        self,
+        index_uid: str,
+        path: str,
+        filter: Optional[Any] = None,
+        fields: Optional[List[str]] = None,
+        compress: Optional[bool] = None,
+        page_size: int = EXPORT_PAGE_SIZE,
+        prefetch: int = EXPORT_PREFETCH,
+        on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Export an index to a local NDJSON file (gzip when compress is set or the
+        path ends in .gz). Up to `prefetch` pages are fetched while the current
+        one is written, so at most prefetch + 1 pages are held in memory.
+        """
+        start = time.perf_counter()
+        try:
+            page = await self._fetch_documents(index_uid, 0, page_size, fields, filter)
+            total = page["total"]
+            next_offset = page_size
+            pending = deque()
+
+            def schedule():
+                nonlocal next_offset
+                while len(pending) < prefetch and next_offset < total:
+                    pending.append(
+                        asyncio.create_task(
+                            self._fetch_documents(
+                                index_uid, next_offset, page_size, fields, filter
+                            )
+                        )
+                    )
+                    next_offset += page_size
+
+            with DocumentFileWriter(path, compress) as writer:
+                try:
+                    while page["results"]:
+                        schedule()
+                        await asyncio.to_thread(writer.write, page["results"])
+                        if on_progress is not None:
+                            await on_progress(writer.documents, total)
+                        if not pending:
+                            break
+                        page = await pending.popleft()
+                finally:
+                    for fetch in pending:
+                        fetch.cancel()
+        except Exception as e:
+            raise operation_failed("Failed to export documents", e)
+
+        seconds = time.perf_counter() - start
+        return {
+            "path": str(writer.path),
+            "totalDocuments": writer.documents,
+            "bytesWritten": writer.bytes_written,
+            "compressed": writer.compressed,
+            "seconds": round(seconds, 3),
+            "documentsPerSecond": round(writer.documents / seconds) if seconds else None,
+        }
 
     async def get_document(
         self, index_uid: str, document_id: Union[str, int]
     ) -> Dict[str, Any]:
         """Get a single document"""
         try:
-            index = self.client.index(index_uid)
-            return index.get_document(document_id)
+            return await self.transport.get(
+                f"/indexes/{index_uid}/documents/{document_id}"
+            )
         except Exception as e:
-            raise Exception(f"Failed to get document: {str(e)}")
+            raise operation_failed("Failed to get document", e)
 
     async def add_documents(
         self,
         index_uid: str,
         documents: List[Dict[str, Any]],
         primary_key: Optional[str] = None,
+        max_chunk_bytes: int = MAX_CHUNK_BYTES,
+        max_chunk_documents: int = MAX_CHUNK_DOCUMENTS,
+        prefetch: int = UPLOAD_PREFETCH,
     ) -> Dict[str, Any]:
-        """Add documents to an index"""
+        """
+        Add documents to an index, split into size-bounded chunks. Chunks are
+        enqueued in order, so the last copy of a repeated document id wins.
+        """
+        self.search_cache.invalidate(index_uid)
         try:
-            index = self.client.index(index_uid)
-            return index.add_documents(documents, primary_key)
+            task_uids = await self._upload_chunks(
+                index_uid,
+                chunk_documents(documents, max_chunk_bytes, max_chunk_documents),
+                "application/json",
+                {"primaryKey": primary_key},
+                prefetch,
+            )
+        except Exception as e:
+            raise operation_failed("Failed to add documents", e)
+
+        return {
+            "taskUids": task_uids,
+            "chunks": len(task_uids),
+            "totalDocuments": len(documents),
+        }
+
+    async def import_documents(
+        self,
+        index_uid: str,
+        path: str,
+        format: Optional[str] = None,
+        primary_key: Optional[str] = None,
+        csv_delimiter: Optional[str] = None,
+        max_chunk_bytes: int = MAX_CHUNK_BYTES,
+        prefetch: int = UPLOAD_PREFETCH,
+        on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Stream a local NDJSON, CSV or JSON array file (optionally gzip) into an
+        index in size-bounded chunks. on_progress receives bytes read and file size.
+        """
+        self.search_cache.invalidate(index_uid)
+        start = time.perf_counter()
+        try:
+            with DocumentFileReader(path, format, max_chunk_bytes) as reader:
+
+                async def report_progress():
+                    if on_progress is not None:
+                        await on_progress(reader.bytes_read, reader.total_bytes)
+
+                task_uids = await self._upload_chunks(
+                    index_uid,
+                    reader.chunks(),
+                    reader.content_type,
+                    {"primaryKey": primary_key, "csvDelimiter": csv_delimiter},
+                    prefetch,
+                    report_progress,
+                )
         except Exception as e:
-            raise Exception(f"Failed to add documents: {str(e)}")
+            raise operation_failed("Failed to import documents", e)
+
+        return {
+            "taskUids": task_uids,
+            "chunks": len(task_uids),
+            "totalDocuments": reader.documents,
+            "format": reader.format,
+            "bytesRead": reader.total_bytes,
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+
+    async def _upload_chunks(
+        self,
+        index_uid: str,
+        chunks: Iterator[bytes],
+        content_type: str,
+        params: Dict[str, Any],
+        prefetch: int,
+        on_uploaded: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> List[int]:
+        """
+        Upload payloads one after another, so Meilisearch enqueues them in
+        payload order. Up to `prefetch` payloads are produced ahead in a
+        worker thread, overlapping serialization and file reads with network
+        I/O while memory stays bounded. The first failed upload stops the
+        production of further payloads. Returns the task uids in order.
+        """
+        payloads: asyncio.Queue = asyncio.Queue(prefetch)
+        stopped = False
+        reading: Optional[asyncio.Future] = None
+
+        async def produce():
+            nonlocal reading
+            try:
+                while not stopped:
+                    reading = asyncio.ensure_future(
+                        asyncio.to_thread(next, chunks, None)
+                    )
+                    # Shielded so that stopping the producer never abandons a
+                    # read still running in the worker thread
+                    payload = await asyncio.shield(reading)
+                    await payloads.put(payload)
+                    if payload is None:
+                        return
+            except Exception as e:
+                await payloads.put(e)
+
+        producer = asyncio.create_task(produce())
+        task_uids: List[int] = []
+        try:
+            while True:
+                payload = await payloads.get()
+                if payload is None:
+                    break
+                if isinstance(payload, Exception):
+                    raise payload
+                task = await self.transport.request(
+                    "POST",
+                    f"/indexes/{index_uid}/documents",
+                    params=params,
+                    content=payload,
+                    headers={"Content-Type": content_type},
+                )
+                task_uids.append(task["taskUid"])
+                if on_uploaded is not None:
+                    await on_uploaded()
+        except Exception as e:
+            raise operation_failed(
+                f"Upload stopped after enqueuing task uids {task_uids}", e
+            )
+        finally:
+            # Also runs when the tool call is cancelled
+            stopped = True
+            producer.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await producer
+            if reading is not None:
+                # Let the read finish before the caller closes its source
+                await asyncio.wait([reading])
+                if not reading.cancelled():
+                    reading.exception()
+        return task_uids
 
     async def update_documents(
         self, index_uid: str, documents: List[Dict[str, Any]]
     ) -> Dict[str, Any]:
         """Update documents in an index"""
+        self.search_cache.invalidate(index_uid)
         try:
-            index = self.client.index(index_uid)
-            return index.update_documents(documents)
+            return await self.transport.put(
+                f"/indexes/{index_uid}/documents", documents
+            )
         except Exception as e:
-            raise Exception(f"Failed to update documents: {str(e)}")
+            raise operation_failed("Failed to update documents", e)
 
     async def delete_document(
         self, index_uid: str, document_id: Union[str, int]
     ) -> Dict[str, Any]:
         """Delete a single document"""
+        self.search_cache.invalidate(index_uid)
         try:
-            index = self.client.index(index_uid)
-            return index.delete_document(document_id)
+            return await self.transport.delete(
+                f"/indexes/{index_uid}/documents/{document_id}"
+            )
         except Exception as e:
-            raise Exception(f"Failed to delete document: {str(e)}")
+            raise operation_failed("Failed to delete document", e)
 
     async def delete_documents(
         self, index_uid: str, document_ids: List[Union[str, int]]
     ) -> Dict[str, Any]:
         """Delete multiple documents by ID"""
+        self.search_cache.invalidate(index_uid)
         try:
-            index = self.client.index(index_uid)
-            return index.delete_documents(document_ids)
+            return await self.transport.post(
+                f"/indexes/{index_uid}/documents/delete-batch", document_ids
+            )
         except Exception as e:
-            raise Exception(f"Failed to delete documents: {str(e)}")
+            raise operation_failed("Failed to delete documents", e)
 
     async def delete_all_documents(self, index_uid: str) -> Dict[str, Any]:
         """Delete all documents in an index"""
+        self.search_cache.invalidate(index_uid)
         try:
-            index = self.client.index(index_uid)
-            return index.delete_all_documents()
+            return await self.transport.delete(f"/indexes/{index_uid}/documents")
         except Exception as e:
-            raise Exception(f"Failed to delete all documents: {str(e)}")
+            raise operation_failed("Failed to delete all documents", e)
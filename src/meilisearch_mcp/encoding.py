@@ -0,0 +1,43 @@
+import json
+from dataclasses import is_dataclass
+from datetime import date, datetime
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def json_serializer(obj: Any) -> Any:
+    """Custom JSON serializer for objects not serializable by default json code"""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return obj.__dict__
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if hasattr(obj, "__dict__"):
+        return {k: v for k, v in vars(obj).items() if not k.startswith("_")}
+    return str(obj)
+
+
+def encode_response(value: Any, pretty: bool = False) -> str:
+    """
+    Encode a tool result as JSON text: compact by default, indented when
+    pretty. Uses orjson when it is installed.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(value, default=json_serializer, option=option).decode()
+        except TypeError:
+            # Integers beyond 64 bits and other values orjson rejects
+            pass
+    if pretty:
+        return json.dumps(value, indent=2, ensure_ascii=False, default=json_serializer)
+    return json.dumps(
+        value, separators=(",", ":"), ensure_ascii=False, default=json_serializer
+    )
@@ -0,0 +1,154 @@
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import httpx
+
+# Statuses worth retrying: rate limiting and a node or proxy that is
+# temporarily unable to answer
+RETRYABLE_STATUS = (429, 502, 503, 504)
+
+
+class MeilisearchApiError(Exception):
+    """Error response returned by the Meilisearch API"""
+
+    def __init__(
+        self,
+        status_code: Optional[int],
+        message: str,
+        code: Optional[str] = None,
+        error_type: Optional[str] = None,
+        link: Optional[str] = None,
+        retry_after: Optional[float] = None,
+    ):
+        self.status_code = status_code
+        self.message = message
+        self.code = code
+        self.type = error_type
+        self.link = link
+        # Seconds the server asked clients to wait before retrying
+        self.retry_after = retry_after
+        super().__init__(
+            f"{type(self).__name__}. Error code: {code or status_code}. "
+            f"Error message: {message}"
+        )
+
+    @property
+    def retryable(self) -> bool:
+        return self.status_code in RETRYABLE_STATUS
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Structured form of the error, e.g. for logs"""
+        return {
+            "error": type(self).__name__,
+            "status": self.status_code,
+            "code": self.code,
+            "type": self.type,
+            "message": self.message,
+            "link": self.link,
+            "retryable": self.retryable,
+            "retryAfter": self.retry_after,
+        }
+
+    def with_context(self, operation: str) -> "MeilisearchApiError":
+        """Copy of the error with its message prefixed by the failed operation"""
+        error = type(self).__new__(type(self), f"{operation}: {str(self)}")
+        error.__dict__.update(self.__dict__)
+        return error
+
+
+class MeilisearchAuthError(MeilisearchApiError):
+    """Missing or invalid API key, or a key lacking the required action"""
+
+
+class MeilisearchNotFoundError(MeilisearchApiError):
+    """Index, document, task or key that does not exist"""
+
+
+class MeilisearchRateLimitError(MeilisearchApiError):
+    """Too many requests"""
+
+
+class MeilisearchServerError(MeilisearchApiError):
+    """Internal error of Meilisearch or of a proxy in front of it"""
+
+
+class MeilisearchConnectionError(MeilisearchApiError):
+    """No response: the node could not be reached or the request timed out"""
+
+    def __init__(
+        self, url: str, message: str, code: str = "connection_error", **kwargs
+    ):
+        self.url = url
+        super().__init__(None, f"{url}: {message}", code, "system", **kwargs)
+
+    @property
+    def retryable(self) -> bool:
+        return True
+
+
+class CircuitOpenError(MeilisearchConnectionError):
+    """Request refused without contacting a node that keeps failing"""
+
+    def __init__(self, url: str, retry_after: float):
+        super().__init__(
+            url,
+            f"circuit open after repeated failures, retry in {retry_after:.1f}s",
+            "circuit_open",
+            retry_after=retry_after,
+        )
+
+    @property
+    def retryable(self) -> bool:
+        # Retrying before the breaker's reset timeout would only fail again
+        return False
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delay seconds or HTTP date)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def error_from_response(response: httpx.Response) -> MeilisearchApiError:
+    """Build the typed error matching a Meilisearch error response"""
+    try:
+        body = response.json()
+    except ValueError:
+        body = {}
+    if not isinstance(body, dict):
+        body = {}
+    status = response.status_code
+    if status in (401, 403):
+        error_class = MeilisearchAuthError
+    elif status == 404:
+        error_class = MeilisearchNotFoundError
+    elif status == 429:
+        error_class = MeilisearchRateLimitError
+    elif status >= 500:
+        error_class = MeilisearchServerError
+    else:
+        error_class = MeilisearchApiError
+    return error_class(
+        status,
+        body.get("message") or response.text or response.reason_phrase,
+        body.get("code"),
+        body.get("type"),
+        body.get("link"),
+        parse_retry_after(response.headers.get("Retry-After")),
+    )
+
+
+def operation_failed(operation: str, error: Exception) -> Exception:
+    """Prefix an error with the failed operation, keeping Meilisearch errors typed"""
+    if isinstance(error, MeilisearchApiError):
+        return error.with_context(operation)
+    return Exception(f"{operation}: {str(error)}")
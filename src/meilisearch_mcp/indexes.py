@@ -1,6 +1,9 @@
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
-from meilisearch import Client
+
+from .errors import operation_failed
+from .transport import MeilisearchTransport
+from .cache import SearchCache
 
 
 @dataclass
@@ -14,49 +17,62 @@ class IndexConfig:
 class IndexManager:
     """Manage Meilisearch indexes"""
 
-    def __init__(self, client: Client):
-        self.client = client
+    def __init__(self, transport: MeilisearchTransport, search_cache: SearchCache):
+        self.transport = transport
+        self.search_cache = search_cache
 
     async def create_index(
         self, uid: str, primary_key: Optional[str] = None
     ) -> Dict[str, Any]:
         """Create a new index"""
         try:
-            return self.client.create_index(uid, {"primaryKey": primary_key})
+            return await self.transport.post(
+                "/indexes", {"uid": uid, "primaryKey": primary_key}
+            )
         except Exception as e:
-            raise Exception(f"Failed to create index: {str(e)}")
+            raise operation_failed("Failed to create index", e)
 
     async def get_index(self, uid: str) -> Dict[str, Any]:
         """Get index information"""
         try:
-            return self.client.get_index(uid)
+            return await self.transport.get(f"/indexes/{uid}")
         except Exception as e:
-            raise Exception(f"Failed to get index: {str(e)}")
+            raise operation_failed("Failed to get index", e)
 
-    async def list_indexes(self) -> List[Dict[str, Any]]:
+    async def list_indexes(
+        self, parameters: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """List all indexes"""
         try:
-            return self.client.get_indexes()
+            return await self.transport.get("/indexes", parameters)
         except Exception as e:
-            raise Exception(f"Failed to list indexes: {str(e)}")
+            raise operation_failed("Failed to list indexes", e)
 
     async def delete_index(self, uid: str) -> Dict[str, Any]:
         """Delete an index"""
+        self.search_cache.invalidate(uid)
         try:
-            return self.client.delete_index(uid)
+            return await self.transport.delete(f"/indexes/{uid}")
         except Exception as e:
-            raise Exception(f"Failed to delete index: {str(e)}")
+            raise operation_failed("Failed to delete index", e)
 
     async def update_index(self, uid: str, primary_key: str) -> Dict[str, Any]:
         """Update index primary key"""
         try:
-            return self.client.update_index(uid, {"primaryKey": primary_key})
+            return await self.transport.patch(
+                f"/indexes/{uid}", {"primaryKey": primary_key}
+            )
         except Exception as e:
-            raise Exception(f"Failed to update index: {str(e)}")
+            raise operation_failed("Failed to update index", e)
 
     async def swap_indexes(self, indexes: List[List[str]]) -> Dict[str, Any]:
         """Swap indexes"""
+        for pair in indexes:
+            for uid in pair:
+                self.search_cache.invalidate(uid)
         try:
-            return self.client.swap_indexes(indexes)
+            return await self.transport.post(
+                "/swap-indexes", [{"indexes": pair} for pair in indexes]
+            )
         except Exception as e:
-            raise Exception(f"Failed to swap indexes: {str(e)}")
+            raise operation_failed("Failed to swap indexes", e)
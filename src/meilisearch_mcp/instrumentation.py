@@ -0,0 +1,274 @@
+import asyncio
+import contextvars
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+
+from .logging import MCPLogger
+
+logger = MCPLogger()
+
+# Upper bounds in seconds; the last bucket catches everything slower
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# Cumulative upstream HTTP time of the tool call running in the current context
+_upstream_time: contextvars.ContextVar[Optional[List[float]]] = contextvars.ContextVar(
+    "upstream_time", default=None
+)
+
+
+def record_upstream_time(seconds: float):
+    """Attribute time spent waiting on Meilisearch to the current tool call"""
+    accumulator = _upstream_time.get()
+    if accumulator is not None:
+        accumulator[0] += seconds
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def quantile(self, q: float) -> Optional[Any]:
+        """Upper bound of the bucket holding the q-th quantile"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return f">{self.buckets[-1]}"
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "avg": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+        }
+
+
+class ToolMetrics:
+    """Latency and error counters of one tool"""
+
+    def __init__(self):
+        self.total = LatencyHistogram()
+        self.upstream = LatencyHistogram()
+        self.local = LatencyHistogram()
+        self.errors = 0
+
+
+class ServerMetrics:
+    """
+    Per-tool latency histograms split into upstream time (waiting on
+    Meilisearch) and local time (everything else: serialization, formatting
+    and the MCP layer), plus error counters.
+    """
+
+    def __init__(self):
+        self.tools: Dict[str, ToolMetrics] = {}
+        # Time tool calls spent waiting for admission, and calls turned away,
+        # per tool class
+        self.queue_wait: Dict[str, LatencyHistogram] = {}
+        self.rejected: Dict[str, int] = {}
+        # Structured log buffer counters, exported alongside the tool metrics
+        self.log_stats: Optional[Callable[[], Dict[str, Any]]] = None
+
+    def _tool(self, name: str) -> ToolMetrics:
+        if name not in self.tools:
+            self.tools[name] = ToolMetrics()
+        return self.tools[name]
+
+    @contextmanager
+    def track(self, name: str) -> Iterator[None]:
+        """Time a tool call and the upstream HTTP requests made within it"""
+        accumulator = [0.0]
+        token = _upstream_time.set(accumulator)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            _upstream_time.reset(token)
+            metrics = self._tool(name)
+            metrics.total.observe(elapsed)
+            # Concurrent requests within one call can add up past wall time
+            upstream = min(accumulator[0], elapsed)
+            metrics.upstream.observe(upstream)
+            metrics.local.observe(elapsed - upstream)
+
+    def record_error(self, name: str):
+        self._tool(name).errors += 1
+
+    def record_queue_wait(self, tool_class: str, seconds: float):
+        if tool_class not in self.queue_wait:
+            self.queue_wait[tool_class] = LatencyHistogram()
+        self.queue_wait[tool_class].observe(seconds)
+
+    def record_rejection(self, tool_class: str):
+        self.rejected[tool_class] = self.rejected.get(tool_class, 0) + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of every tool's counters and latency quantiles"""
+        return {
+            name: {
+                "calls": metrics.total.count,
+                "errors": metrics.errors,
+                "latency": metrics.total.summary(),
+                "upstream": metrics.upstream.summary(),
+                "local": metrics.local.summary(),
+            }
+            for name, metrics in sorted(self.tools.items())
+        }
+
+    def exposition(self) -> str:
+        """Render the metrics in the Prometheus text format"""
+        lines = []
+        for metric, attribute, help_text in (
+            ("tool_duration_seconds", "total", "Tool call latency"),
+            ("tool_upstream_seconds", "upstream", "Time waiting on Meilisearch"),
+            ("tool_local_seconds", "local", "Time spent outside Meilisearch"),
+        ):
+            histograms = {
+                tool: getattr(metrics, attribute)
+                for tool, metrics in self.tools.items()
+            }
+            _histogram_lines(lines, metric, help_text, "tool", histograms)
+
+        name = "meilisearch_mcp_tool_errors_total"
+        lines.append(f"# HELP {name} Tool calls that returned an error")
+        lines.append(f"# TYPE {name} counter")
+        for tool, metrics in sorted(self.tools.items()):
+            lines.append(f'{name}{{tool="{_label_value(tool)}"}} {metrics.errors}')
+
+        _histogram_lines(
+            lines,
+            "queue_wait_seconds",
+            "Time tool calls waited for admission",
+            "class",
+            self.queue_wait,
+        )
+        name = "meilisearch_mcp_admission_rejected_total"
+        lines.append(f"# HELP {name} Tool calls rejected because their queue was full")
+        lines.append(f"# TYPE {name} counter")
+        for tool_class, count in sorted(self.rejected.items()):
+            lines.append(f'{name}{{class="{_label_value(tool_class)}"}} {count}')
+
+        log_stats = self.log_stats() if self.log_stats else {}
+        for metric, key, kind, help_text in (
+            ("log_records_dropped_total", "dropped", "counter", "Log records dropped"),
+            ("log_records_queued", "queued", "gauge", "Log records awaiting write"),
+        ):
+            if key in log_stats:
+                name = f"meilisearch_mcp_{metric}"
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name} {log_stats[key]}")
+        return "\n".join(lines) + "\n"
+
+
+def _label_value(value: str) -> str:
+    """Escape a label value for the Prometheus text format"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram_lines(
+    lines: List[str],
+    metric: str,
+    help_text: str,
+    label: str,
+    histograms: Dict[str, LatencyHistogram],
+):
+    """Append histograms keyed by a label value in the Prometheus text format"""
+    name = f"meilisearch_mcp_{metric}"
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} histogram")
+    for value, histogram in sorted(histograms.items()):
+        labels = f'{label}="{_label_value(value)}"'
+        cumulative = 0
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+        lines.append(f"{name}_sum{{{labels}}} {histogram.sum}")
+        lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+
+
+class PrometheusExporter:
+    """Minimal HTTP endpoint serving ServerMetrics at /metrics"""
+
+    def __init__(
+        self, metrics: ServerMetrics, host: str = "127.0.0.1", port: int = 9464
+    ):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        # Resolve the actual port when started on port 0
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(
+            f"Serving Prometheus metrics on http://{self.host}:{self.port}/metrics"
+        )
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        try:
+            request_line = await reader.readline()
+            # Drain the request headers
+            while (await reader.readline()).strip():
+                pass
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1] == "/metrics":
+                status, body = "200 OK", self.metrics.exposition().encode()
+            else:
+                status, body = "404 Not Found", b"Not Found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                "Content-Type: text/plain; version=0.0.4\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except Exception as e:
+            logger.warning(f"Failed to serve metrics: {str(e)}")
+        finally:
+            writer.close()
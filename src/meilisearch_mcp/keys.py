@@ -1,47 +1,48 @@
-from typing import Dict, Any, List, Optional
-from meilisearch import Client
-from datetime import datetime
+from typing import Dict, Any, Optional
+
+from .errors import operation_failed
+from .transport import MeilisearchTransport
 
 
 class KeyManager:
     """Manage Meilisearch API keys"""
 
-    def __init__(self, client: Client):
-        self.client = client
+    def __init__(self, transport: MeilisearchTransport):
+        self.transport = transport
 
     async def get_keys(
         self, parameters: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Get list of API keys"""
         try:
-            return self.client.get_keys(parameters)
+            return await self.transport.get("/keys", parameters)
         except Exception as e:
-            raise Exception(f"Failed to get keys: {str(e)}")
+            raise operation_failed("Failed to get keys", e)
 
     async def get_key(self, key: str) -> Dict[str, Any]:
         """Get information about a specific key"""
         try:
-            return self.client.get_key(key)
+            return await self.transport.get(f"/keys/{key}")
         except Exception as e:
-            raise Exception(f"Failed to get key: {str(e)}")
+            raise operation_failed("Failed to get key", e)
 
     async def create_key(self, options: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new API key"""
         try:
-            return self.client.create_key(options)
+            return await self.transport.post("/keys", options)
         except Exception as e:
-            raise Exception(f"Failed to create key: {str(e)}")
+            raise operation_failed("Failed to create key", e)
 
     async def update_key(self, key: str, options: Dict[str, Any]) -> Dict[str, Any]:
         """Update an existing API key"""
         try:
-            return self.client.update_key(key, options)
+            return await self.transport.patch(f"/keys/{key}", options)
         except Exception as e:
-            raise Exception(f"Failed to update key: {str(e)}")
+            raise operation_failed("Failed to update key", e)
 
     async def delete_key(self, key: str) -> None:
         """Delete an API key"""
         try:
-            return self.client.delete_key(key)
+            return await self.transport.delete(f"/keys/{key}")
         except Exception as e:
-            raise Exception(f"Failed to delete key: {str(e)}")
+            raise operation_failed("Failed to delete key", e)
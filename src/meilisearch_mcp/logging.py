@@ -1,83 +1,429 @@
+import gzip
+import hashlib
 import logging
+from collections import deque
+import shutil
 import sys
 import json
-from datetime import datetime
+import time
+from dataclasses import is_dataclass
+from datetime import datetime, time as dt_time, timedelta
+from itertools import islice
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Deque, Dict, Any, List
 import threading
-from queue import Queue
 import asyncio
 
 
+OVERFLOW_POLICIES = ("block", "drop-oldest", "sample")
+
+# Larger values in structured log records are replaced by a summary
+LOG_MAX_ITEMS = 20
+LOG_MAX_STRING = 1024
+LOG_MAX_DEPTH = 6
+# Items encoded at once while fingerprinting, bounding how long the writer
+# thread holds the GIL in a single encoding call
+LOG_FINGERPRINT_SLICE = 256
+
+
+def summarize_payload(
+    value: Any,
+    max_items: int = LOG_MAX_ITEMS,
+    max_string: int = LOG_MAX_STRING,
+    depth: int = LOG_MAX_DEPTH,
+) -> Any:
+    """
+    Bound a value for logging. Oversized lists, dicts and strings keep their
+    head plus the full count, encoded byte size and a SHA-256 prefix, so a
+    payload can still be matched against its source.
+    """
+    if isinstance(value, str):
+        if len(value) <= max_string:
+            return value
+        return {
+            "_summary": "str",
+            "length": len(value),
+            **_fingerprint(value.encode("utf-8", "replace")),
+            "head": value[:max_string],
+        }
+    if isinstance(value, (bool, int, float)) or value is None:
+        return value
+    if is_dataclass(value) and not isinstance(value, type):
+        value = value.__dict__
+    if isinstance(value, dict):
+        if depth <= 0:
+            return {"_summary": "dict", "keys": len(value)}
+        items = list(islice(value.items(), max_items))
+        summary = {
+            str(key): summarize_payload(item, max_items, max_string, depth - 1)
+            for key, item in items
+        }
+        if len(value) > max_items:
+            summary["_truncatedKeys"] = len(value) - max_items
+            summary.update(_fingerprint_json(value))
+        return summary
+    if isinstance(value, (list, tuple, set)):
+        if depth <= 0 or len(value) > max_items:
+            return {
+                "_summary": "list",
+                "count": len(value),
+                **_fingerprint_json(value),
+                "head": [
+                    summarize_payload(item, max_items, max_string, depth - 1)
+                    for item in islice(value, 3 if depth > 0 else 0)
+                ],
+            }
+        return [
+            summarize_payload(item, max_items, max_string, depth - 1)
+            for item in value
+        ]
+    return summarize_payload(str(value), max_items, max_string, depth)
+
+
+def _encode(value: Any) -> bytes:
+    return json.dumps(value, default=str, separators=(",", ":")).encode()
+
+
+def _fingerprint(data: bytes) -> Dict[str, Any]:
+    return {"bytes": len(data), "sha256": hashlib.sha256(data).hexdigest()[:16]}
+
+
+def _fingerprint_json(value: Any) -> Dict[str, Any]:
+    """
+    _fingerprint of the encoded value, computed slice by slice. The GIL is
+    released between slices, so a huge payload does not stall the event loop
+    while the writer thread encodes it.
+    """
+    if isinstance(value, dict):
+        items, rebuild, brackets = iter(value.items()), dict, (b"{", b"}")
+    elif isinstance(value, (list, tuple)):
+        items, rebuild, brackets = iter(value), list, (b"[", b"]")
+    else:
+        return _fingerprint(_encode(value))
+    digest = hashlib.sha256(brackets[0])
+    size = 2
+    separator = b""
+    while True:
+        chunk = list(islice(items, LOG_FINGERPRINT_SLICE))
+        if not chunk:
+            break
+        # Strip the brackets of the slice's own encoding
+        data = separator + _encode(rebuild(chunk))[1:-1]
+        digest.update(data)
+        size += len(data)
+        separator = b","
+        time.sleep(0)
+    digest.update(brackets[1])
+    return {"bytes": size, "sha256": digest.hexdigest()[:16]}
+
+
 class AsyncLogHandler:
-    """Asynchronous log handler with buffering"""
+    """
+    Asynchronous log handler with buffering, written in batches by a worker
+    thread that sleeps until records arrive. When the buffer is full the
+    overflow policy decides what happens: "block" waits for room,
+    "drop-oldest" discards the oldest buffered record, and "sample" keeps one
+    in sample_rate records once the buffer is half full. Discarded records
+    are counted, never silently lost.
+    """
 
-    def __init__(self, max_buffer: int = 1000):
-        self.buffer = Queue(maxsize=max_buffer)
+    def __init__(
+        self,
+        max_buffer: int = 1000,
+        batch_size: int = 256,
+        flush_interval: float = 1.0,
+        overflow: str = "drop-oldest",
+        sample_rate: int = 10,
+    ):
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown log overflow policy {overflow!r}; "
+                f"use one of {', '.join(OVERFLOW_POLICIES)}"
+            )
+        self.buffer: Deque[Dict[str, Any]] = deque()
+        self.max_buffer = max_buffer
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.sample_rate = sample_rate
+        self.accepted = 0
+        self.written = 0
+        self.dropped = 0
+        self._overflowed = 0
+        self._pending_flush = False
+        self._flush_requested = 0
+        self._flush_served = 0
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._room = threading.Condition(self._lock)
+        self._done = threading.Condition(self._lock)
         self.running = True
         self.worker_thread = threading.Thread(target=self._worker)
         self.worker_thread.daemon = True
         self.worker_thread.start()
 
     def _worker(self):
-        """Background worker to process logs"""
-        while self.running:
-            try:
-                record = self.buffer.get(timeout=1.0)
-                self._write_log(record)
-            except:
-                continue
+        """Background worker draining the buffer in batches"""
+        while True:
+            with self._lock:
+                timed_out = False
+                while (
+                    not self.buffer
+                    and self.running
+                    and self._flush_served == self._flush_requested
+                ):
+                    # Sleep until records arrive; wake for a pending flush only
+                    if not self._ready.wait(
+                        self.flush_interval if self._pending_flush else None
+                    ):
+                        timed_out = True
+                        break
+                batch = [
+                    self.buffer.popleft()
+                    for _ in range(min(self.batch_size, len(self.buffer)))
+                ]
+                self._room.notify_all()
+                # Every record emitted before these requests is in this batch
+                flush_now = not self.buffer and (
+                    timed_out
+                    or not self.running
+                    or self._flush_served != self._flush_requested
+                )
+                requested = self._flush_requested
+
+            if batch:
+                try:
+                    self._write_batch(batch)
+                except Exception as e:
+                    sys.stderr.write(
+                        f"Failed to write {len(batch)} log records: {e}\n"
+                    )
+            if flush_now:
+                self._flush()
+
+            with self._lock:
+                self.written += len(batch)
+                if flush_now:
+                    self._pending_flush = False
+                    self._flush_served = requested
+                    self._done.notify_all()
+                elif batch:
+                    self._pending_flush = True
+                if flush_now and not self.running and not self.buffer:
+                    break
+        self._close()
+
+    def _write_batch(self, records: List[Dict[str, Any]]):
+        """Write a batch of log records to storage"""
+        for record in records:
+            self._write_log(record)
 
     def _write_log(self, record: Dict[str, Any]):
         """Write log record to storage"""
         raise NotImplementedError
 
+    def _flush(self):
+        """Flush records written so far; called when the buffer goes idle"""
+
+    def _close(self):
+        """Release storage once the buffer is drained"""
+
     def emit(self, record: Dict[str, Any]):
-        """Add log record to buffer"""
-        try:
-            self.buffer.put(record, block=False)
-        except:
-            pass  # Buffer full, skip log
+        """Add log record to buffer, applying the overflow policy"""
+        with self._lock:
+            if self.overflow == "sample" and len(self.buffer) >= self.max_buffer // 2:
+                self._overflowed += 1
+                if self._overflowed % self.sample_rate:
+                    self.dropped += 1
+                    return
+            if len(self.buffer) >= self.max_buffer:
+                if self.overflow == "block":
+                    while len(self.buffer) >= self.max_buffer and self.running:
+                        self._room.wait()
+                else:
+                    self.buffer.popleft()
+                    self.dropped += 1
+            if not self.running:
+                self.dropped += 1
+                return
+            self.buffer.append(record)
+            self.accepted += 1
+            self._ready.notify()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every record emitted so far is written and flushed"""
+        with self._lock:
+            self._flush_requested += 1
+            requested = self._flush_requested
+            self._ready.notify()
+            return self._done.wait_for(
+                lambda: self._flush_served >= requested
+                or not self.worker_thread.is_alive(),
+                timeout,
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer counters"""
+        with self._lock:
+            return {
+                "queued": len(self.buffer),
+                "accepted": self.accepted,
+                "written": self.written,
+                "dropped": self.dropped,
+                "overflow": self.overflow,
+            }
 
     def shutdown(self):
-        """Shutdown the handler"""
-        self.running = False
+        """Stop accepting records, write everything buffered and close"""
+        with self._lock:
+            self.running = False
+            self._ready.notify_all()
+            self._room.notify_all()
         self.worker_thread.join()
 
 
 class FileLogHandler(AsyncLogHandler):
-    """File-based log handler"""
+    """
+    File-based log handler. The current file stays open; it rotates at
+    midnight or once it reaches max_bytes, and rotated files are gzipped in
+    the background.
+    """
 
-    def __init__(self, log_dir: str):
-        super().__init__()
+    def __init__(
+        self,
+        log_dir: str,
+        max_bytes: int = 50 * 1024 * 1024,
+        flush_bytes: int = 64 * 1024,
+        compress: bool = True,
+        max_items: int = LOG_MAX_ITEMS,
+        max_string: int = LOG_MAX_STRING,
+        **kwargs,
+    ):
         self.log_dir = Path(log_dir)
         self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.flush_bytes = flush_bytes
+        self.compress = compress
+        self.max_items = max_items
+        self.max_string = max_string
         self.current_file = None
+        self._file = None
+        self._size = 0
+        self._unflushed = 0
+        self._last_flush = time.monotonic()
+        self._rollover_at = 0.0
+        self._compressors: List[threading.Thread] = []
         self._rotate_file()
+        super().__init__(**kwargs)
 
     def _rotate_file(self):
-        """Rotate log file daily"""
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        self.current_file = self.log_dir / f"meilisearch-mcp-{date_str}.log"
+        """Open the log file for the current day"""
+        now = datetime.now()
+        self.current_file = self.log_dir / f"meilisearch-mcp-{now:%Y-%m-%d}.log"
+        self._file = open(self.current_file, "a", encoding="utf-8")
+        self._size = self._file.tell()
+        midnight = datetime.combine(now.date() + timedelta(days=1), dt_time.min)
+        self._rollover_at = midnight.timestamp()
+
+    def _rollover(self, by_size: bool):
+        """Close the current file, hand it to a compressor and start a new one"""
+        self._file.close()
+        rotated = self.current_file
+        if by_size:
+            # Keep the dated name for the live file; number the full ones
+            index = 1
+            while any(
+                (self.log_dir / f"{rotated.stem}.{index}{suffix}").exists()
+                for suffix in (".log", ".log.gz")
+            ):
+                index += 1
+            rotated = rotated.rename(self.log_dir / f"{rotated.stem}.{index}.log")
+        if self.compress:
+            compressor = threading.Thread(target=_gzip_file, args=(rotated,))
+            compressor.start()
+            self._compressors = [t for t in self._compressors if t.is_alive()]
+            self._compressors.append(compressor)
+        self._rotate_file()
+
+    def _write_batch(self, records: List[Dict[str, Any]]):
+        """Write a batch of records, rotating and flushing at most once"""
+        if time.time() >= self._rollover_at:
+            self._rollover(by_size=False)
+        elif self._size >= self.max_bytes:
+            self._rollover(by_size=True)
+
+        data = "".join(self._serialize(record) + "\n" for record in records)
+        self._file.write(data)
+        self._size += len(data)
+        self._unflushed += len(data)
+        if (
+            self._unflushed >= self.flush_bytes
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self._flush()
+
+    def _serialize(self, record: Dict[str, Any]) -> str:
+        """Encode a record, summarizing large values in the writer thread"""
+        try:
+            return json.dumps(
+                summarize_payload(record, self.max_items, self.max_string),
+                default=str,
+            )
+        except Exception as e:
+            # Payloads are referenced, not copied, and may change underneath
+            return json.dumps(
+                {
+                    "timestamp": record.get("timestamp"),
+                    "level": record.get("level"),
+                    "message": record.get("message"),
+                    "error": f"Failed to serialize log record: {e}",
+                }
+            )
 
     def _write_log(self, record: Dict[str, Any]):
         """Write log record to file"""
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        if not self.current_file or current_date not in self.current_file.name:
-            self._rotate_file()
+        self._write_batch([record])
 
-        with open(self.current_file, "a") as f:
-            f.write(json.dumps(record) + "\n")
+    def _flush(self):
+        if self._file and self._unflushed:
+            self._file.flush()
+            self._unflushed = 0
+        self._last_flush = time.monotonic()
+
+    def _close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+        for compressor in self._compressors:
+            compressor.join()
+
+
+def _gzip_file(path: Path):
+    """Compress a rotated log file next to itself and remove the original"""
+    target = path.with_name(path.name + ".gz")
+    partial = path.with_name(path.name + ".gz.tmp")
+    try:
+        with open(path, "rb") as src, gzip.open(partial, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        partial.rename(target)
+        path.unlink()
+    except OSError as e:
+        sys.stderr.write(f"Failed to compress {path}: {e}\n")
 
 
 class MCPLogger:
     """Enhanced MCP logger with structured logging"""
 
-    def __init__(self, name: str = "meilisearch-mcp", log_dir: Optional[str] = None):
+    def __init__(
+        self,
+        name: str = "meilisearch-mcp",
+        log_dir: Optional[str] = None,
+        overflow: str = "drop-oldest",
+    ):
         self.logger = logging.getLogger(name)
-        self._setup_logger(log_dir)
+        self._setup_logger(log_dir, overflow)
 
-    def _setup_logger(self, log_dir: Optional[str]):
+    def _setup_logger(self, log_dir: Optional[str], overflow: str = "drop-oldest"):
         """Configure logging with multiple handlers"""
         if not self.logger.handlers:
             # Console handler
@@ -87,15 +433,18 @@ class MCPLogger:
             )
             console_handler.setFormatter(formatter)
             self.logger.addHandler(console_handler)
-
-            # File handler for structured logging
-            if log_dir:
-                self.file_handler = FileLogHandler(log_dir)
-
             self.logger.setLevel(logging.INFO)
 
+        # File handler for structured logging; module-level loggers share the
+        # console handler, so this must not depend on it being new
+        if log_dir:
+            self.file_handler = FileLogHandler(log_dir, overflow=overflow)
+
     def _log(self, level: str, msg: str, **kwargs):
-        """Create structured log entry"""
+        """
+        Create structured log entry. Values are passed by reference and only
+        summarized and encoded by the writer thread.
+        """
         log_entry = {
             "timestamp": datetime.utcnow().isoformat(),
             "level": level,
@@ -122,7 +471,19 @@ class MCPLogger:
     def error(self, msg: str, **kwargs):
         self._log("ERROR", msg, **kwargs)
 
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until structured records logged so far are on disk"""
+        if hasattr(self, "file_handler"):
+            return self.file_handler.flush(timeout)
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get structured log buffer counters"""
+        if hasattr(self, "file_handler"):
+            return self.file_handler.get_stats()
+        return {}
+
     def shutdown(self):
-        """Clean shutdown of logger"""
+        """Clean shutdown of logger, writing every buffered record"""
         if hasattr(self, "file_handler"):
             self.file_handler.shutdown()
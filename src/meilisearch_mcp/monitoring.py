@@ -1,8 +1,18 @@
-from typing import Dict, Any, List, Optional
-from meilisearch import Client
+import asyncio
+import time
+from array import array
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime
-import json
+
+from .errors import operation_failed
+from .transport import MeilisearchTransport
+from .logging import MCPLogger
+
+logger = MCPLogger()
+
+# Maximum number of per-index stats requests in flight for detailed health checks
+STATS_FANOUT_CONCURRENCY = 8
 
 
 @dataclass
@@ -11,7 +21,7 @@ class HealthStatus:
 
     is_healthy: bool
     database_size: int
-    last_update: datetime
+    last_update: Optional[datetime]
     indexes_count: int
     indexes_info: List[Dict[str, Any]]
 
@@ -26,47 +36,210 @@ class IndexMetrics:
     index_size: Optional[int] = None
 
 
+class RingBuffer:
+    """Fixed-capacity time series backed by two float arrays"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.timestamps = array("d", bytes(8 * capacity))
+        self.values = array("d", bytes(8 * capacity))
+        self.count = 0
+        self._next = 0
+
+    def append(self, timestamp: float, value: float):
+        self.timestamps[self._next] = timestamp
+        self.values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def since(self, start: float) -> List[Tuple[float, float]]:
+        """Samples taken at or after start, oldest first"""
+        first = (self._next - self.count) % self.capacity
+        samples = []
+        for offset in range(self.count):
+            position = (first + offset) % self.capacity
+            if self.timestamps[position] >= start:
+                samples.append((self.timestamps[position], self.values[position]))
+        return samples
+
+
+def summarize_samples(samples: List[Tuple[float, float]]) -> Optional[Dict[str, Any]]:
+    """Min/max/avg/latest of a series plus its rate of change per second"""
+    if not samples:
+        return None
+    values = [value for _, value in samples]
+    elapsed = samples[-1][0] - samples[0][0]
+    return {
+        "samples": len(samples),
+        "min": min(values),
+        "max": max(values),
+        "avg": sum(values) / len(values),
+        "latest": values[-1],
+        "rate_per_second": (values[-1] - values[0]) / elapsed if elapsed else 0.0,
+    }
+
+
+class MetricsSampler:
+    """
+    Opt-in background sampler of /stats. Each sample appends the database size
+    and every index's document count and indexing flag to ring buffers, so
+    history queries never call Meilisearch.
+    """
+
+    def __init__(self, transport: MeilisearchTransport, capacity: int = 360):
+        self.transport = transport
+        self.capacity = capacity
+        self.interval: Optional[float] = None
+        self.database_size = RingBuffer(capacity)
+        self.documents: Dict[str, RingBuffer] = {}
+        self.indexing: Dict[str, RingBuffer] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self, interval: float):
+        """Start sampling every interval seconds"""
+        self.interval = interval
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.running:
+            self._task.cancel()
+
+    def reset(self):
+        """Drop recorded samples, e.g. after switching servers"""
+        self.database_size = RingBuffer(self.capacity)
+        self.documents = {}
+        self.indexing = {}
+
+    async def _run(self):
+        while True:
+            try:
+                await self.sample()
+            except Exception as e:
+                logger.warning(f"Metrics sampling failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def sample(self):
+        """Record one /stats sample"""
+        stats = await self.transport.get("/stats")
+        now = time.time()
+        self.database_size.append(now, stats["databaseSize"])
+        for uid, index in stats["indexes"].items():
+            if uid not in self.documents:
+                self.documents[uid] = RingBuffer(self.capacity)
+                self.indexing[uid] = RingBuffer(self.capacity)
+            self.documents[uid].append(now, index["numberOfDocuments"])
+            self.indexing[uid].append(now, 1.0 if index["isIndexing"] else 0.0)
+
+    def get_history(
+        self, window: Optional[float] = None, index_uid: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Summarize the samples of the last window seconds (all samples if None)"""
+        start = time.time() - window if window else 0.0
+        uids = [index_uid] if index_uid else sorted(self.documents)
+        indexes = {}
+        for uid in uids:
+            if uid not in self.documents:
+                continue
+            indexing = self.indexing[uid].since(start)
+            indexes[uid] = {
+                "documents": summarize_samples(self.documents[uid].since(start)),
+                # Share of samples that saw the index indexing
+                "indexing_ratio": (
+                    sum(value for _, value in indexing) / len(indexing)
+                    if indexing
+                    else None
+                ),
+                # Time between samples that started out indexing
+                "indexing_seconds": sum(
+                    later[0] - earlier[0]
+                    for earlier, later in zip(indexing, indexing[1:])
+                    if earlier[1]
+                ),
+            }
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "window": window,
+            "database_size": summarize_samples(self.database_size.since(start)),
+            "indexes": indexes,
+        }
+
+
 class MonitoringManager:
     """Enhanced monitoring and statistics for Meilisearch"""
 
-    def __init__(self, client: Client):
-        self.client = client
+    def __init__(self, transport: MeilisearchTransport):
+        self.transport = transport
+        self.sampler = MetricsSampler(transport)
 
-    async def get_health_status(self) -> HealthStatus:
-        """Get comprehensive health status"""
+    async def get_health_status(self, detailed: bool = False) -> HealthStatus:
+        """
+        Get comprehensive health status from a single /stats request, which
+        already lists every index. With detailed, field distributions are
+        included; indexes whose /stats entry lacks one (older servers) are
+        fetched individually with bounded concurrency.
+        """
         try:
-            # Get various stats to build health picture
-            stats = self.client.get_stats()
-            indexes = self.client.get_indexes()
+            stats = await self.transport.get("/stats")
+            index_stats = stats["indexes"]
+            if detailed:
+                missing = [
+                    uid
+                    for uid, index in index_stats.items()
+                    if "fieldDistribution" not in index
+                ]
+                if missing:
+                    index_stats = {
+                        **index_stats,
+                        **await self._get_all_index_stats(missing),
+                    }
 
             indexes_info = []
-            for index in indexes:
-                index_stats = self.client.index(index.uid).get_stats()
-                indexes_info.append(
-                    {
-                        "uid": index.uid,
-                        "documents_count": index_stats["numberOfDocuments"],
-                        "is_indexing": index_stats["isIndexing"],
-                    }
-                )
+            for uid, index in index_stats.items():
+                info = {
+                    "uid": uid,
+                    "documents_count": index["numberOfDocuments"],
+                    "is_indexing": index["isIndexing"],
+                }
+                if detailed:
+                    info["field_distribution"] = index.get("fieldDistribution")
+                indexes_info.append(info)
 
+            last_update = stats.get("lastUpdate")
             return HealthStatus(
                 is_healthy=True,
                 database_size=stats["databaseSize"],
-                last_update=datetime.fromisoformat(
-                    stats["lastUpdate"].replace("Z", "+00:00")
+                last_update=(
+                    datetime.fromisoformat(last_update.replace("Z", "+00:00"))
+                    if last_update
+                    else None
                 ),
-                indexes_count=len(indexes),
+                indexes_count=len(indexes_info),
                 indexes_info=indexes_info,
             )
         except Exception as e:
-            raise Exception(f"Failed to get health status: {str(e)}")
+            raise operation_failed("Failed to get health status", e)
+
+    async def _get_all_index_stats(self, index_uids: List[str]) -> Dict[str, Any]:
+        """Fetch per-index stats with a bounded number of requests in flight"""
+        semaphore = asyncio.Semaphore(STATS_FANOUT_CONCURRENCY)
+
+        async def get_index_stats(uid: str) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.transport.get(f"/indexes/{uid}/stats")
+
+        results = await asyncio.gather(*(get_index_stats(uid) for uid in index_uids))
+        return dict(zip(index_uids, results))
 
     async def get_index_metrics(self, index_uid: str) -> IndexMetrics:
         """Get detailed metrics for an index"""
         try:
-            index = self.client.index(index_uid)
-            stats = index.get_stats()
+            stats = await self.transport.get(f"/indexes/{index_uid}/stats")
 
             return IndexMetrics(
                 number_of_documents=stats["numberOfDocuments"],
@@ -75,13 +248,13 @@ class MonitoringManager:
                 index_size=stats.get("indexSize"),
             )
         except Exception as e:
-            raise Exception(f"Failed to get index metrics: {str(e)}")
+            raise operation_failed("Failed to get index metrics", e)
 
     async def get_system_information(self) -> Dict[str, Any]:
         """Get system-level information"""
         try:
-            version = self.client.get_version()
-            stats = self.client.get_all_stats()
+            version = await self.transport.get("/version")
+            stats = await self.transport.get("/stats")
 
             return {
                 "version": version,
@@ -90,4 +263,4 @@ class MonitoringManager:
                 "indexes": stats["indexes"],
             }
         except Exception as e:
-            raise Exception(f"Failed to get system information: {str(e)}")
+            raise operation_failed("Failed to get system information", e)
@@ -0,0 +1,84 @@
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from .errors import CircuitOpenError
+
+
+@dataclass
+class ResilienceConfig:
+    """Retry and circuit breaker settings of the transport"""
+
+    # Retries of an idempotent read after the first attempt
+    retries: int = 2
+    # Backoff before retry n is drawn from [0, backoff * 2**n], capped
+    backoff: float = 0.1
+    max_backoff: float = 2.0
+    # Longer Retry-After delays are not waited out; the error is raised instead
+    max_retry_after: float = 10.0
+    # Consecutive failures that open a node's circuit, and seconds it stays open
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+
+    def retry_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff, no shorter than the server asked for"""
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2**attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class CircuitBreaker:
+    """
+    Fails calls to a node fast after repeated failures. Once reset_timeout
+    has passed a single trial request is let through: success closes the
+    circuit, failure opens it again.
+    """
+
+    def __init__(
+        self, url: str, failure_threshold: int = 5, reset_timeout: float = 30.0
+    ):
+        self.url = url
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial = False
+
+    def retry_after(self) -> float:
+        """Seconds until the circuit lets a trial request through"""
+        if self.state != "open":
+            return 0.0
+        return max(0.0, self._opened_at + self.reset_timeout - time.monotonic())
+
+    def allows(self) -> bool:
+        """Whether a request would be let through, without admitting it"""
+        if self.state == "open":
+            return self.retry_after() == 0.0
+        return not (self.state == "half-open" and self._trial)
+
+    def acquire(self):
+        """Admit a request, or raise CircuitOpenError"""
+        if not self.allows():
+            raise CircuitOpenError(self.url, self.retry_after() or self.reset_timeout)
+        if self.state != "closed":
+            self.state = "half-open"
+            self._trial = True
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self._trial = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial = False
+        if self.state == "half-open" or self.failures >= self.failure_threshold:
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+    def release(self):
+        """Give up an admitted request that ended without an outcome"""
+        self._trial = False
@@ -0,0 +1,149 @@
+import asyncio
+import re
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .logging import MCPLogger
+from .resilience import CircuitBreaker, ResilienceConfig
+
+logger = MCPLogger()
+
+# Whether the node at a base URL reports itself available
+HealthCheck = Callable[[str], Awaitable[bool]]
+
+# Requests any replica can answer: searches, document and settings reads, and
+# stats. Everything else, including tasks and keys, goes to the primary.
+_READ_ROUTES = {
+    "GET": re.compile(
+        r"^/(stats|indexes/[^/]+/(stats|settings(/.*)?|documents(/.*)?))$"
+    ),
+    "POST": re.compile(r"^/(multi-search|indexes/[^/]+/(search|documents/fetch))$"),
+}
+
+
+def is_read_request(method: str, path: str) -> bool:
+    """Whether a request may be served by a replica"""
+    route = _READ_ROUTES.get(method.upper())
+    return route is not None and route.match(path) is not None
+
+
+@dataclass
+class Endpoint:
+    """One Meilisearch node and its routing state"""
+
+    url: str
+    role: str
+    breaker: CircuitBreaker
+    healthy: bool = True
+    outstanding: int = 0
+    requests: int = 0
+    failures: int = 0
+
+
+class EndpointPool:
+    """
+    A primary and optional read replicas. Reads go to the healthy node with
+    the fewest requests in flight; writes always go to the primary. Nodes
+    that fail are ejected until the health prober sees them available again,
+    and nodes whose circuit is open are skipped.
+    """
+
+    def __init__(
+        self,
+        primary: str,
+        replicas: Optional[List[str]] = None,
+        resilience: Optional[ResilienceConfig] = None,
+    ):
+        self.resilience = resilience or ResilienceConfig()
+        self.primary = self._endpoint(primary, "primary")
+        self.replicas = [self._endpoint(url, "replica") for url in replicas or ()]
+        self._prober: Optional[asyncio.Task] = None
+
+    def _endpoint(self, url: str, role: str) -> Endpoint:
+        url = url.rstrip("/")
+        breaker = CircuitBreaker(
+            url, self.resilience.failure_threshold, self.resilience.reset_timeout
+        )
+        return Endpoint(url, role, breaker)
+
+    @property
+    def endpoints(self) -> List[Endpoint]:
+        return [self.primary, *self.replicas]
+
+    def set_primary(self, url: str, replicas: Optional[List[str]] = None):
+        """
+        Switch to another deployment. The replicas of the previous primary
+        are dropped, and every node starts with a closed circuit.
+        """
+        self.primary = self._endpoint(url, "primary")
+        self.replicas = [self._endpoint(url, "replica") for url in replicas or ()]
+        if not self.replicas and self._prober is not None:
+            self._prober.cancel()
+
+    def pick(
+        self, method: str, path: str, exclude: Optional[List[Endpoint]] = None
+    ) -> Optional[Endpoint]:
+        """Choose the node for a request, or None when no other node can serve it"""
+        if not self.replicas or not is_read_request(method, path):
+            return None if exclude else self.primary
+        candidates = [
+            endpoint
+            for endpoint in self.endpoints
+            if endpoint.healthy
+            and endpoint.breaker.allows()
+            and endpoint not in (exclude or ())
+        ]
+        if not candidates:
+            # Every node is unavailable: try the primary rather than fail outright
+            return None if exclude else self.primary
+        return min(candidates, key=lambda endpoint: endpoint.outstanding)
+
+    def eject(self, endpoint: Endpoint, reason: str):
+        endpoint.failures += 1
+        if endpoint.healthy and self.replicas:
+            endpoint.healthy = False
+            logger.warning(f"Ejected {endpoint.role} {endpoint.url}: {reason}")
+
+    async def probe(self, health_check: HealthCheck):
+        """Health check every node, ejecting and re-admitting nodes"""
+
+        async def check(endpoint: Endpoint):
+            available = await health_check(endpoint.url)
+            if available and not endpoint.healthy:
+                endpoint.healthy = True
+                logger.info(f"Re-admitted {endpoint.role} {endpoint.url}")
+            elif not available:
+                self.eject(endpoint, "health check failed")
+
+        await asyncio.gather(*(check(endpoint) for endpoint in self.endpoints))
+
+    def start_probing(self, health_check: HealthCheck, interval: float):
+        """Probe node health every interval seconds in the background"""
+        if not self.replicas or (self._prober and not self._prober.done()):
+            return
+
+        async def run():
+            while True:
+                await asyncio.sleep(interval)
+                await self.probe(health_check)
+
+        self._prober = asyncio.create_task(run())
+
+    async def stop_probing(self):
+        if self._prober is not None and not self._prober.done():
+            self._prober.cancel()
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Routing state of every node"""
+        return [
+            {
+                "url": endpoint.url,
+                "role": endpoint.role,
+                "healthy": endpoint.healthy,
+                "circuit": endpoint.breaker.state,
+                "outstanding": endpoint.outstanding,
+                "requests": endpoint.requests,
+                "failures": endpoint.failures,
+            }
+            for endpoint in self.endpoints
+        ]
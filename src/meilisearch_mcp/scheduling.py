@@ -0,0 +1,164 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from .instrumentation import ServerMetrics
+
+
+@dataclass
+class ClassLimits:
+    """Admission limits of one tool class"""
+
+    # Calls of the class running at once
+    concurrency: int
+    # Calls waiting for a slot; further calls are rejected
+    max_queue: int
+
+
+# Tool classes: quick reads an agent waits on, bulk writes and exports that
+# hold connections for long, administration, and task waits, which block for
+# long but share one poller and so cost no connection each
+DEFAULT_CLASS_LIMITS = {
+    "interactive": ClassLimits(concurrency=32, max_queue=256),
+    "bulk": ClassLimits(concurrency=4, max_queue=32),
+    "admin": ClassLimits(concurrency=8, max_queue=64),
+    "wait": ClassLimits(concurrency=64, max_queue=256),
+}
+
+
+class AdmissionRejected(Exception):
+    """Tool call turned away because its class's queue is full"""
+
+    def __init__(self, tool_class: str, queued: int, retry_after: float):
+        self.tool_class = tool_class
+        self.retry_after = retry_after
+        super().__init__(
+            f"Server busy: {queued} {tool_class} calls queued, "
+            f"retry in {retry_after:.1f}s"
+        )
+
+
+class _ClassQueue:
+    """Running count and priority queue of one tool class"""
+
+    def __init__(self, limits: ClassLimits):
+        self.limits = limits
+        self.running = 0
+        # (priority, arrival, future) entries; the lowest priority runs first
+        self.waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self.admitted = 0
+        self.rejected = 0
+        # Moving average of call duration, used for the retry hint
+        self.service_time: Optional[float] = None
+
+    def observe(self, seconds: float):
+        if self.service_time is None:
+            self.service_time = seconds
+        else:
+            self.service_time += 0.2 * (seconds - self.service_time)
+
+    def retry_after(self) -> float:
+        """Rough time until the queue has drained enough to accept a call"""
+        service_time = self.service_time if self.service_time is not None else 1.0
+        waves = (len(self.waiters) + 1) / self.limits.concurrency
+        return max(0.1, service_time * waves)
+
+
+class ToolScheduler:
+    """
+    Admission control in front of tool calls. Each tool class runs at most
+    its concurrency limit of calls at once, so a burst of bulk writes cannot
+    take the connections interactive searches need. Waiting calls are
+    admitted by priority, then arrival; once a class's queue is full new
+    calls are rejected with a retry hint instead of piling up.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, ClassLimits]] = None,
+        metrics: Optional[ServerMetrics] = None,
+    ):
+        self.metrics = metrics
+        self._queues = {
+            tool_class: _ClassQueue(class_limits)
+            for tool_class, class_limits in {
+                **DEFAULT_CLASS_LIMITS,
+                **(limits or {}),
+            }.items()
+        }
+        self._arrivals = itertools.count()
+
+    @asynccontextmanager
+    async def admit(self, tool_class: str, priority: int = 0) -> AsyncIterator[float]:
+        """Hold a slot of the tool class while the block runs; yields the wait"""
+        queue = self._queues[tool_class]
+        start = time.perf_counter()
+        if queue.running < queue.limits.concurrency and not queue.waiters:
+            queue.running += 1
+        else:
+            await self._wait(queue, tool_class, priority)
+        waited = time.perf_counter() - start
+        queue.admitted += 1
+        if self.metrics is not None:
+            self.metrics.record_queue_wait(tool_class, waited)
+
+        started = time.perf_counter()
+        try:
+            yield waited
+        finally:
+            queue.observe(time.perf_counter() - started)
+            self._release(queue)
+
+    async def _wait(self, queue: _ClassQueue, tool_class: str, priority: int):
+        if len(queue.waiters) >= queue.limits.max_queue:
+            queue.rejected += 1
+            if self.metrics is not None:
+                self.metrics.record_rejection(tool_class)
+            raise AdmissionRejected(
+                tool_class, len(queue.waiters), queue.retry_after()
+            )
+        future = asyncio.get_running_loop().create_future()
+        entry = (priority, next(self._arrivals), future)
+        heapq.heappush(queue.waiters, entry)
+        try:
+            # The releasing call hands its slot over by resolving the future
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._release(queue)
+            else:
+                queue.waiters.remove(entry)
+                heapq.heapify(queue.waiters)
+            raise
+
+    def _release(self, queue: _ClassQueue):
+        while queue.waiters:
+            _, _, future = heapq.heappop(queue.waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        queue.running -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Limits, load and counters of every tool class"""
+        return {
+            tool_class: {
+                "concurrency": queue.limits.concurrency,
+                "maxQueue": queue.limits.max_queue,
+                "running": queue.running,
+                "queued": len(queue.waiters),
+                "admitted": queue.admitted,
+                "rejected": queue.rejected,
+                "queueWait": (
+                    self.metrics.queue_wait[tool_class].summary()
+                    if self.metrics is not None
+                    and tool_class in self.metrics.queue_wait
+                    else None
+                ),
+            }
+            for tool_class, queue in self._queues.items()
+        }
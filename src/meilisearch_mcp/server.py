@@ -1,29 +1,165 @@
+import argparse
 import asyncio
+import hmac
+import ipaddress
 import json
 import os
-from typing import Optional, Dict, Any, List, Union
+import weakref
+from typing import Optional, Dict, Any, List, Union, Callable, Awaitable
 from datetime import datetime
 import mcp.types as types
 from mcp.server import Server, NotificationOptions
 from mcp.server.models import InitializationOptions
 import mcp.server.stdio
 
+from mcp.server.sse import SseServerTransport
+from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+from mcp.server.transport_security import TransportSecuritySettings
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Mount, Route
+import uvicorn
+
 from .client import MeilisearchClient
+from .encoding import encode_response, json_serializer
+from .errors import MeilisearchApiError
+from .instrumentation import ServerMetrics, PrometheusExporter
 from .logging import MCPLogger
+from .resilience import ResilienceConfig
+from .scheduling import AdmissionRejected, ClassLimits, ToolScheduler
+from .tasks import TERMINAL_STATUSES
+from .tools import ToolFormatter, ToolRegistry, ToolSpec
+from .transport import PoolConfig
 
 logger = MCPLogger()
 
+# Ordering of MCP logging levels, used to honour logging/setLevel
+LOG_LEVELS = [
+    "debug",
+    "info",
+    "notice",
+    "warning",
+    "error",
+    "critical",
+    "alert",
+    "emergency",
+]
+
+# Search parameters shaping each hit, forwarded as given
+SEARCH_DISPLAY_PARAMS = (
+    "attributesToRetrieve",
+    "attributesToCrop",
+    "cropLength",
+    "attributesToHighlight",
+    "showRankingScore",
+)
+
+# Query parameters accepted by get-tasks
+TASK_FILTERS = {
+    "limit",
+    "from",
+    "reverse",
+    "batchUids",
+    "uids",
+    "canceledBy",
+    "types",
+    "statuses",
+    "indexUids",
+    "afterEnqueuedAt",
+    "beforeEnqueuedAt",
+    "afterStartedAt",
+    "beforeStartedAt",
+    "afterFinishedAt",
+    "beforeFinishedAt",
+}
+
+# Tools reading or writing server-side paths, or repointing the server, which
+# HTTP clients may only call when explicitly enabled
+HTTP_RESTRICTED_TOOLS = (
+    "import-documents",
+    "export-documents",
+    "update-connection-settings",
+)
+
+# Metrics key of calls to tools that are not registered, so that arbitrary
+# names cannot grow the metrics without bound
+UNKNOWN_TOOL = "unknown"
+
+
+def is_loopback(host: str) -> bool:
+    """Whether a listen address only accepts local connections"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_loopback
+    except ValueError:
+        return False
+
+
+class _ASGIEndpoint:
+    """Route endpoint handing the raw ASGI call to an MCP transport"""
+
+    def __init__(self, handle: Callable[..., Awaitable[None]]):
+        self.handle = handle
+
+    async def __call__(self, scope, receive, send):
+        await self.handle(scope, receive, send)
+
 
-def json_serializer(obj: Any) -> str:
-    """Custom JSON serializer for objects not serializable by default json code"""
-    if isinstance(obj, datetime):
-        return obj.isoformat()
-    return str(obj)
+class _BearerTokenAuth:
+    """ASGI middleware rejecting HTTP requests without the bearer token"""
 
+    def __init__(self, app, token: str):
+        self.app = app
+        self.expected = f"Bearer {token}".encode()
 
-def create_server(url: str = "http://localhost:7700", api_key: Optional[str] = None) -> "MeilisearchMCPServer":
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            given = dict(scope["headers"]).get(b"authorization", b"")
+            if not hmac.compare_digest(given, self.expected):
+                response = Response(
+                    "Unauthorized",
+                    status_code=401,
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+def create_server(
+    url: str = "http://localhost:7700",
+    api_key: Optional[str] = None,
+    task_notifications: bool = False,
+    metrics_interval: Optional[float] = None,
+    prometheus_port: Optional[int] = None,
+    log_overflow: str = "drop-oldest",
+    pretty_json: bool = False,
+    default_fields: Optional[Dict[str, List[str]]] = None,
+    pool: Optional[PoolConfig] = None,
+    replicas: Optional[List[str]] = None,
+    probe_interval: float = 5.0,
+    resilience: Optional[ResilienceConfig] = None,
+    class_limits: Optional[Dict[str, ClassLimits]] = None,
+) -> "MeilisearchMCPServer":
     """Create and return a configured MeilisearchMCPServer instance"""
-    return MeilisearchMCPServer(url, api_key)
+    return MeilisearchMCPServer(
+        url,
+        api_key,
+        task_notifications=task_notifications,
+        metrics_interval=metrics_interval,
+        prometheus_port=prometheus_port,
+        log_overflow=log_overflow,
+        pretty_json=pretty_json,
+        default_fields=default_fields,
+        pool=pool,
+        replicas=replicas,
+        probe_interval=probe_interval,
+        resilience=resilience,
+        class_limits=class_limits,
+    )
 
 
 class MeilisearchMCPServer:
@@ -32,472 +168,889 @@ class MeilisearchMCPServer:
         url: str = "http://localhost:7700",
         api_key: Optional[str] = None,
         log_dir: Optional[str] = None,
+        task_notifications: bool = False,
+        metrics_interval: Optional[float] = None,
+        prometheus_port: Optional[int] = None,
+        log_overflow: str = "drop-oldest",
+        pretty_json: bool = False,
+        default_fields: Optional[Dict[str, List[str]]] = None,
+        pool: Optional[PoolConfig] = None,
+        replicas: Optional[List[str]] = None,
+        probe_interval: float = 5.0,
+        resilience: Optional[ResilienceConfig] = None,
+        class_limits: Optional[Dict[str, ClassLimits]] = None,
     ):
         """Initialize MCP server for Meilisearch"""
         # Set up logging directory
         if not log_dir:
             log_dir = os.path.expanduser("~/.meilisearch-mcp/logs")
 
-        self.logger = MCPLogger("meilisearch-mcp", log_dir)
+        self.logger = MCPLogger("meilisearch-mcp", log_dir, overflow=log_overflow)
         self.url = url
         self.api_key = api_key
-        self.meili_client = MeilisearchClient(url, api_key)
+        self.task_notifications = task_notifications
+        self.metrics_interval = metrics_interval
+        self.pretty_json = pretty_json
+        self.probe_interval = probe_interval
+        self.metrics = ServerMetrics()
+        self.metrics.log_stats = self.logger.get_stats
+        self.scheduler = ToolScheduler(class_limits, self.metrics)
+        self.prometheus = (
+            PrometheusExporter(self.metrics, port=prometheus_port)
+            if prometheus_port
+            else None
+        )
+        # Session to notify about each task enqueued through this server
+        self._task_sessions: Dict[int, Any] = {}
+        # Default minimum level of log notifications, and per-session overrides
+        self.client_log_level = "info"
+        self._session_log_levels: "weakref.WeakKeyDictionary[Any, str]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.meili_client = MeilisearchClient(
+            url,
+            api_key,
+            default_fields=default_fields,
+            pool=pool,
+            replicas=replicas,
+            resilience=resilience,
+        )
+        self.meili_client.tasks.add_status_listener(self._notify_task_status)
+        self.meili_client.tasks.add_abandon_listener(self._forget_task_sessions)
         self.server = Server("meilisearch")
         self._setup_handlers()
 
     async def update_connection(self, url: Optional[str] = None, api_key: Optional[str] = None):
-        """Update connection settings and reinitialize client if needed"""
+        """Update connection settings, reusing the pooled connections"""
         if url:
             self.url = url
         if api_key:
             self.api_key = api_key
 
-        self.meili_client = MeilisearchClient(self.url, self.api_key)
+        # The client keeps its connection pool; only a new URL resets state
+        if await self.meili_client.update_connection(self.url, self.api_key):
+            self._task_sessions.clear()
         self.logger.info("Updated Meilisearch connection settings", url=self.url)
 
+    def _progress_reporter(self) -> Optional[Callable[[int, int], Awaitable[None]]]:
+        """Return a callback sending MCP progress notifications for the current request"""
+        try:
+            context = self.server.request_context
+        except LookupError:
+            return None
+        token = context.meta.progressToken if context.meta else None
+        if token is None:
+            return None
+
+        async def report(progress: int, total: int):
+            await context.session.send_progress_notification(token, progress, total)
+
+        return report
+
+    def _watch_enqueued_tasks(self, result: Any):
+        """Follow tasks enqueued by a tool call and notify the calling session"""
+        if not self.task_notifications or not isinstance(result, dict):
+            return
+        task_uids = result.get("taskUids") or []
+        if result.get("taskUid") is not None:
+            task_uids = [result["taskUid"]]
+        if not task_uids:
+            return
+        try:
+            session = self.server.request_context.session
+        except LookupError:
+            return
+        for task_uid in task_uids:
+            self._task_sessions[task_uid] = session
+        self.meili_client.tasks.watch_tasks(task_uids)
+
+    def _forget_task_sessions(self, task_uids: List[int]):
+        """Drop the sessions of tasks no longer followed"""
+        for task_uid in task_uids:
+            self._task_sessions.pop(task_uid, None)
+
+    async def _notify_task_status(self, task: Dict[str, Any]):
+        """Send a task status change to the session that enqueued it"""
+        if task["status"] in TERMINAL_STATUSES:
+            session = self._task_sessions.pop(task["uid"], None)
+        else:
+            session = self._task_sessions.get(task["uid"])
+        if session is None:
+            return
+
+        level = "warning" if task["status"] in ("failed", "canceled") else "info"
+        minimum = self._session_log_levels.get(session, self.client_log_level)
+        if LOG_LEVELS.index(level) < LOG_LEVELS.index(minimum):
+            return
+        details = task.get("details") or {}
+        await session.send_log_message(
+            level=level,
+            data={
+                "taskUid": task["uid"],
+                "indexUid": task.get("indexUid"),
+                "type": task.get("type"),
+                "status": task["status"],
+                "duration": task.get("duration"),
+                "indexedDocuments": details.get("indexedDocuments"),
+                "error": task.get("error"),
+            },
+            logger="meilisearch-tasks",
+        )
+
     def _setup_handlers(self):
         """Setup MCP request handlers"""
+        self.tools = ToolRegistry(self._tool_specs())
+
+        @self.server.set_logging_level()
+        async def handle_set_logging_level(level: types.LoggingLevel):
+            """Set the minimum level of log notifications sent to the client"""
+            try:
+                session = self.server.request_context.session
+            except LookupError:
+                self.client_log_level = level
+                return
+            self._session_log_levels[session] = level
 
         @self.server.list_tools()
         async def handle_list_tools() -> list[types.Tool]:
             """List available tools"""
-            return [
-                types.Tool(
-                    name="get-connection-settings",
-                    description="Get current Meilisearch connection settings",
-                    inputSchema={"type": "object", "properties": {}},
-                ),
-                types.Tool(
-                    name="update-connection-settings",
-                    description="Update Meilisearch connection settings",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "url": {"type": "string", "optional": True},
-                            "api_key": {"type": "string", "optional": True},
-                        },
+            return self.tools.list_tools()
+
+        # Arguments are validated by the tool registry's compiled validators
+        @self.server.call_tool(validate_input=False)
+        async def handle_call_tool(
+            name: str, arguments: Optional[Dict[str, Any]] = None
+        ) -> list[types.TextContent]:
+            """Handle tool execution once admitted, recording its latency"""
+            tool_class, priority = "interactive", 0
+            if name in self.tools:
+                spec = self.tools.get(name)
+                tool_class, priority = spec.tool_class, spec.priority
+            try:
+                async with self.scheduler.admit(tool_class, priority):
+                    with self.metrics.track(self._metric_name(name)):
+                        return await self.dispatch_tool(name, arguments)
+            except AdmissionRejected as e:
+                self.logger.warning(
+                    f"Rejected tool {name}", tool=name, retry_after=e.retry_after
+                )
+                return [types.TextContent(type="text", text=f"Error: {str(e)}")]
+
+    async def dispatch_tool(
+        self, name: str, arguments: Optional[Dict[str, Any]] = None
+    ) -> list[types.TextContent]:
+        """Execute a tool"""
+        try:
+            text = await self.tools.call(name, arguments)
+            return [types.TextContent(type="text", text=text)]
+        except Exception as e:
+            self.metrics.record_error(self._metric_name(name))
+            details = e.to_dict() if isinstance(e, MeilisearchApiError) else None
+            self.logger.error(
+                f"Error executing tool {name}",
+                error=str(e),
+                details=details,
+                tool=name,
+                arguments=arguments,
+            )
+            return [types.TextContent(type="text", text=f"Error: {str(e)}")]
+
+    def _metric_name(self, name: str) -> str:
+        """Metrics key of a tool: unknown names share one series"""
+        return name if name in self.tools else UNKNOWN_TOOL
+
+    async def _watched(self, operation: Awaitable[Any]) -> Any:
+        """Run an operation that enqueues tasks and follow those tasks"""
+        result = await operation
+        self._watch_enqueued_tasks(result)
+        return result
+
+    async def _get_connection_settings(self, arguments: Dict[str, Any]) -> str:
+        return f"Current connection settings:\nURL: {self.url}\nAPI Key: {'*' * 8 if self.api_key else 'Not set'}"
+
+    async def _update_connection_settings(self, arguments: Dict[str, Any]) -> str:
+        await self.update_connection(arguments.get("url"), arguments.get("api_key"))
+        return f"Successfully updated connection settings to URL: {self.url}"
+
+    async def _health_check(self, arguments: Dict[str, Any]) -> str:
+        is_healthy = await self.meili_client.health_check()
+        return f"Meilisearch is {is_healthy and 'available' or 'unavailable'}"
+
+    async def _search(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        return await self.meili_client.search(
+            query=arguments["query"],
+            index_uid=arguments.get("indexUid"),
+            limit=arguments.get("limit"),
+            offset=arguments.get("offset"),
+            filter=arguments.get("filter"),
+            sort=arguments.get("sort"),
+            merge=arguments.get("merge", False),
+            **{name: arguments.get(name) for name in SEARCH_DISPLAY_PARAMS},
+        )
+
+    async def _get_tasks(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        filtered_args = {k: v for k, v in arguments.items() if k in TASK_FILTERS}
+        return await self.meili_client.tasks.get_tasks(filtered_args)
+
+    async def _delete_key(self, arguments: Dict[str, Any]) -> str:
+        await self.meili_client.keys.delete_key(arguments["key"])
+        return f"Successfully deleted API key: {arguments['key']}"
+
+    async def _get_health_status(self, arguments: Dict[str, Any]) -> Any:
+        status = await self.meili_client.monitoring.get_health_status(
+            arguments.get("detailed", False)
+        )
+        self.logger.info("Health status checked", status=status.__dict__)
+        return status
+
+    async def _get_index_metrics(self, arguments: Dict[str, Any]) -> Any:
+        metrics = await self.meili_client.monitoring.get_index_metrics(
+            arguments["indexUid"]
+        )
+        self.logger.info(
+            "Index metrics retrieved",
+            index=arguments["indexUid"],
+            metrics=metrics.__dict__,
+        )
+        return metrics
+
+    async def _get_system_info(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        info = await self.meili_client.monitoring.get_system_information()
+        self.logger.info("System information retrieved", info=info)
+        return info
+
+    async def _get_metrics_history(self, arguments: Dict[str, Any]) -> str:
+        sampler = self.meili_client.monitoring.sampler
+        if not sampler.running and not sampler.database_size.count:
+            return "Metrics sampling is disabled; set MEILI_MCP_METRICS_INTERVAL to enable it"
+        history = sampler.get_history(
+            arguments.get("windowSeconds"), arguments.get("indexUid")
+        )
+        return f"Metrics history: {self._encode(history)}"
+
+    async def _get_server_metrics(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "tools": self.metrics.get_stats(),
+            "logging": self.logger.get_stats(),
+            "endpoints": self.meili_client.transport.endpoints.get_stats(),
+            "scheduler": self.scheduler.get_stats(),
+            "coalescing": self.meili_client.transport.flights.get_stats(),
+        }
+
+    async def _get_cache_stats(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        return self.meili_client.search_cache.get_stats()
+
+    def _encode(self, value: Any) -> str:
+        """Encode a tool result in the configured JSON style"""
+        return encode_response(value, pretty=self.pretty_json)
+
+    def _labeled(self, label: str, separator: str = ": ") -> ToolFormatter:
+        """Formatter prefixing the encoded result with a label"""
+        return lambda result, args: f"{label}{separator}{self._encode(result)}"
+
+    def _tool_specs(self) -> List[ToolSpec]:
+        """Define every tool: input schema, handler and response formatter"""
+        empty = {"type": "object", "properties": {}}
+        return [
+            ToolSpec(
+                name="get-connection-settings",
+                tool_class="admin",
+                description="Get current Meilisearch connection settings",
+                input_schema=empty,
+                handler=self._get_connection_settings,
+            ),
+            ToolSpec(
+                name="update-connection-settings",
+                tool_class="admin",
+                description="Update Meilisearch connection settings",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "url": {"type": "string", "optional": True},
+                        "api_key": {"type": "string", "optional": True},
                     },
-                ),
-                types.Tool(
-                    name="health-check",
-                    description="Check Meilisearch server health",
-                    inputSchema={"type": "object", "properties": {}},
-                ),
-                types.Tool(
-                    name="get-version",
-                    description="Get Meilisearch version information",
-                    inputSchema={"type": "object", "properties": {}},
-                ),
-                types.Tool(
-                    name="get-stats",
-                    description="Get database statistics",
-                    inputSchema={"type": "object", "properties": {}},
-                ),
-                types.Tool(
-                    name="create-index",
-                    description="Create a new Meilisearch index",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "uid": {"type": "string"},
-                            "primaryKey": {"type": "string", "optional": True},
-                        },
-                        "required": ["uid"],
+                },
+                handler=self._update_connection_settings,
+            ),
+            ToolSpec(
+                name="health-check",
+                description="Check Meilisearch server health",
+                input_schema=empty,
+                handler=self._health_check,
+            ),
+            ToolSpec(
+                name="get-version",
+                description="Get Meilisearch version information",
+                input_schema=empty,
+                handler=lambda args: self.meili_client.get_version(),
+                formatter=self._labeled("Version info"),
+            ),
+            ToolSpec(
+                name="get-stats",
+                description="Get database statistics",
+                input_schema=empty,
+                handler=lambda args: self.meili_client.get_stats(),
+                formatter=self._labeled("Database stats"),
+            ),
+            ToolSpec(
+                name="create-index",
+                tool_class="admin",
+                description="Create a new Meilisearch index",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "uid": {"type": "string"},
+                        "primaryKey": {"type": "string", "optional": True},
                     },
+                    "required": ["uid"],
+                },
+                handler=lambda args: self._watched(
+                    self.meili_client.indexes.create_index(
+                        args["uid"], args.get("primaryKey")
+                    )
                 ),
-                types.Tool(
-                    name="list-indexes",
-                    description="List all Meilisearch indexes",
-                    inputSchema={"type": "object", "properties": {}},
-                ),
-                types.Tool(
-                    name="get-documents",
-                    description="Get documents from an index",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "indexUid": {"type": "string"},
-                            "offset": {"type": "integer", "optional": True},
-                            "limit": {"type": "integer", "optional": True},
-                        },
-                        "required": ["indexUid"],
+                formatter=self._labeled("Created index"),
+            ),
+            ToolSpec(
+                name="list-indexes",
+                description="List all Meilisearch indexes",
+                input_schema=empty,
+                handler=lambda args: self.meili_client.get_indexes(),
+                formatter=self._labeled("Indexes", ":\n"),
+            ),
+            ToolSpec(
+                name="get-documents",
+                description="Get documents from an index",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "indexUid": {"type": "string"},
+                        "offset": {"type": "integer", "optional": True},
+                        "limit": {"type": "integer", "optional": True},
+                        "fields": {"type": "array", "items": {"type": "string"}, "optional": True},
                     },
+                    "required": ["indexUid"],
+                },
+                handler=lambda args: self.meili_client.documents.get_documents(
+                    args["indexUid"],
+                    args.get("offset"),
+                    args.get("limit"),
+                    args.get("fields"),
                 ),
-                types.Tool(
-                    name="add-documents",
-                    description="Add documents to an index",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "indexUid": {"type": "string"},
-                            "documents": {"type": "array", "items": {"type": "object"}},
-                            "primaryKey": {"type": "string", "optional": True},
-                        },
-                        "required": ["indexUid", "documents"],
+                formatter=self._labeled("Documents"),
+            ),
+            ToolSpec(
+                name="add-documents",
+                tool_class="bulk",
+                description="Add documents to an index",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "indexUid": {"type": "string"},
+                        "documents": {"type": "array", "items": {"type": "object"}},
+                        "primaryKey": {"type": "string", "optional": True},
                     },
+                    "required": ["indexUid", "documents"],
+                },
+                handler=lambda args: self._watched(
+                    self.meili_client.documents.add_documents(
+                        args["indexUid"], args["documents"], args.get("primaryKey")
+                    )
                 ),
-                types.Tool(
-                    name="get-settings",
-                    description="Get current settings for an index",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {"indexUid": {"type": "string"}},
-                        "required": ["indexUid"],
+                formatter=self._labeled("Added documents"),
+            ),
+            ToolSpec(
+                name="import-documents",
+                tool_class="bulk",
+                priority=1,
+                description="Stream documents from a local NDJSON, CSV or JSON array file (optionally gzip-compressed) into an index",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "indexUid": {"type": "string"},
+                        "path": {"type": "string"},
+                        "format": {"type": "string", "enum": ["ndjson", "csv", "json"], "optional": True},
+                        "primaryKey": {"type": "string", "optional": True},
+                        "csvDelimiter": {"type": "string", "optional": True},
                     },
+                    "required": ["indexUid", "path"],
+                },
+                handler=lambda args: self._watched(
+                    self.meili_client.documents.import_documents(
+                        args["indexUid"],
+                        args["path"],
+                        format=args.get("format"),
+                        primary_key=args.get("primaryKey"),
+                        csv_delimiter=args.get("csvDelimiter"),
+                        on_progress=self._progress_reporter(),
+                    )
                 ),
-                types.Tool(
-                    name="update-settings",
-                    description="Update settings for an index",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "indexUid": {"type": "string"},
-                            "settings": {"type": "object"},
-                        },
-                        "required": ["indexUid", "settings"],
+                formatter=self._labeled("Imported documents"),
+            ),
+            ToolSpec(
+                name="export-documents",
+                tool_class="bulk",
+                priority=1,
+                description="Export all documents of an index to a local NDJSON file (gzip-compressed when the path ends in .gz)",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "indexUid": {"type": "string"},
+                        "path": {"type": "string"},
+                        "filter": {"type": "string", "optional": True},
+                        "fields": {"type": "array", "items": {"type": "string"}, "optional": True},
                     },
+                    "required": ["indexUid", "path"],
+                },
+                handler=lambda args: self.meili_client.documents.export_documents(
+                    args["indexUid"],
+                    args["path"],
+                    filter=args.get("filter"),
+                    fields=args.get("fields"),
+                    on_progress=self._progress_reporter(),
                 ),
-                types.Tool(
-                    name="search",
-                    description="Search through Meilisearch indices. If indexUid is not provided, it will search across all indices.",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "query": {"type": "string"},
-                            "indexUid": {"type": "string", "optional": True},
-                            "limit": {"type": "integer", "optional": True},
-                            "offset": {"type": "integer", "optional": True},
-                            "filter": {"type": "string", "optional": True},
-                            "sort": {"type": "array", "items": {"type": "string"}, "optional": True},
-                        },
-                        "required": ["query"],
-                    },
+                formatter=self._labeled("Exported documents"),
+            ),
+            ToolSpec(
+                name="get-settings",
+                description="Get current settings for an index",
+                input_schema={
+                    "type": "object",
+                    "properties": {"indexUid": {"type": "string"}},
+                    "required": ["indexUid"],
+                },
+                handler=lambda args: self.meili_client.settings.get_settings(
+                    args["indexUid"]
                 ),
-                types.Tool(
-                    name="get-task",
-                    description="Get information about a specific task",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {"taskUid": {"type": "integer"}},
-                        "required": ["taskUid"],
+                formatter=self._labeled("Current settings"),
+            ),
+            ToolSpec(
+                name="update-settings",
+                tool_class="bulk",
+                description="Update settings for an index. Only settings that differ from the current ones are sent; the result lists them as changedSettings and tells whether a reindex is expected",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "indexUid": {"type": "string"},
+                        "settings": {"type": "object"},
                     },
+                    "required": ["indexUid", "settings"],
+                },
+                handler=lambda args: self._watched(
+                    self.meili_client.settings.update_settings(
+                        args["indexUid"], args["settings"]
+                    )
                 ),
-                types.Tool(
-                    name="get-tasks",
-                    description="Get list of tasks with optional filters",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "limit": {"type": "integer", "optional": True},
-                            "from": {"type": "integer", "optional": True},
-                            "reverse": {"type": "boolean", "optional": True},
-                            "batchUids": {"type": "array", "items": {"type": "string"}, "optional": True},
-                            "uids": {"type": "array", "items": {"type": "integer"}, "optional": True},
-                            "canceledBy": {"type": "array", "items": {"type": "string"}, "optional": True},
-                            "types": {"type": "array", "items": {"type": "string"}, "optional": True},
-                            "statuses": {"type": "array", "items": {"type": "string"}, "optional": True},
-                            "indexUids": {"type": "array", "items": {"type": "string"}, "optional": True},
-                            "afterEnqueuedAt": {"type": "string", "optional": True},
-                            "beforeEnqueuedAt": {"type": "string", "optional": True},
-                            "afterStartedAt": {"type": "string", "optional": True},
-                            "beforeStartedAt": {"type": "string", "optional": True},
-                            "afterFinishedAt": {"type": "string", "optional": True},
-                            "beforeFinishedAt": {"type": "string", "optional": True}
-                        }
-                    }
+                formatter=lambda result, args: (
+                    f"Settings updated: {self._encode(result)}"
+                    if result["changedSettings"]
+                    else f"Settings unchanged: {self._encode(result)}"
                 ),
-                types.Tool(
-                    name="cancel-tasks",
-                    description="Cancel tasks based on filters",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "uids": {"type": "string", "optional": True},
-                            "indexUids": {"type": "string", "optional": True},
-                            "types": {"type": "string", "optional": True},
-                            "statuses": {"type": "string", "optional": True},
-                        },
+            ),
+            ToolSpec(
+                name="search",
+                description="Search through Meilisearch indices. If indexUid is not provided, it will search across all indices; set merge to rank hits from all indices together and return only the overall top results. Use attributesToRetrieve, attributesToCrop/cropLength and attributesToHighlight to keep hits small.",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "query": {"type": "string"},
+                        "indexUid": {"type": "string", "optional": True},
+                        "limit": {"type": "integer", "optional": True},
+                        "offset": {"type": "integer", "optional": True},
+                        "filter": {"type": "string", "optional": True},
+                        "sort": {"type": "array", "items": {"type": "string"}, "optional": True},
+                        "merge": {"type": "boolean", "optional": True},
+                        "attributesToRetrieve": {"type": "array", "items": {"type": "string"}, "optional": True},
+                        "attributesToCrop": {"type": "array", "items": {"type": "string"}, "optional": True},
+                        "cropLength": {"type": "integer", "optional": True},
+                        "attributesToHighlight": {"type": "array", "items": {"type": "string"}, "optional": True},
+                        "showRankingScore": {"type": "boolean", "optional": True},
                     },
+                    "required": ["query"],
+                },
+                handler=self._search,
+                formatter=lambda results, args: (
+                    f"Search results for '{args['query']}':\n{self._encode(results)}"
                 ),
-                types.Tool(
-                    name="get-keys",
-                    description="Get list of API keys",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {
-                            "offset": {"type": "integer", "optional": True},
-                            "limit": {"type": "integer", "optional": True},
-                        },
+            ),
+            ToolSpec(
+                name="get-task",
+                description="Get information about a specific task",
+                input_schema={
+                    "type": "object",
+                    "properties": {"taskUid": {"type": "integer"}},
+                    "required": ["taskUid"],
+                },
+                handler=lambda args: self.meili_client.tasks.get_task(args["taskUid"]),
+                formatter=self._labeled("Task information"),
+            ),
+            ToolSpec(
+                name="get-tasks",
+                description="Get list of tasks with optional filters",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "limit": {"type": "integer", "optional": True},
+                        "from": {"type": "integer", "optional": True},
+                        "reverse": {"type": "boolean", "optional": True},
+                        "batchUids": {"type": "array", "items": {"type": "string"}, "optional": True},
+                        "uids": {"type": "array", "items": {"type": "integer"}, "optional": True},
+                        "canceledBy": {"type": "array", "items": {"type": "string"}, "optional": True},
+                        "types": {"type": "array", "items": {"type": "string"}, "optional": True},
+                        "statuses": {"type": "array", "items": {"type": "string"}, "optional": True},
+                        "indexUids": {"type": "array", "items": {"type": "string"}, "optional": True},
+                        "afterEnqueuedAt": {"type": "string", "optional": True},
+                        "beforeEnqueuedAt": {"type": "string", "optional": True},
+                        "afterStartedAt": {"type": "string", "optional": True},
+                        "beforeStartedAt": {"type": "string", "optional": True},
+                        "afterFinishedAt": {"type": "string", "optional": True},
+                        "beforeFinishedAt": {"type": "string", "optional": True},
                     },
-                ),
-                types.Tool(
-                    name="delete-key",
-                    description="Delete an API key",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {"key": {"type": "string"}},
-                        "required": ["key"],
+                },
+                handler=self._get_tasks,
+                formatter=self._labeled("Tasks"),
+            ),
+            ToolSpec(
+                name="wait-for-tasks",
+                tool_class="wait",
+                description="Wait until tasks succeed, fail or are canceled, returning their final state",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "taskUids": {"type": "array", "items": {"type": "integer"}},
+                        "timeoutMs": {"type": "integer", "optional": True},
                     },
+                    "required": ["taskUids"],
+                },
+                handler=lambda args: self.meili_client.tasks.wait_for_tasks(
+                    args["taskUids"], args.get("timeoutMs", 30000) / 1000
                 ),
-                types.Tool(
-                    name="get-health-status",
-                    description="Get comprehensive health status of Meilisearch",
-                    inputSchema={"type": "object", "properties": {}},
-                ),
-                types.Tool(
-                    name="get-index-metrics",
-                    description="Get detailed metrics for an index",
-                    inputSchema={
-                        "type": "object",
-                        "properties": {"indexUid": {"type": "string"}},
-                        "required": ["indexUid"],
+                formatter=self._labeled("Tasks"),
+            ),
+            ToolSpec(
+                name="cancel-tasks",
+                tool_class="admin",
+                description="Cancel tasks based on filters",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "uids": {"type": "string", "optional": True},
+                        "indexUids": {"type": "string", "optional": True},
+                        "types": {"type": "string", "optional": True},
+                        "statuses": {"type": "string", "optional": True},
                     },
+                },
+                handler=lambda args: self._watched(
+                    self.meili_client.tasks.cancel_tasks(args)
                 ),
-                types.Tool(
-                    name="get-system-info",
-                    description="Get system-level information",
-                    inputSchema={"type": "object", "properties": {}},
-                ),
-            ]
+                formatter=self._labeled("Tasks cancelled"),
+            ),
+            ToolSpec(
+                name="get-keys",
+                tool_class="admin",
+                description="Get list of API keys",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "offset": {"type": "integer", "optional": True},
+                        "limit": {"type": "integer", "optional": True},
+                    },
+                },
+                handler=lambda args: self.meili_client.keys.get_keys(args),
+                formatter=self._labeled("API keys"),
+            ),
+            ToolSpec(
+                name="delete-key",
+                tool_class="admin",
+                description="Delete an API key",
+                input_schema={
+                    "type": "object",
+                    "properties": {"key": {"type": "string"}},
+                    "required": ["key"],
+                },
+                handler=self._delete_key,
+            ),
+            ToolSpec(
+                name="get-health-status",
+                tool_class="admin",
+                description="Get comprehensive health status of Meilisearch",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "detailed": {"type": "boolean", "optional": True},
+                    },
+                },
+                handler=self._get_health_status,
+                formatter=self._labeled("Health status"),
+            ),
+            ToolSpec(
+                name="get-index-metrics",
+                tool_class="admin",
+                description="Get detailed metrics for an index",
+                input_schema={
+                    "type": "object",
+                    "properties": {"indexUid": {"type": "string"}},
+                    "required": ["indexUid"],
+                },
+                handler=self._get_index_metrics,
+                formatter=self._labeled("Index metrics"),
+            ),
+            ToolSpec(
+                name="get-system-info",
+                tool_class="admin",
+                description="Get system-level information",
+                input_schema=empty,
+                handler=self._get_system_info,
+                formatter=self._labeled("System information"),
+            ),
+            ToolSpec(
+                name="get-metrics-history",
+                tool_class="admin",
+                description="Get document counts, database size and indexing time recorded by the background metrics sampler, with min/max/avg and rates over a window",
+                input_schema={
+                    "type": "object",
+                    "properties": {
+                        "windowSeconds": {"type": "number", "optional": True},
+                        "indexUid": {"type": "string", "optional": True},
+                    },
+                },
+                handler=self._get_metrics_history,
+            ),
+            ToolSpec(
+                name="get-server-metrics",
+                tool_class="admin",
+                description="Get per-tool call counts, errors and latency quantiles, split into time waiting on Meilisearch and local time, plus log buffer counters, the state of each Meilisearch node, per tool class admission counters and queue wait, and identical concurrent reads coalesced into one request",
+                input_schema=empty,
+                handler=self._get_server_metrics,
+                formatter=self._labeled("Server metrics"),
+            ),
+            ToolSpec(
+                name="get-cache-stats",
+                tool_class="admin",
+                description="Get search cache hit, miss and eviction counters",
+                input_schema=empty,
+                handler=self._get_cache_stats,
+                formatter=self._labeled("Search cache stats"),
+            ),
+        ]
 
-        @self.server.call_tool()
-        async def handle_call_tool(
-            name: str, arguments: Optional[Dict[str, Any]] = None
-        ) -> list[types.TextContent]:
-            """Handle tool execution"""
-            try:
-                if name == "get-connection-settings":
-                    return [
-                        types.TextContent(
-                            type="text",
-                            text=f"Current connection settings:\nURL: {self.url}\nAPI Key: {'*' * 8 if self.api_key else 'Not set'}",
-                        )
-                    ]
-
-                elif name == "update-connection-settings":
-                    await self.update_connection(
-                        arguments.get("url"),
-                        arguments.get("api_key")
-                    )
-                    return [
-                        types.TextContent(
-                            type="text",
-                            text=f"Successfully updated connection settings to URL: {self.url}",
-                        )
-                    ]
-
-                elif name == "create-index":
-                    result = await self.meili_client.indexes.create_index(
-                        arguments["uid"], arguments.get("primaryKey")
-                    )
-                    return [
-                        types.TextContent(type="text", text=f"Created index: {result}")
-                    ]
-
-                elif name == "list-indexes":
-                    indexes = await self.meili_client.get_indexes()
-                    formatted_json = json.dumps(indexes, indent=2, default=json_serializer)
-                    return [
-                        types.TextContent(
-                            type="text", text=f"Indexes:\n{formatted_json}"
-                        )
-                    ]
-
-                elif name == "get-documents":
-                    documents = await self.meili_client.documents.get_documents(
-                        arguments["indexUid"],
-                        arguments.get("offset"),
-                        arguments.get("limit"),
-                    )
-                    return [
-                        types.TextContent(type="text", text=f"Documents: {documents}")
-                    ]
-
-                elif name == "add-documents":
-                    result = await self.meili_client.documents.add_documents(
-                        arguments["indexUid"],
-                        arguments["documents"],
-                        arguments.get("primaryKey"),
-                    )
-                    return [
-                        types.TextContent(
-                            type="text", text=f"Added documents: {result}"
-                        )
-                    ]
-
-                elif name == "health-check":
-                    is_healthy = await self.meili_client.health_check()
-                    return [
-                        types.TextContent(
-                            type="text",
-                            text=f"Meilisearch is {is_healthy and 'available' or 'unavailable'}",
-                        )
-                    ]
-
-                elif name == "get-version":
-                    version = await self.meili_client.get_version()
-                    return [
-                        types.TextContent(type="text", text=f"Version info: {version}")
-                    ]
-
-                elif name == "get-stats":
-                    stats = await self.meili_client.get_stats()
-                    return [
-                        types.TextContent(type="text", text=f"Database stats: {stats}")
-                    ]
-
-                elif name == "get-settings":
-                    settings = await self.meili_client.settings.get_settings(
-                        arguments["indexUid"]
-                    )
-                    return [
-                        types.TextContent(
-                            type="text", text=f"Current settings: {settings}"
-                        )
-                    ]
-
-                elif name == "update-settings":
-                    result = await self.meili_client.settings.update_settings(
-                        arguments["indexUid"], arguments["settings"]
-                    )
-                    return [
-                        types.TextContent(
-                            type="text", text=f"Settings updated: {result}"
-                        )
-                    ]
-
-                elif name == "search":
-                    search_results = await self.meili_client.search(
-                        query=arguments["query"],
-                        index_uid=arguments.get("indexUid"),
-                        limit=arguments.get("limit"),
-                        offset=arguments.get("offset"),
-                        filter=arguments.get("filter"),
-                        sort=arguments.get("sort"),
-                    )
+    def _initialization_options(self) -> InitializationOptions:
+        return InitializationOptions(
+            server_name="meilisearch",
+            server_version="0.1.0",
+            capabilities=self.server.get_capabilities(
+                notification_options=NotificationOptions(),
+                experimental_capabilities={},
+            ),
+        )
 
-                    # Format the results for better readability
-                    formatted_results = json.dumps(search_results, indent=2, default=json_serializer)
-                    return [
-                        types.TextContent(
-                            type="text",
-                            text=f"Search results for '{arguments['query']}':\n{formatted_results}"
-                        )
-                    ]
-
-                elif name == "get-task":
-                    task = await self.meili_client.tasks.get_task(arguments["taskUid"])
-                    return [
-                        types.TextContent(type="text", text=f"Task information: {task}")
-                    ]
-
-                elif name == "get-tasks":
-                    # Filter out any invalid parameters
-                    valid_params = {
-                        "limit", "from", "reverse", "batchUids", "uids", "canceledBy",
-                        "types", "statuses", "indexUids", "afterEnqueuedAt", "beforeEnqueuedAt",
-                        "afterStartedAt", "beforeStartedAt", "afterFinishedAt", "beforeFinishedAt"
-                    }
-                    filtered_args = {k: v for k, v in arguments.items() if k in valid_params} if arguments else {}
-                    tasks = await self.meili_client.tasks.get_tasks(filtered_args)
-                    return [types.TextContent(type="text", text=f"Tasks: {tasks}")]
-
-                elif name == "cancel-tasks":
-                    result = await self.meili_client.tasks.cancel_tasks(arguments)
-                    return [
-                        types.TextContent(
-                            type="text", text=f"Tasks cancelled: {result}"
-                        )
-                    ]
-
-                elif name == "get-keys":
-                    keys = await self.meili_client.keys.get_keys(arguments)
-                    return [types.TextContent(type="text", text=f"API keys: {keys}")]
-
-                elif name == "delete-key":
-                    await self.meili_client.keys.delete_key(arguments["key"])
-                    return [
-                        types.TextContent(
-                            type="text",
-                            text=f"Successfully deleted API key: {arguments['key']}",
-                        )
-                    ]
-
-                elif name == "get-health-status":
-                    status = await self.meili_client.monitoring.get_health_status()
-                    self.logger.info("Health status checked", status=status.__dict__)
-                    return [
-                        types.TextContent(
-                            type="text",
-                            text=f"Health status: {json.dumps(status.__dict__, default=json_serializer)}",
-                        )
-                    ]
-
-                elif name == "get-index-metrics":
-                    metrics = await self.meili_client.monitoring.get_index_metrics(
-                        arguments["indexUid"]
-                    )
-                    self.logger.info(
-                        "Index metrics retrieved",
-                        index=arguments["indexUid"],
-                        metrics=metrics.__dict__,
-                    )
-                    return [
-                        types.TextContent(
-                            type="text", text=f"Index metrics: {json.dumps(metrics.__dict__, default=json_serializer)}"
-                        )
-                    ]
-
-                elif name == "get-system-info":
-                    info = await self.meili_client.monitoring.get_system_information()
-                    self.logger.info("System information retrieved", info=info)
-                    return [
-                        types.TextContent(
-                            type="text", text=f"System information: {info}"
-                        )
-                    ]
-
-                raise ValueError(f"Unknown tool: {name}")
-
-            except Exception as e:
-                self.logger.error(
-                    f"Error executing tool {name}",
-                    error=str(e),
-                    tool=name,
-                    arguments=arguments,
+    def create_http_app(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        token: Optional[str] = None,
+        allowed_hosts: Optional[List[str]] = None,
+        unsafe_tools: bool = False,
+    ) -> Starlette:
+        """
+        ASGI app serving MCP over streamable HTTP at /mcp and over SSE at /sse.
+        Every session shares this server's Meilisearch client, connection pool
+        and caches. Requests must carry the bearer token when one is given,
+        and a token is required to listen on a non-loopback address. Host and
+        Origin headers are checked against the listen address and
+        allowed_hosts, against DNS rebinding. Unless unsafe_tools is set, the
+        tools in HTTP_RESTRICTED_TOOLS are not offered.
+        """
+        if not token and not is_loopback(host):
+            raise ValueError(
+                f"Refusing to serve MCP on non-loopback address {host} "
+                "without a token (set MEILI_MCP_HTTP_TOKEN)"
+            )
+        if not unsafe_tools:
+            for name in HTTP_RESTRICTED_TOOLS:
+                self.tools.unregister(name)
+
+        hosts = [f"{host}:{port}", *(allowed_hosts or ())]
+        if is_loopback(host):
+            hosts += [f"127.0.0.1:{port}", f"localhost:{port}", f"[::1]:{port}"]
+        security = TransportSecuritySettings(
+            enable_dns_rebinding_protection=True,
+            allowed_hosts=hosts,
+            allowed_origins=[
+                f"{scheme}://{allowed}"
+                for allowed in hosts
+                for scheme in ("http", "https")
+            ],
+        )
+        session_manager = StreamableHTTPSessionManager(
+            app=self.server, security_settings=security
+        )
+        sse = SseServerTransport("/messages/", security_settings=security)
+
+        async def handle_sse(request: Request) -> Response:
+            async with sse.connect_sse(
+                request.scope, request.receive, request._send
+            ) as (read_stream, write_stream):
+                await self.server.run(
+                    read_stream, write_stream, self._initialization_options()
                 )
-                return [types.TextContent(type="text", text=f"Error: {str(e)}")]
+            return Response()
+
+        return Starlette(
+            routes=[
+                Route("/mcp", endpoint=_ASGIEndpoint(session_manager.handle_request)),
+                Route("/sse", endpoint=handle_sse, methods=["GET"]),
+                Mount("/messages/", app=sse.handle_post_message),
+            ],
+            middleware=[Middleware(_BearerTokenAuth, token=token)] if token else [],
+            lifespan=lambda app: session_manager.run(),
+        )
 
-    async def run(self):
-        """Run the MCP server"""
+    async def run(
+        self,
+        transport: str = "stdio",
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        token: Optional[str] = None,
+        allowed_hosts: Optional[List[str]] = None,
+        unsafe_tools: bool = False,
+    ):
+        """Run the MCP server over stdio, or over HTTP for many sessions"""
         logger.info("Starting Meilisearch UPD MCP server...")
+        # Fail before any background work starts on an insecure HTTP setup
+        app = (
+            self.create_http_app(host, port, token, allowed_hosts, unsafe_tools)
+            if transport == "http"
+            else None
+        )
+        if self.metrics_interval:
+            self.meili_client.monitoring.sampler.start(self.metrics_interval)
+        if self.prometheus:
+            await self.prometheus.start()
+        await self.meili_client.transport.warm_up()
+        if self.probe_interval:
+            self.meili_client.transport.start_health_probe(self.probe_interval)
 
-        async with mcp.server.stdio.stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="meilisearch",
-                    server_version="0.1.0",
-                    capabilities=self.server.get_capabilities(
-                        notification_options=NotificationOptions(),
-                        experimental_capabilities={},
-                    ),
-                ),
-            )
+        try:
+            if transport == "http":
+                logger.info(f"Serving MCP on http://{host}:{port}/mcp and /sse")
+                config = uvicorn.Config(app, host=host, port=port, log_level="warning")
+                await uvicorn.Server(config).serve()
+            else:
+                async with mcp.server.stdio.stdio_server() as (
+                    read_stream,
+                    write_stream,
+                ):
+                    await self.server.run(
+                        read_stream, write_stream, self._initialization_options()
+                    )
+        finally:
+            await self.cleanup()
 
     async def cleanup(self):
         """Clean shutdown"""
         self.logger.info("Shutting down MCP server")
+        if self.prometheus:
+            await self.prometheus.stop()
+        await self.meili_client.close()
         self.logger.shutdown()
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Meilisearch MCP server")
+    parser.add_argument(
+        "--transport",
+        choices=["stdio", "http"],
+        default=os.getenv("MEILI_MCP_TRANSPORT", "stdio"),
+        help="stdio for a single client, http to serve many sessions from one process",
+    )
+    parser.add_argument("--host", default=os.getenv("MEILI_MCP_HOST", "127.0.0.1"))
+    parser.add_argument(
+        "--port", type=int, default=int(os.getenv("MEILI_MCP_PORT", "8000"))
+    )
+    args = parser.parse_args()
+    # Bearer token HTTP clients must send; required off loopback
+    http_token = os.getenv("MEILI_MCP_HTTP_TOKEN") or None
+    # Comma-separated extra Host header values, e.g. mcp.example.com:8000
+    allowed_hosts = [
+        allowed.strip()
+        for allowed in os.getenv("MEILI_MCP_ALLOWED_HOSTS", "").split(",")
+        if allowed.strip()
+    ]
+    http_unsafe_tools = os.getenv("MEILI_MCP_HTTP_UNSAFE_TOOLS", "").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+
     url = os.getenv("MEILI_HTTP_ADDR", "http://localhost:7700")
     api_key = os.getenv("MEILI_MASTER_KEY")
 
-    server = create_server(url, api_key)
-    asyncio.run(server.run())
+    task_notifications = os.getenv("MEILI_MCP_TASK_NOTIFICATIONS", "").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+
+    metrics_interval = float(os.getenv("MEILI_MCP_METRICS_INTERVAL", "0")) or None
+    prometheus_port = int(os.getenv("MEILI_MCP_PROMETHEUS_PORT", "0")) or None
+    log_overflow = os.getenv("MEILI_MCP_LOG_OVERFLOW", "drop-oldest")
+    pretty_json = os.getenv("MEILI_MCP_PRETTY_JSON", "").lower() in ("1", "true", "yes")
+    # JSON object mapping index uids to the attributes returned by default,
+    # e.g. {"movies": ["id", "title", "release_date"]}
+    default_fields = json.loads(os.getenv("MEILI_MCP_DEFAULT_FIELDS", "{}"))
+    pool = PoolConfig(
+        max_connections=int(os.getenv("MEILI_MCP_MAX_CONNECTIONS", "100")),
+        keepalive_expiry=float(os.getenv("MEILI_MCP_KEEPALIVE_EXPIRY", "30")),
+        http2=os.getenv("MEILI_MCP_HTTP2", "").lower() in ("1", "true", "yes"),
+        warm_up=int(os.getenv("MEILI_MCP_POOL_WARMUP", "1")),
+    )
+    # Comma-separated read replicas, e.g. http://replica-1:7700,http://replica-2:7700
+    replicas = [
+        replica.strip()
+        for replica in os.getenv("MEILI_MCP_REPLICAS", "").split(",")
+        if replica.strip()
+    ]
+    probe_interval = float(os.getenv("MEILI_MCP_PROBE_INTERVAL", "5"))
+    resilience = ResilienceConfig(
+        retries=int(os.getenv("MEILI_MCP_RETRIES", "2")),
+        failure_threshold=int(os.getenv("MEILI_MCP_BREAKER_THRESHOLD", "5")),
+        reset_timeout=float(os.getenv("MEILI_MCP_BREAKER_RESET", "30")),
+    )
+    # JSON object overriding tool class limits,
+    # e.g. {"bulk": {"concurrency": 2, "maxQueue": 16}}
+    class_limits = {
+        tool_class: ClassLimits(limits["concurrency"], limits["maxQueue"])
+        for tool_class, limits in json.loads(
+            os.getenv("MEILI_MCP_TOOL_LIMITS", "{}")
+        ).items()
+    }
+
+    server = create_server(
+        url,
+        api_key,
+        task_notifications,
+        metrics_interval,
+        prometheus_port,
+        log_overflow,
+        pretty_json,
+        default_fields,
+        pool,
+        replicas,
+        probe_interval,
+        resilience,
+        class_limits,
+    )
+    asyncio.run(
+        server.run(
+            args.transport,
+            args.host,
+            args.port,
+            http_token,
+            allowed_hosts,
+            http_unsafe_tools,
+        )
+    )
 
 if __name__ == "__main__":
     main()
@@ -1,7 +1,90 @@
-from typing import Dict, Any, List, Optional
-from meilisearch import Client
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 
+from .encoding import encode_response
+from .errors import MeilisearchNotFoundError, operation_failed
+from .transport import MeilisearchTransport
+from .cache import SearchCache
+from .logging import MCPLogger
+
+logger = MCPLogger()
+
+# Settings whose change makes Meilisearch reindex every document of the index
+REINDEX_SETTINGS = frozenset(
+    (
+        "searchableAttributes",
+        "filterableAttributes",
+        "sortableAttributes",
+        "distinctAttribute",
+        "stopWords",
+        "separatorTokens",
+        "nonSeparatorTokens",
+        "dictionary",
+        "proximityPrecision",
+        "localizedAttributes",
+        "embedders",
+    )
+)
+
+# Settings, at any depth, whose lists are sets: their order does not matter
+UNORDERED_SETTINGS = frozenset(
+    (
+        "filterableAttributes",
+        "sortableAttributes",
+        "stopWords",
+        "separatorTokens",
+        "nonSeparatorTokens",
+        "dictionary",
+        "synonyms",
+        "disableOnWords",
+        "disableOnAttributes",
+    )
+)
+
+# Object settings Meilisearch updates key by key rather than replacing
+MERGED_SETTINGS = frozenset(("typoTolerance", "faceting", "pagination", "embedders"))
+
+
+def _normalize(value: Any, unordered: bool = False) -> Any:
+    """Canonical form of a setting value, for comparison"""
+    if isinstance(value, dict):
+        return {
+            key: _normalize(item, unordered or key in UNORDERED_SETTINGS)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        items = [_normalize(item, unordered) for item in value]
+        return sorted(items, key=encode_response) if unordered else items
+    return value
+
+
+def _differs(current: Any, requested: Any, merged: bool) -> bool:
+    if merged and isinstance(current, dict) and isinstance(requested, dict):
+        # Keys left out of a merged object keep their current value
+        return any(
+            key not in current or _differs(current[key], value, True)
+            for key, value in requested.items()
+        )
+    return current != requested
+
+
+def diff_settings(current: Dict[str, Any], requested: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    The requested settings that would change the current ones. List order
+    is ignored where Meilisearch treats a list as a set, and merged objects
+    such as typoTolerance are compared only on the keys given.
+    """
+    changes = {}
+    for key, value in requested.items():
+        unordered = key in UNORDERED_SETTINGS
+        if key not in current or _differs(
+            _normalize(current[key], unordered),
+            _normalize(value, unordered),
+            key in MERGED_SETTINGS,
+        ):
+            changes[key] = value
+    return changes
+
 
 @dataclass
 class SearchSettings:
@@ -21,31 +104,82 @@ class SearchSettings:
 class SettingsManager:
     """Manage Meilisearch index settings"""
 
-    def __init__(self, client: Client):
-        self.client = client
+    def __init__(self, transport: MeilisearchTransport, search_cache: SearchCache):
+        self.transport = transport
+        self.search_cache = search_cache
 
     async def get_settings(self, index_uid: str) -> Dict[str, Any]:
         """Get all settings for an index"""
         try:
-            index = self.client.index(index_uid)
-            return index.get_settings()
+            return await self.transport.get(f"/indexes/{index_uid}/settings")
         except Exception as e:
-            raise Exception(f"Failed to get settings: {str(e)}")
+            raise operation_failed("Failed to get settings", e)
 
     async def update_settings(
         self, index_uid: str, settings: Dict[str, Any]
     ) -> Dict[str, Any]:
-        """Update settings for an index"""
+        """
+        Update settings for an index, sending only the settings that differ
+        from the current ones. The result lists the changed settings, whether
+        they were diffed, and whether Meilisearch is expected to reindex the
+        documents; taskUid is None when nothing changed and no task was
+        enqueued.
+        """
+        try:
+            changes, diffed = await self._changes(index_uid, settings)
+            summary = {
+                "changedSettings": sorted(changes),
+                "diffed": diffed,
+                "reindexExpected": not REINDEX_SETTINGS.isdisjoint(changes),
+            }
+            if not changes:
+                return {"indexUid": index_uid, "taskUid": None, **summary}
+            self.search_cache.invalidate(index_uid)
+            task = await self.transport.patch(
+                f"/indexes/{index_uid}/settings", changes
+            )
+            return {**task, **summary}
+        except Exception as e:
+            raise operation_failed("Failed to update settings", e)
+
+    async def _changes(
+        self, index_uid: str, settings: Dict[str, Any]
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        The settings to send, and whether they were diffed. Every requested
+        setting is sent while earlier settings updates of the index are
+        pending, since the current settings are not final, and when the key
+        cannot read tasks or settings.
+        """
         try:
-            index = self.client.index(index_uid)
-            return index.update_settings(settings)
+            pending = await self.transport.get(
+                "/tasks",
+                {
+                    "indexUids": [index_uid],
+                    "types": ["settingsUpdate"],
+                    "statuses": ["enqueued", "processing"],
+                    "limit": 1,
+                },
+            )
+            if pending["results"]:
+                return dict(settings), False
+            try:
+                # Compare against the primary: a replica may lag behind it
+                current = await self.transport.get(
+                    f"/indexes/{index_uid}/settings", primary=True
+                )
+            except MeilisearchNotFoundError:
+                # The update creates the index
+                current = {}
         except Exception as e:
-            raise Exception(f"Failed to update settings: {str(e)}")
+            logger.warning(f"Sending every setting of {index_uid} undiffed: {str(e)}")
+            return dict(settings), False
+        return diff_settings(current, settings), True
 
     async def reset_settings(self, index_uid: str) -> Dict[str, Any]:
         """Reset settings to default values"""
+        self.search_cache.invalidate(index_uid)
         try:
-            index = self.client.index(index_uid)
-            return index.reset_settings()
+            return await self.transport.delete(f"/indexes/{index_uid}/settings")
         except Exception as e:
-            raise Exception(f"Failed to reset settings: {str(e)}")
+            raise operation_failed("Failed to reset settings", e)
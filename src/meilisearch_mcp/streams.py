@@ -0,0 +1,222 @@
+import gzip
+import io
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+GZIP_MAGIC = b"\x1f\x8b"
+READ_BLOCK = 64 * 1024
+
+# Format inferred from the file extension (after any .gz suffix)
+FORMATS = {".ndjson": "ndjson", ".jsonl": "ndjson", ".csv": "csv", ".json": "json"}
+# JSON arrays are re-emitted as NDJSON so each chunk can be cut anywhere
+CONTENT_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "json": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+_SKIP_SEPARATORS = re.compile(r"[\s,]*")
+
+
+def detect_format(path: str) -> str:
+    """Infer the document format of a file from its extension"""
+    suffixes = [suffix.lower() for suffix in Path(path).suffixes]
+    if suffixes and suffixes[-1] == ".gz":
+        suffixes.pop()
+    if not suffixes or suffixes[-1] not in FORMATS:
+        raise ValueError(
+            f"Cannot infer document format of {path}; pass one of ndjson, csv or json"
+        )
+    return FORMATS[suffixes[-1]]
+
+
+class DocumentFileReader:
+    """
+    Read a local NDJSON, CSV or JSON array file, optionally gzip-compressed,
+    as a stream of payloads of at most max_chunk_bytes (a single oversized
+    record is sent alone). Memory use is bounded by one payload.
+    """
+
+    def __init__(
+        self, path: str, format: Optional[str] = None, max_chunk_bytes: int = 8 << 20
+    ):
+        self.path = Path(path).expanduser()
+        self.format = format or detect_format(str(self.path))
+        if self.format not in CONTENT_TYPES:
+            raise ValueError(f"Unsupported document format: {self.format}")
+        self.content_type = CONTENT_TYPES[self.format]
+        self.max_chunk_bytes = max_chunk_bytes
+        self.total_bytes = os.path.getsize(self.path)
+        self.bytes_read = 0
+        self.documents = 0
+
+        self._raw = open(self.path, "rb")
+        self.compressed = self._raw.read(2) == GZIP_MAGIC
+        self._raw.seek(0)
+        self._stream = gzip.GzipFile(fileobj=self._raw) if self.compressed else self._raw
+
+    def __enter__(self) -> "DocumentFileReader":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._stream.close()
+        self._raw.close()
+
+    def chunks(self) -> Iterator[bytes]:
+        """Yield request bodies in the reader's content type"""
+        if self.format == "csv":
+            chunks = self._csv_chunks()
+        elif self.format == "json":
+            chunks = self._json_array_chunks()
+        else:
+            chunks = self._ndjson_chunks()
+        for chunk in chunks:
+            self.bytes_read = self._raw.tell()
+            yield chunk
+        self.bytes_read = self.total_bytes
+
+    def _ndjson_chunks(self) -> Iterator[bytes]:
+        batch = bytearray()
+        for line in self._stream:
+            if not line.strip():
+                continue
+            if not line.endswith(b"\n"):
+                line += b"\n"
+            if batch and len(batch) + len(line) > self.max_chunk_bytes:
+                yield bytes(batch)
+                batch.clear()
+            batch += line
+            self.documents += 1
+        if batch:
+            yield bytes(batch)
+
+    def _csv_chunks(self) -> Iterator[bytes]:
+        """Split between records, never inside a quoted multi-line field"""
+        header = self._stream.readline()
+        if not header.strip():
+            return
+        if not header.endswith(b"\n"):
+            header += b"\n"
+
+        batch = bytearray(header)
+        in_quotes = False
+        for line in self._stream:
+            if not in_quotes:
+                if not line.strip():
+                    continue
+                if len(batch) > len(header) and (
+                    len(batch) + len(line) > self.max_chunk_bytes
+                ):
+                    yield bytes(batch)
+                    batch = bytearray(header)
+            if not line.endswith(b"\n"):
+                line += b"\n"
+            batch += line
+            # Escaped quotes are doubled, so an odd count toggles quoting
+            if line.count(b'"') % 2:
+                in_quotes = not in_quotes
+            if not in_quotes:
+                self.documents += 1
+        if len(batch) > len(header):
+            yield bytes(batch)
+
+    def _json_array_documents(self) -> Iterator[Dict[str, Any]]:
+        """Incrementally decode the objects of a top-level JSON array"""
+        decoder = json.JSONDecoder()
+        text = io.TextIOWrapper(self._stream, encoding="utf-8")
+        buffer = text.read(READ_BLOCK).lstrip()
+        if not buffer.startswith("["):
+            text.detach()
+            raise ValueError("JSON document file must contain an array of objects")
+
+        try:
+            yield from self._decode_array(decoder, text, buffer, 1)
+        finally:
+            # Keep the wrapper from closing the underlying file when collected
+            text.detach()
+
+    def _decode_array(
+        self,
+        decoder: json.JSONDecoder,
+        text: io.TextIOWrapper,
+        buffer: str,
+        position: int,
+    ) -> Iterator[Dict[str, Any]]:
+        eof = False
+        while True:
+            position = _SKIP_SEPARATORS.match(buffer, position).end()
+            if position < len(buffer) and buffer[position] == "]":
+                return
+            try:
+                if position == len(buffer):
+                    raise json.JSONDecodeError("Need more data", buffer, position)
+                document, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise ValueError("Truncated or invalid JSON document array")
+                # Grow the read size with the pending record so huge
+                # documents are not re-parsed once per block
+                block = text.read(max(READ_BLOCK, len(buffer) - position))
+                eof = not block
+                buffer = buffer[position:] + block
+                position = 0
+                continue
+            if not isinstance(document, dict):
+                raise ValueError("JSON document array must only contain objects")
+            yield document
+
+    def _json_array_chunks(self) -> Iterator[bytes]:
+        batch = bytearray()
+        for document in self._json_array_documents():
+            line = (
+                json.dumps(document, separators=(",", ":"), ensure_ascii=False) + "\n"
+            ).encode()
+            if batch and len(batch) + len(line) > self.max_chunk_bytes:
+                yield bytes(batch)
+                batch.clear()
+            batch += line
+            self.documents += 1
+        if batch:
+            yield bytes(batch)
+
+
+class DocumentFileWriter:
+    """Write documents to a local NDJSON file, gzip-compressed if requested"""
+
+    def __init__(self, path: str, compress: Optional[bool] = None):
+        self.path = Path(path).expanduser()
+        if compress is None:
+            compress = self.path.suffix.lower() == ".gz"
+        self.compressed = compress
+        self.documents = 0
+        self.bytes_written = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._raw = open(self.path, "wb")
+        self._stream = gzip.GzipFile(fileobj=self._raw, mode="wb") if compress else self._raw
+
+    def __enter__(self) -> "DocumentFileWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def write(self, documents: List[Dict[str, Any]]):
+        """Append documents as NDJSON lines"""
+        self._stream.write(
+            "".join(
+                json.dumps(document, separators=(",", ":"), ensure_ascii=False) + "\n"
+                for document in documents
+            ).encode()
+        )
+        self.documents += len(documents)
+
+    def close(self):
+        self._stream.close()
+        self.bytes_written = self._raw.tell()
+        self._raw.close()
@@ -1,54 +1,229 @@
-from typing import Dict, Any, List, Optional
-from meilisearch import Client
-from datetime import datetime
+import asyncio
+from typing import Dict, Any, Awaitable, Callable, List, Optional, Set
 
+from .errors import operation_failed
+from .transport import MeilisearchTransport
+from .cache import SearchCache
 
-def serialize_task_results(obj: Any) -> Any:
-    """Serialize task results into JSON-compatible format"""
-    if hasattr(obj, '__dict__'):
-        return {k: serialize_task_results(v) for k, v in obj.__dict__.items()}
-    elif isinstance(obj, (list, tuple)):
-        return [serialize_task_results(item) for item in obj]
-    elif isinstance(obj, datetime):
-        return obj.isoformat()
-    return obj
+from .logging import MCPLogger
+
+logger = MCPLogger()
+
+TERMINAL_STATUSES = {"succeeded", "failed", "canceled"}
 
 
 class TaskManager:
-    def __init__(self, client: Client):
-        """Initialize TaskManager with Meilisearch client"""
-        self.client = client
+    def __init__(
+        self,
+        transport: MeilisearchTransport,
+        search_cache: SearchCache,
+        min_poll_interval: float = 0.05,
+        max_poll_interval: float = 1.0,
+        max_poll_failures: int = 10,
+    ):
+        """Initialize TaskManager with the shared Meilisearch transport"""
+        self.transport = transport
+        self.search_cache = search_cache
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+        # Consecutive failed polls before pending waits and watches are dropped
+        self.max_poll_failures = max_poll_failures
+        # One future per awaited task uid, shared by every caller waiting on it
+        self._waiters: Dict[int, asyncio.Future] = {}
+        self._interest: Dict[int, int] = {}
+        # Uids followed for status listeners until they reach a terminal status
+        self._watched: Set[int] = set()
+        self._listeners: List[Callable[[Dict[str, Any]], Awaitable[None]]] = []
+        self._abandon_listeners: List[Callable[[List[int]], None]] = []
+        self._poller: Optional[asyncio.Task] = None
+        self._wake = asyncio.Event()
+
+    def add_status_listener(
+        self, listener: Callable[[Dict[str, Any]], Awaitable[None]]
+    ):
+        """Call listener with the task every time a polled task changes status"""
+        self._listeners.append(listener)
+
+    def add_abandon_listener(self, listener: Callable[[List[int]], None]):
+        """Call listener with the watched uids dropped after polling gave up"""
+        self._abandon_listeners.append(listener)
+
+    def watch_tasks(self, task_uids: List[int]):
+        """Poll tasks in the background and report their status changes to listeners"""
+        self._watched.update(task_uids)
+        self._ensure_poller()
+
+    def _ensure_poller(self):
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll())
+        else:
+            # Poll new uids promptly instead of after the current backoff
+            self._wake.set()
+
+    async def wait_for_tasks(
+        self, task_uids: List[int], timeout: Optional[float] = 30.0
+    ) -> Dict[str, Any]:
+        """
+        Wait until tasks reach a terminal status. All concurrent waits share a
+        single background poller that fetches every pending uid in one request.
+        """
+        if not task_uids:
+            return {"tasks": [], "pending": [], "timedOut": False}
+        loop = asyncio.get_running_loop()
+        futures = {}
+        for uid in dict.fromkeys(task_uids):
+            if uid not in self._waiters:
+                self._waiters[uid] = loop.create_future()
+            self._interest[uid] = self._interest.get(uid, 0) + 1
+            futures[uid] = self._waiters[uid]
+
+        self._ensure_poller()
+
+        try:
+            await asyncio.wait(futures.values(), timeout=timeout)
+        finally:
+            for uid in futures:
+                self._interest[uid] -= 1
+                if not self._interest[uid]:
+                    del self._interest[uid]
+                    future = self._waiters.get(uid)
+                    if future is futures[uid] and not future.done():
+                        del self._waiters[uid]
+
+        tasks = []
+        pending = []
+        for uid, future in futures.items():
+            if not future.done():
+                pending.append(uid)
+            elif future.exception() is not None:
+                raise operation_failed("Failed to wait for tasks", future.exception())
+            else:
+                tasks.append(future.result())
+        return {"tasks": tasks, "pending": pending, "timedOut": bool(pending)}
+
+    async def _poll(self):
+        """
+        Resolve waiters, backing off while no polled task changes status. A
+        failed poll is retried after the backoff; only after
+        max_poll_failures consecutive failures are pending waits failed and
+        watched tasks dropped.
+        """
+        interval = self.min_poll_interval
+        failures = 0
+        statuses: Dict[int, str] = {}
+        while self._waiters or self._watched:
+            uids = sorted(self._watched.union(self._waiters))
+            statuses = {uid: statuses[uid] for uid in uids if uid in statuses}
+            try:
+                response = await self.transport.get(
+                    "/tasks", {"uids": uids, "limit": len(uids)}
+                )
+            except Exception as e:
+                failures += 1
+                logger.warning(
+                    f"Task polling failed ({failures}/{self.max_poll_failures}): "
+                    f"{str(e)}"
+                )
+                if failures >= self.max_poll_failures:
+                    self._give_up(e)
+                    return
+                interval = min(interval * 2, self.max_poll_interval)
+                await self._sleep(interval)
+                continue
+
+            failures = 0
+            progressed = False
+            for task in response["results"]:
+                self.search_cache.observe_task(task)
+                uid = task["uid"]
+                if statuses.get(uid) != task["status"]:
+                    statuses[uid] = task["status"]
+                    progressed = True
+                    await self._notify_listeners(task)
+                if task["status"] in TERMINAL_STATUSES:
+                    statuses.pop(uid, None)
+                    self._watched.discard(uid)
+                    future = self._waiters.pop(uid, None)
+                    if future is not None and not future.done():
+                        future.set_result(task)
+
+            if progressed:
+                interval = self.min_poll_interval
+            else:
+                interval = min(interval * 2, self.max_poll_interval)
+            await self._sleep(interval)
+
+    async def _sleep(self, interval: float):
+        """Wait for the next poll, or until new uids are added"""
+        self._wake.clear()
+        try:
+            await asyncio.wait_for(self._wake.wait(), interval)
+        except asyncio.TimeoutError:
+            pass
+
+    def _give_up(self, error: Exception):
+        """Fail every pending wait and drop the watched tasks"""
+        for future in self._waiters.values():
+            if not future.done():
+                future.set_exception(error)
+        self._waiters.clear()
+        abandoned = sorted(self._watched)
+        self._watched.clear()
+        for listener in self._abandon_listeners:
+            listener(abandoned)
+
+    async def _notify_listeners(self, task: Dict[str, Any]):
+        for listener in self._listeners:
+            try:
+                await listener(task)
+            except Exception as e:
+                logger.warning(f"Task status listener failed: {str(e)}")
+
+    async def close(self):
+        """Stop the background poller"""
+        if self._poller is not None and not self._poller.done():
+            self._poller.cancel()
+
+    async def reset(self, reason: str):
+        """Stop polling and fail every pending wait, e.g. after switching servers"""
+        await self.close()
+        for future in self._waiters.values():
+            if not future.done():
+                future.set_exception(Exception(reason))
+        self._waiters.clear()
+        self._watched.clear()
 
     async def get_task(self, task_uid: int) -> Dict[str, Any]:
         """Get information about a specific task"""
         try:
-            task = self.client.get_task(task_uid)
-            return serialize_task_results(task)
+            task = await self.transport.get(f"/tasks/{task_uid}")
+            self.search_cache.observe_task(task)
+            return task
         except Exception as e:
-            raise Exception(f"Failed to get task: {str(e)}")
+            raise operation_failed("Failed to get task", e)
 
     async def get_tasks(
         self, parameters: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Get list of tasks with optional filters"""
         try:
-            tasks = self.client.get_tasks(parameters)
-            return serialize_task_results(tasks)
+            tasks = await self.transport.get("/tasks", parameters)
+            for task in tasks.get("results", []):
+                self.search_cache.observe_task(task)
+            return tasks
         except Exception as e:
-            raise Exception(f"Failed to get tasks: {str(e)}")
+            raise operation_failed("Failed to get tasks", e)
 
     async def cancel_tasks(self, query_parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Cancel tasks based on query parameters"""
         try:
-            result = self.client.cancel_tasks(query_parameters)
-            return serialize_task_results(result)
+            return await self.transport.post("/tasks/cancel", params=query_parameters)
         except Exception as e:
-            raise Exception(f"Failed to cancel tasks: {str(e)}")
+            raise operation_failed("Failed to cancel tasks", e)
 
     async def delete_tasks(self, query_parameters: Dict[str, Any]) -> Dict[str, Any]:
         """Delete tasks based on query parameters"""
         try:
-            result = self.client.delete_tasks(query_parameters)
-            return serialize_task_results(result)
+            return await self.transport.delete("/tasks", query_parameters)
         except Exception as e:
-            raise Exception(f"Failed to delete tasks: {str(e)}")
+            raise operation_failed("Failed to delete tasks", e)
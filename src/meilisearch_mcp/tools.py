@@ -0,0 +1,157 @@
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import mcp.types as types
+
+ToolHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+ToolFormatter = Callable[[Any, Dict[str, Any]], str]
+Validator = Callable[[Any, str], None]
+
+_TYPE_CHECKS: Dict[str, Callable[[Any], bool]] = {
+    "string": lambda value: isinstance(value, str),
+    "integer": lambda value: isinstance(value, int) and not isinstance(value, bool),
+    "number": lambda value: isinstance(value, (int, float))
+    and not isinstance(value, bool),
+    "boolean": lambda value: isinstance(value, bool),
+    "array": lambda value: isinstance(value, list),
+    "object": lambda value: isinstance(value, dict),
+}
+
+
+class ToolArgumentError(ValueError):
+    """Tool arguments that do not match the tool's input schema"""
+
+
+def compile_validator(schema: Dict[str, Any]) -> Validator:
+    """
+    Compile the subset of JSON Schema used by the tool definitions (type,
+    properties, required, items, enum) into a validating closure. Optional
+    properties may be null, as some clients send unset arguments that way.
+    """
+    checks: List[Validator] = []
+
+    expected = schema.get("type")
+    if expected is not None:
+        type_check = _TYPE_CHECKS[expected]
+
+        def check_type(value: Any, path: str):
+            if not type_check(value):
+                raise ToolArgumentError(f"{path} must be of type {expected}")
+
+        checks.append(check_type)
+
+    if "enum" in schema:
+        allowed = schema["enum"]
+
+        def check_enum(value: Any, path: str):
+            if value not in allowed:
+                raise ToolArgumentError(f"{path} must be one of {allowed}")
+
+        checks.append(check_enum)
+
+    if "items" in schema:
+        item_validator = compile_validator(schema["items"])
+
+        def check_items(value: Any, path: str):
+            for i, item in enumerate(value):
+                item_validator(item, f"{path}[{i}]")
+
+        checks.append(check_items)
+
+    if "properties" in schema or "required" in schema:
+        required = tuple(schema.get("required", ()))
+        properties = {
+            name: compile_validator(subschema)
+            for name, subschema in schema.get("properties", {}).items()
+        }
+
+        def check_properties(value: Dict[str, Any], path: str):
+            for name in required:
+                if value.get(name) is None:
+                    raise ToolArgumentError(f"{path}.{name} is required")
+            for name, validate in properties.items():
+                if value.get(name) is not None:
+                    validate(value[name], f"{path}.{name}")
+
+        checks.append(check_properties)
+
+    def validate(value: Any, path: str = "arguments"):
+        for check in checks:
+            check(value, path)
+
+    return validate
+
+
+@dataclass
+class ToolSpec:
+    """A tool definition: schema, handler and response formatter"""
+
+    name: str
+    description: str
+    input_schema: Dict[str, Any]
+    handler: ToolHandler
+    # Turns the handler result into the response text; None when the
+    # handler already returns text
+    formatter: Optional[ToolFormatter] = None
+    # Admission class and priority within it (lower runs first)
+    tool_class: str = "interactive"
+    priority: int = 0
+    validate: Validator = field(init=False, repr=False)
+
+    def __post_init__(self):
+        self.validate = compile_validator(self.input_schema)
+
+
+class ToolRegistry:
+    """Tools by name, with the MCP tool list built once"""
+
+    def __init__(self, specs: Optional[List[ToolSpec]] = None):
+        self._specs: Dict[str, ToolSpec] = {}
+        self._tool_list: Optional[List[types.Tool]] = None
+        for spec in specs or ():
+            self.register(spec)
+
+    def register(self, spec: ToolSpec):
+        self._specs[spec.name] = spec
+        self._tool_list = None
+
+    def unregister(self, name: str):
+        if self._specs.pop(name, None) is not None:
+            self._tool_list = None
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def get(self, name: str) -> ToolSpec:
+        spec = self._specs.get(name)
+        if spec is None:
+            raise ValueError(f"Unknown tool: {name}")
+        return spec
+
+    def list_tools(self) -> List[types.Tool]:
+        """Return the MCP tool definitions, cached until a tool is registered"""
+        if self._tool_list is None:
+            self._tool_list = [
+                types.Tool(
+                    name=spec.name,
+                    description=spec.description,
+                    inputSchema=spec.input_schema,
+                )
+                for spec in self._specs.values()
+            ]
+        return self._tool_list
+
+    async def call(self, name: str, arguments: Optional[Dict[str, Any]]) -> str:
+        """
+        Validate the arguments, run the tool and format its result. Null
+        arguments are dropped, so handlers see them as unset.
+        """
+        spec = self.get(name)
+        arguments = {
+            key: value for key, value in (arguments or {}).items() if value is not None
+        }
+        spec.validate(arguments)
+        result = await spec.handler(arguments)
+        if spec.formatter is None:
+            return result
+        return spec.formatter(result, arguments)
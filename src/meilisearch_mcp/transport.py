@@ -0,0 +1,298 @@
+import asyncio
+import importlib.util
+import time
+from dataclasses import dataclass
+
+import httpx
+from typing import Optional, Dict, Any, List
+
+from .coalescing import SingleFlight
+from .encoding import encode_response
+from .errors import MeilisearchApiError, MeilisearchConnectionError, error_from_response
+from .instrumentation import record_upstream_time
+from .logging import MCPLogger
+from .resilience import ResilienceConfig
+from .routing import Endpoint, EndpointPool, is_read_request
+
+logger = MCPLogger()
+
+
+def encode_params(params: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Encode query parameters the way Meilisearch expects them"""
+    if not params:
+        return None
+
+    encoded = {}
+    for key, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            encoded[key] = "true" if value else "false"
+        elif isinstance(value, (list, tuple)):
+            encoded[key] = ",".join(str(item) for item in value)
+        else:
+            encoded[key] = value
+    return encoded
+
+
+@dataclass
+class PoolConfig:
+    """Connection pool settings of the transport"""
+
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    # Seconds an idle connection is kept open
+    keepalive_expiry: float = 30.0
+    # Requires the h2 package (pip install "httpx[http2]")
+    http2: bool = False
+    # Connections opened at startup, before the first tool call
+    warm_up: int = 1
+
+
+class MeilisearchTransport:
+    """Async HTTP transport for the Meilisearch REST API, shared by all managers"""
+
+    def __init__(
+        self,
+        url: str = "http://localhost:7700",
+        api_key: Optional[str] = None,
+        timeout: float = 30.0,
+        http_transport: Optional[httpx.AsyncBaseTransport] = None,
+        pool: Optional[PoolConfig] = None,
+        replicas: Optional[List[str]] = None,
+        resilience: Optional[ResilienceConfig] = None,
+    ):
+        self.url = url.rstrip("/")
+        self.api_key = api_key
+        self.pool = pool or PoolConfig()
+        self.resilience = resilience or ResilienceConfig()
+        # Reads are spread over the replicas; everything else goes to url
+        self.endpoints = EndpointPool(self.url, replicas, self.resilience)
+        # Identical reads in flight at the same time share one request
+        self.flights = SingleFlight()
+        http2 = self.pool.http2
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning(
+                "HTTP/2 requested but the h2 package is missing; using HTTP/1.1"
+            )
+            http2 = False
+        self.http = httpx.AsyncClient(
+            base_url=self.url,
+            headers=self._headers(),
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=self.pool.max_connections,
+                max_keepalive_connections=self.pool.max_keepalive_connections,
+                keepalive_expiry=self.pool.keepalive_expiry,
+            ),
+            http2=http2,
+            transport=http_transport,
+        )
+
+    def reconfigure(self, url: Optional[str] = None, api_key: Optional[str] = None):
+        """
+        Switch the URL or API key in place, keeping the connection pool.
+        Requests already in flight finish on their connections; idle
+        connections to a previous host close once their keep-alive expires.
+        A new URL drops the replicas, which belong to the previous primary.
+        """
+        if url and url.rstrip("/") != self.url:
+            self.url = url.rstrip("/")
+            self.http.base_url = self.url
+            self.endpoints.set_primary(self.url)
+        if api_key:
+            self.api_key = api_key
+        self.http.headers = self._headers()
+        self.flights.forget()
+
+    async def warm_up(self, connections: Optional[int] = None) -> int:
+        """Open pooled connections to every node ahead of the first tool call"""
+        connections = self.pool.warm_up if connections is None else connections
+        urls = [endpoint.url for endpoint in self.endpoints.endpoints]
+        responses = await asyncio.gather(
+            *(
+                self.http.get(f"{url}/health")
+                for url in urls
+                for _ in range(connections)
+            ),
+            return_exceptions=True,
+        )
+        opened = sum(isinstance(response, httpx.Response) for response in responses)
+        if opened < len(responses):
+            logger.warning(f"Opened {opened} of {len(responses)} warm-up connections")
+        return opened
+
+    async def check_health(self, url: Optional[str] = None) -> bool:
+        """Whether the node at url, by default the primary, is available"""
+        try:
+            response = await self.http.get(f"{url or self.url}/health")
+            return response.json().get("status") == "available"
+        except Exception:
+            return False
+
+    def start_health_probe(self, interval: float):
+        """Eject and re-admit replicas from health checks every interval seconds"""
+        self.endpoints.start_probing(self.check_health, interval)
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {"User-Agent": "meilisearch-mcp"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        content: Any = None,
+        headers: Optional[Dict[str, str]] = None,
+        primary: bool = False,
+    ) -> Any:
+        """
+        Send a request and return the decoded JSON body. Concurrent identical
+        reads share one request; callers must not modify the returned body.
+        With primary, a read skips the replicas, e.g. to see the latest writes.
+        """
+        params = encode_params(params)
+        if not (method == "GET" or is_read_request(method, path)):
+            # Reads issued after a write must not join a read sent before it
+            self.flights.forget()
+            return await self._route(
+                method, path, params=params, json=json, content=content, headers=headers
+            )
+        if content is not None or headers is not None:
+            return await self._read(
+                method,
+                path,
+                primary=primary,
+                params=params,
+                content=content,
+                headers=headers,
+            )
+        key = (
+            method,
+            path,
+            primary,
+            tuple(sorted((params or {}).items())),
+            encode_response(json),
+        )
+        return await self.flights.do(
+            key,
+            lambda: self._read(
+                method, path, primary=primary, params=params, json=json
+            ),
+        )
+
+    async def _read(self, method: str, path: str, **kwargs) -> Any:
+        """
+        Send an idempotent read. Reads failing with a connection error, 429
+        or 502-504 are retried with jittered exponential backoff, waiting at
+        least the Retry-After delay.
+        """
+        attempt = 0
+        while True:
+            try:
+                return await self._route(method, path, **kwargs)
+            except MeilisearchApiError as e:
+                if not e.retryable or attempt >= self.resilience.retries:
+                    raise
+                if (e.retry_after or 0) > self.resilience.max_retry_after:
+                    raise
+                delay = self.resilience.retry_delay(attempt, e.retry_after)
+                attempt += 1
+                logger.warning(
+                    f"Retrying {method} {path} in {delay:.2f}s "
+                    f"(attempt {attempt}): {str(e)}"
+                )
+                await asyncio.sleep(delay)
+
+    async def _route(
+        self, method: str, path: str, primary: bool = False, **kwargs
+    ) -> Any:
+        """
+        Send a request to the node the endpoint pool picks. Reads that cannot
+        reach a replica eject it and fail over to the next healthy node.
+        """
+        if primary:
+            endpoint = self.endpoints.primary
+        else:
+            endpoint = self.endpoints.pick(method, path)
+        tried: List[Endpoint] = []
+        while True:
+            try:
+                response = await self._send(endpoint, method, path, **kwargs)
+                break
+            except httpx.TransportError as e:
+                reason = str(e) or type(e).__name__
+                self.endpoints.eject(endpoint, reason)
+                tried.append(endpoint)
+                endpoint = (
+                    None
+                    if primary
+                    else self.endpoints.pick(method, path, exclude=tried)
+                )
+                if endpoint is None:
+                    raise MeilisearchConnectionError(tried[-1].url, reason) from e
+        if response.is_error:
+            raise error_from_response(response)
+        if not response.content:
+            return None
+        return response.json()
+
+    async def _send(
+        self, endpoint: Endpoint, method: str, path: str, **kwargs
+    ) -> httpx.Response:
+        """Send one request to a node, feeding its circuit breaker"""
+        endpoint.breaker.acquire()
+        endpoint.outstanding += 1
+        endpoint.requests += 1
+        start = time.perf_counter()
+        try:
+            response = await self.http.request(
+                method, f"{endpoint.url}{path}", **kwargs
+            )
+        except httpx.TransportError:
+            endpoint.breaker.record_failure()
+            raise
+        except BaseException:
+            endpoint.breaker.release()
+            raise
+        finally:
+            endpoint.outstanding -= 1
+            record_upstream_time(time.perf_counter() - start)
+        if response.status_code >= 500:
+            endpoint.breaker.record_failure()
+        else:
+            endpoint.breaker.record_success()
+        return response
+
+    async def get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        primary: bool = False,
+    ) -> Any:
+        return await self.request("GET", path, params=params, primary=primary)
+
+    async def post(
+        self, path: str, json: Any = None, params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        return await self.request("POST", path, params=params, json=json)
+
+    async def put(
+        self, path: str, json: Any = None, params: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        return await self.request("PUT", path, params=params, json=json)
+
+    async def patch(self, path: str, json: Any = None) -> Any:
+        return await self.request("PATCH", path, json=json)
+
+    async def delete(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        return await self.request("DELETE", path, params=params)
+
+    async def aclose(self):
+        """Stop the health probe and close the underlying connection pool"""
+        await self.endpoints.stop_probing()
+        await self.http.aclose()
@@ -0,0 +1,67 @@
+import asyncio
+
+import httpx
+
+from src.meilisearch_mcp.cache import SearchCache
+from src.meilisearch_mcp.client import MeilisearchClient
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    """Test that the cache stays within its entry and byte bounds"""
+    cache = SearchCache(max_entries=2, max_bytes=10_000)
+    for i in range(3):
+        cache.put(f"k{i}", "movies", {"hits": [i]})
+    assert cache.get("k0") is None
+    assert cache.get("k2") == {"hits": [2]}
+    assert cache.evictions == 1
+
+    small = SearchCache(max_bytes=40)
+    small.put("a", "movies", {"hits": ["x" * 10]})
+    small.put("b", "movies", {"hits": ["y" * 10]})
+    assert small.get_stats()["entries"] == 1
+    assert small.size <= 40
+
+
+def test_invalidation_by_index_and_task():
+    """Test that writes and succeeded tasks drop the affected entries"""
+    cache = SearchCache()
+    cache.put("movies", "movies", {"hits": []})
+    cache.put("books", "books", {"hits": []})
+    cache.put("all", None, {"hits": []})
+
+    cache.invalidate("movies")
+    assert cache.get("movies") is None
+    assert cache.get("all") is None
+    assert cache.get("books") == {"hits": []}
+
+    cache.observe_task({"uid": 3, "status": "processing", "indexUid": "books"})
+    assert cache.get("books") is not None
+    cache.observe_task({"uid": 3, "status": "succeeded", "indexUid": "books"})
+    assert cache.get("books") is None
+
+
+def test_search_is_served_from_cache_until_write():
+    """Test that repeated searches hit Meilisearch once per write"""
+    searches = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/search"):
+            searches.append(request)
+            return httpx.Response(200, json={"hits": [{"id": len(searches)}]})
+        return httpx.Response(202, json={"taskUid": 1})
+
+    async def run():
+        client = MeilisearchClient(
+            "http://meili.test", http_transport=httpx.MockTransport(handler)
+        )
+        first = await client.search("dune", index_uid="movies")
+        second = await client.search("dune", index_uid="movies")
+        await client.documents.add_documents("movies", [{"id": 2}])
+        third = await client.search("dune", index_uid="movies")
+        await client.close()
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert first == second == {"hits": [{"id": 1}]}
+    assert third == {"hits": [{"id": 2}]}
+    assert len(searches) == 2
@@ -0,0 +1,580 @@
+import asyncio
+import gzip
+import json
+import time
+
+import httpx
+import pytest
+
+from src.meilisearch_mcp.client import MeilisearchClient, merge_ranked_hits
+from src.meilisearch_mcp.documents import chunk_documents
+from src.meilisearch_mcp.errors import MeilisearchAuthError
+
+
+def make_client(handler):
+    return MeilisearchClient(
+        "http://meili.test", "secret", http_transport=httpx.MockTransport(handler)
+    )
+
+
+def test_search_single_index_posts_query():
+    """Test that searching one index sends a single search request"""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"hits": [{"id": 1}], "query": "dune"})
+
+    async def run():
+        client = make_client(handler)
+        result = await client.search("dune", index_uid="movies", filter="year > 2000")
+        await client.close()
+        return result
+
+    result = asyncio.run(run())
+    assert result["hits"] == [{"id": 1}]
+    assert len(seen) == 1
+    assert seen[0].url.path == "/indexes/movies/search"
+    assert seen[0].headers["Authorization"] == "Bearer secret"
+    assert json.loads(seen[0].content) == {
+        "q": "dune",
+        "limit": 20,
+        "offset": 0,
+        "filter": "year > 2000",
+    }
+
+
+def test_api_errors_are_reported():
+    """Test that Meilisearch error bodies surface in the raised exception"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            404,
+            json={"message": "Index `missing` not found.", "code": "index_not_found"},
+        )
+
+    async def run():
+        client = make_client(handler)
+        try:
+            await client.settings.get_settings("missing")
+        finally:
+            await client.close()
+
+    with pytest.raises(Exception, match="index_not_found"):
+        asyncio.run(run())
+
+
+def test_calls_run_concurrently():
+    """Test that a slow write does not block a concurrent search"""
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/documents"):
+            await asyncio.sleep(0.3)
+            return httpx.Response(202, json={"taskUid": 1})
+        return httpx.Response(200, json={"hits": []})
+
+    async def run():
+        client = make_client(handler)
+        ingest = asyncio.create_task(
+            client.documents.add_documents("movies", [{"id": 1}])
+        )
+        await asyncio.sleep(0.01)
+        start = time.perf_counter()
+        await client.search("dune", index_uid="movies")
+        search_time = time.perf_counter() - start
+        await ingest
+        await client.close()
+        return search_time
+
+    assert asyncio.run(run()) < 0.1
+
+
+def test_search_all_indexes_uses_multi_search():
+    """Test that a cross-index search is a single /multi-search request"""
+    paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        if request.url.path == "/indexes":
+            return httpx.Response(
+                200,
+                json={
+                    "results": [{"uid": "movies"}, {"uid": "books"}],
+                    "offset": 0,
+                    "limit": 1000,
+                    "total": 2,
+                },
+            )
+        queries = json.loads(request.content)["queries"]
+        return httpx.Response(
+            200,
+            json={
+                "results": [
+                    {"indexUid": q["indexUid"], "hits": [{"id": 1}] if i == 0 else []}
+                    for i, q in enumerate(queries)
+                ]
+            },
+        )
+
+    async def run():
+        client = make_client(handler)
+        result = await client.search("dune")
+        await client.close()
+        return result
+
+    result = asyncio.run(run())
+    assert paths == ["/indexes", "/multi-search"]
+    assert result["multi_index"] is True
+    assert list(result["results"]) == ["movies"]
+    assert result["results"]["movies"]["hits"] == [{"id": 1}]
+
+
+def test_search_all_indexes_falls_back_without_multi_search():
+    """Test the per-index fan-out when /multi-search is not available"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/indexes":
+            return httpx.Response(
+                200,
+                json={
+                    "results": [{"uid": "movies"}, {"uid": "books"}],
+                    "offset": 0,
+                    "limit": 1000,
+                    "total": 2,
+                },
+            )
+        if request.url.path == "/multi-search":
+            return httpx.Response(404)
+        if request.url.path == "/indexes/books/search":
+            return httpx.Response(400, json={"message": "bad filter"})
+        return httpx.Response(200, json={"hits": [{"id": 7}]})
+
+    async def run():
+        client = make_client(handler)
+        result = await client.search("dune")
+        await client.close()
+        return result
+
+    assert asyncio.run(run())["results"] == {"movies": {"hits": [{"id": 7}]}}
+
+
+def test_merge_ranked_hits_keeps_global_top_k():
+    """Test that merged search keeps only the best-scored hits across indexes"""
+    results = {
+        "movies": {
+            "hits": [{"id": 1, "_rankingScore": 0.9}, {"id": 2, "_rankingScore": 0.4}]
+        },
+        "books": {
+            "hits": [{"id": 3, "_rankingScore": 0.95}, {"id": 4, "_rankingScore": 0.5}]
+        },
+    }
+
+    merged = merge_ranked_hits(results, limit=2)
+    assert [(hit["_indexUid"], hit["id"]) for hit in merged] == [
+        ("books", 3),
+        ("movies", 1),
+    ]
+    paged = merge_ranked_hits(results, limit=2, offset=1)
+    assert [hit["id"] for hit in paged] == [1, 4]
+
+
+def test_add_documents_uploads_in_chunks():
+    """Test that large document lists are split by count and byte size"""
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(json.loads(request.content))
+        return httpx.Response(202, json={"taskUid": len(bodies)})
+
+    async def run():
+        client = make_client(handler)
+        result = await client.documents.add_documents(
+            "movies",
+            [{"id": i, "title": "x" * 20} for i in range(25)],
+            max_chunk_documents=10,
+            prefetch=2,
+        )
+        await client.close()
+        return result
+
+    result = asyncio.run(run())
+    assert result["taskUids"] == [1, 2, 3]
+    assert result["chunks"] == 3
+    assert result["totalDocuments"] == 25
+    # Chunks are enqueued in document order
+    assert [body[0]["id"] for body in bodies] == [0, 10, 20]
+    assert [len(body) for body in bodies] == [10, 10, 5]
+
+    sized = list(chunk_documents([{"id": i} for i in range(10)], max_bytes=30))
+    assert all(len(payload) <= 30 for payload in sized)
+    assert sum(len(json.loads(payload)) for payload in sized) == 10
+
+
+def test_add_documents_stops_after_a_failed_chunk():
+    """Test that no further chunks are produced or sent after a failed upload"""
+    bodies = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.content)
+        return httpx.Response(
+            401, json={"message": "Invalid key", "code": "invalid_api_key"}
+        )
+
+    async def run():
+        client = make_client(handler)
+        try:
+            await client.documents.add_documents(
+                "movies", [{"id": i} for i in range(2000)], max_chunk_documents=10
+            )
+        finally:
+            await client.close()
+
+    # The typed error is kept and names the tasks enqueued before it
+    with pytest.raises(MeilisearchAuthError, match=r"enqueuing task uids \[\]"):
+        asyncio.run(run())
+    assert len(bodies) == 1
+
+
+def test_cancelled_upload_stops_the_producer():
+    """Test that cancelling an upload leaves no chunk producer behind"""
+    posted = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        posted.set()
+        await asyncio.sleep(10)
+        return httpx.Response(202, json={"taskUid": 1})
+
+    async def run():
+        client = make_client(handler)
+        upload = asyncio.create_task(
+            client.documents.add_documents(
+                "movies", [{"id": i} for i in range(2000)], max_chunk_documents=10
+            )
+        )
+        await posted.wait()
+        upload.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await upload
+        leftover = [
+            task
+            for task in asyncio.all_tasks()
+            if task is not asyncio.current_task()
+        ]
+        await client.close()
+        return leftover
+
+    assert asyncio.run(run()) == []
+
+
+def test_import_documents_streams_file(tmp_path):
+    """Test that importing a file sends NDJSON chunks and reports progress"""
+    path = tmp_path / "movies.ndjson"
+    path.write_text("".join(json.dumps({"id": i}) + "\n" for i in range(50)))
+    content_types = []
+    progress = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        content_types.append(request.headers["Content-Type"])
+        return httpx.Response(202, json={"taskUid": len(content_types)})
+
+    async def on_progress(done, total):
+        progress.append((done, total))
+
+    async def run():
+        client = make_client(handler)
+        result = await client.documents.import_documents(
+            "movies", str(path), max_chunk_bytes=100, on_progress=on_progress
+        )
+        await client.close()
+        return result
+
+    result = asyncio.run(run())
+    assert result["totalDocuments"] == 50
+    assert len(result["taskUids"]) == result["chunks"] > 1
+    assert set(content_types) == {"application/x-ndjson"}
+    assert len(progress) == result["chunks"]
+
+
+def test_export_documents_writes_ndjson(tmp_path):
+    """Test that exporting walks every page and writes gzip NDJSON"""
+    documents = [{"id": i} for i in range(25)]
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append((request.url.path, body))
+        offset, limit = body["offset"], body["limit"]
+        return httpx.Response(
+            200,
+            json={
+                "results": documents[offset : offset + limit],
+                "offset": offset,
+                "limit": limit,
+                "total": len(documents),
+            },
+        )
+
+    async def run():
+        client = make_client(handler)
+        result = await client.documents.export_documents(
+            "movies", str(tmp_path / "movies.ndjson.gz"), filter="id >= 0", page_size=10
+        )
+        await client.close()
+        return result
+
+    result = asyncio.run(run())
+    assert result["totalDocuments"] == 25
+    assert result["compressed"] is True
+    assert {path for path, _ in requests} == {"/indexes/movies/documents/fetch"}
+    assert sorted(body["offset"] for _, body in requests) == [0, 10, 20]
+    with gzip.open(tmp_path / "movies.ndjson.gz", "rt") as f:
+        assert [json.loads(line) for line in f] == documents
+
+
+def test_default_fields_project_search_and_documents():
+    """Test that per-index default fields apply unless the call picks its own"""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/indexes/movies/documents":
+            return httpx.Response(200, json={"results": []})
+        return httpx.Response(200, json={"hits": []})
+
+    async def run():
+        client = MeilisearchClient(
+            "http://meili.test",
+            http_transport=httpx.MockTransport(handler),
+            default_fields={"movies": ["id", "title"]},
+        )
+        await client.search("dune", index_uid="movies")
+        await client.search(
+            "dune",
+            index_uid="movies",
+            attributesToRetrieve=["overview"],
+            attributesToCrop=["overview"],
+            cropLength=10,
+        )
+        await client.search("dune", index_uid="books")
+        await client.documents.get_documents("movies")
+        await client.documents.get_documents("movies", fields=["id"])
+        await client.close()
+
+    asyncio.run(run())
+    bodies = [json.loads(request.content) for request in requests[:3]]
+    assert bodies[0]["attributesToRetrieve"] == ["id", "title"]
+    assert bodies[1]["attributesToRetrieve"] == ["overview"]
+    assert bodies[1]["cropLength"] == 10
+    assert "attributesToRetrieve" not in bodies[2]
+    assert requests[3].url.params["fields"] == "id,title"
+    assert requests[4].url.params["fields"] == "id"
+
+
+def test_update_connection_keeps_the_pool():
+    """Test that new credentials reuse the pool and a new URL drops old state"""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((str(request.url), request.headers.get("Authorization")))
+        if request.url.path == "/tasks":
+            return httpx.Response(
+                200, json={"results": [{"uid": 1, "status": "processing"}]}
+            )
+        return httpx.Response(200, json={"status": "available", "hits": []})
+
+    async def run():
+        client = make_client(handler)
+        http = client.transport.http
+        assert await client.transport.warm_up(3) == 3
+        await client.search("dune", index_uid="movies")
+
+        waiting = asyncio.create_task(client.tasks.wait_for_tasks([1]))
+        await asyncio.sleep(0.01)
+        assert await client.update_connection(api_key="rotated") is False
+        await client.search("dune", index_uid="movies")
+        assert not waiting.done()
+
+        assert await client.update_connection(url="http://replica.test/") is True
+        await client.search("dune", index_uid="movies")
+        assert client.transport.http is http
+        with pytest.raises(Exception, match="replica.test"):
+            await waiting
+        await client.close()
+
+    asyncio.run(run())
+    searches = [entry for entry in seen if entry[0].endswith("/search")]
+    assert searches == [
+        ("http://meili.test/indexes/movies/search", "Bearer secret"),
+        ("http://meili.test/indexes/movies/search", "Bearer rotated"),
+        ("http://replica.test/indexes/movies/search", "Bearer rotated"),
+    ]
+
+
+def test_identical_concurrent_reads_share_one_request():
+    """Test single-flight coalescing of identical reads, and no reuse afterwards"""
+    seen = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.method, request.url.path))
+        await asyncio.sleep(0.02)
+        if request.method == "PATCH":
+            return httpx.Response(202, json={"taskUid": 1})
+        if request.url.path == "/tasks":
+            return httpx.Response(200, json={"results": []})
+        return httpx.Response(200, json={"rankingRules": ["words"]})
+
+    async def run():
+        client = make_client(handler)
+        results = await asyncio.gather(
+            *(client.settings.get_settings("movies") for _ in range(5)),
+            client.settings.get_settings("books"),
+        )
+        # Finished reads are not reused
+        await client.settings.get_settings("movies")
+        # A read issued after a write does not join a read sent before it
+        before = asyncio.create_task(client.settings.get_settings("movies"))
+        await asyncio.sleep(0)
+        await client.settings.update_settings("movies", {"stopWords": ["the"]})
+        after = await client.settings.get_settings("movies")
+        await before
+        stats = client.transport.flights.get_stats()
+        await client.close()
+        return results, after, stats
+
+    results, after, stats = asyncio.run(run())
+    assert all(result == {"rankingRules": ["words"]} for result in results)
+    assert after == {"rankingRules": ["words"]}
+    # update-settings reads the current settings from the primary first
+    assert seen.count(("GET", "/indexes/movies/settings")) == 5
+    assert seen.count(("GET", "/indexes/books/settings")) == 1
+    assert stats == {"calls": 7, "coalesced": 4, "inFlight": 0}
+
+
+def test_update_settings_sends_only_changed_settings():
+    """Test that update-settings diffs against the current settings"""
+    current = {
+        "rankingRules": ["words", "typo", "proximity"],
+        "filterableAttributes": ["genre", "year"],
+        "stopWords": [],
+        "typoTolerance": {
+            "enabled": True,
+            "minWordSizeForTypos": {"oneTypo": 5, "twoTypos": 9},
+            "disableOnWords": [],
+        },
+    }
+    patches = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/tasks":
+            return httpx.Response(200, json={"results": []})
+        if request.method == "GET":
+            return httpx.Response(200, json=current)
+        patches.append(json.loads(request.content))
+        current.update(patches[-1])
+        return httpx.Response(202, json={"taskUid": len(patches)})
+
+    async def run():
+        client = make_client(handler)
+        requested = {
+            "rankingRules": ["typo", "words", "proximity"],
+            "filterableAttributes": ["year", "genre"],
+            "stopWords": ["the", "a"],
+            "typoTolerance": {"minWordSizeForTypos": {"oneTypo": 5}},
+        }
+        first = await client.settings.update_settings("movies", requested)
+        second = await client.settings.update_settings(
+            "movies", {**requested, "stopWords": ["a", "the"]}
+        )
+        third = await client.settings.update_settings(
+            "movies", {"rankingRules": ["words", "typo", "proximity"]}
+        )
+        await client.close()
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+    assert patches[0] == {
+        "rankingRules": ["typo", "words", "proximity"],
+        "stopWords": ["the", "a"],
+    }
+    assert first == {
+        "taskUid": 1,
+        "changedSettings": ["rankingRules", "stopWords"],
+        "diffed": True,
+        "reindexExpected": True,
+    }
+    # Resubmitting the same settings enqueues nothing
+    assert second == {
+        "indexUid": "movies",
+        "taskUid": None,
+        "changedSettings": [],
+        "diffed": True,
+        "reindexExpected": False,
+    }
+    assert patches[1] == {"rankingRules": ["words", "typo", "proximity"]}
+    assert third["reindexExpected"] is False
+    assert len(patches) == 2
+
+
+def test_update_settings_sends_everything_while_updates_are_pending():
+    """Test that a pending settings task disables the diff"""
+    current = {"filterableAttributes": []}
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        if request.url.path == "/tasks":
+            # An earlier update setting filterableAttributes to ["a"] is queued
+            return httpx.Response(
+                200, json={"results": [{"uid": 1, "status": "enqueued"}]}
+            )
+        if request.method == "GET":
+            return httpx.Response(200, json=current)
+        return httpx.Response(202, json={"taskUid": 2})
+
+    async def run():
+        client = make_client(handler)
+        result = await client.settings.update_settings(
+            "movies", {"filterableAttributes": []}
+        )
+        await client.close()
+        return result
+
+    result = asyncio.run(run())
+    assert seen[0].url.params["indexUids"] == "movies"
+    assert seen[0].url.params["types"] == "settingsUpdate"
+    assert seen[0].url.params["statuses"] == "enqueued,processing"
+    assert json.loads(seen[-1].content) == {"filterableAttributes": []}
+    assert result["taskUid"] == 2
+    assert result["changedSettings"] == ["filterableAttributes"]
+    assert result["diffed"] is False
+    assert result["reindexExpected"] is True
+
+
+def test_update_settings_with_a_settings_only_key():
+    """Test that a key unable to read tasks or settings still updates them"""
+    patches = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            return httpx.Response(
+                403, json={"message": "Forbidden", "code": "invalid_api_key"}
+            )
+        patches.append(json.loads(request.content))
+        return httpx.Response(202, json={"taskUid": 3})
+
+    async def run():
+        client = make_client(handler)
+        result = await client.settings.update_settings(
+            "movies", {"stopWords": ["the"]}
+        )
+        await client.close()
+        return result
+
+    result = asyncio.run(run())
+    assert patches == [{"stopWords": ["the"]}]
+    assert result == {
+        "taskUid": 3,
+        "changedSettings": ["stopWords"],
+        "diffed": False,
+        "reindexExpected": True,
+    }
@@ -0,0 +1,35 @@
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from src.meilisearch_mcp import encoding
+from src.meilisearch_mcp.encoding import encode_response
+
+
+@dataclass
+class Status:
+    available: bool
+    last_update: datetime
+
+
+def test_encode_response_is_compact_or_pretty(monkeypatch):
+    """Test that both backends emit the same compact or indented JSON"""
+    value = {
+        "status": Status(True, datetime(2024, 1, 1, 10, 0)),
+        "hits": [{"id": 1, "title": "Dune é"}],
+    }
+    expected = {
+        "status": {"available": True, "last_update": "2024-01-01T10:00:00"},
+        "hits": [{"id": 1, "title": "Dune é"}],
+    }
+
+    compact = encode_response(value)
+    assert json.loads(compact) == expected
+    assert " " not in compact.replace("Dune é", "")
+    assert "\n  " in encode_response(value, pretty=True)
+    assert json.loads(encode_response({"big": 1 << 70})) == {"big": 1 << 70}
+
+    monkeypatch.setattr(encoding, "orjson", None)
+    assert encode_response(value) == compact
+    assert json.loads(encode_response(value, pretty=True)) == expected
+    assert encode_response({"big": 1 << 70}) == '{"big":1180591620717411303424}'
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import httpx
+
+from src.meilisearch_mcp.instrumentation import (
+    LatencyHistogram,
+    PrometheusExporter,
+    ServerMetrics,
+    record_upstream_time,
+)
+
+
+def test_histogram_quantiles_use_bucket_bounds():
+    histogram = LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+    for seconds in (0.005, 0.005, 0.05, 0.5):
+        histogram.observe(seconds)
+    assert histogram.quantile(0.5) == 0.01
+    assert histogram.quantile(0.99) == 1.0
+    histogram.observe(5.0)
+    assert histogram.quantile(1.0) == ">1.0"
+
+
+def test_track_splits_upstream_and_local_time():
+    """Test that upstream time recorded inside a call is attributed to it"""
+    metrics = ServerMetrics()
+    with metrics.track("search"):
+        record_upstream_time(0.02)
+        time.sleep(0.03)
+    record_upstream_time(5.0)  # outside any tool call, ignored
+    metrics.record_error("search")
+
+    stats = metrics.get_stats()["search"]
+    assert stats["calls"] == 1
+    assert stats["errors"] == 1
+    assert stats["upstream"]["avg"] == 0.02
+    assert stats["local"]["avg"] >= 0.009
+
+
+def test_prometheus_endpoint_serves_exposition():
+    metrics = ServerMetrics()
+    with metrics.track("get-stats"):
+        pass
+
+    async def run():
+        exporter = PrometheusExporter(metrics, port=0)
+        await exporter.start()
+        async with httpx.AsyncClient() as client:
+            response = await client.get(f"http://127.0.0.1:{exporter.port}/metrics")
+        await exporter.stop()
+        return response
+
+    response = asyncio.run(run())
+    assert response.status_code == 200
+    assert (
+        'meilisearch_mcp_tool_duration_seconds_count{tool="get-stats"} 1'
+        in response.text
+    )
+
+
+def test_exposition_escapes_label_values():
+    """Test that a label value cannot inject lines into the exposition"""
+    metrics = ServerMetrics()
+    metrics.record_error('x"} 1\nevil_metric 42\\')
+
+    lines = metrics.exposition().splitlines()
+    assert not any(line.startswith("evil_metric") for line in lines)
+    assert (
+        'meilisearch_mcp_tool_errors_total{tool="x\\"} 1\\nevil_metric 42\\\\"} 1'
+        in lines
+    )
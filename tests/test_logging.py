@@ -0,0 +1,139 @@
+import gzip
+import hashlib
+import json
+import threading
+import time
+
+from src.meilisearch_mcp.logging import (
+    AsyncLogHandler,
+    FileLogHandler,
+    MCPLogger,
+    summarize_payload,
+)
+
+
+class GatedHandler(AsyncLogHandler):
+    """Collects records once the gate opens"""
+
+    def __init__(self, **kwargs):
+        self.gate = threading.Event()
+        self.records = []
+        super().__init__(**kwargs)
+
+    def _write_batch(self, records):
+        self.gate.wait()
+        self.records.extend(records)
+
+
+def read_records(log_dir):
+    records = []
+    for path in sorted(log_dir.iterdir()):
+        opener = gzip.open if path.suffix == ".gz" else open
+        with opener(path, "rt") as f:
+            records.extend(json.loads(line) for line in f)
+    return records
+
+
+def test_file_handler_writes_batches(tmp_path):
+    """Test that buffered records all reach the file by shutdown"""
+    handler = FileLogHandler(str(tmp_path))
+    for i in range(500):
+        handler.emit({"message": "event", "i": i})
+    handler.shutdown()
+
+    assert sorted(record["i"] for record in read_records(tmp_path)) == list(
+        range(500)
+    )
+
+
+def test_file_handler_rotates_by_size_and_compresses(tmp_path):
+    """Test that full files are renamed, gzipped and no record is lost"""
+    handler = FileLogHandler(str(tmp_path), max_bytes=2000, batch_size=10)
+    for i in range(300):
+        handler.emit({"message": "event", "i": i})
+    handler.shutdown()
+
+    names = [path.name for path in tmp_path.iterdir()]
+    assert any(name.endswith(".1.log.gz") for name in names)
+    assert not any(name.endswith(".tmp") for name in names)
+    assert sorted(record["i"] for record in read_records(tmp_path)) == list(
+        range(300)
+    )
+
+
+def test_overflow_policies_count_dropped_records():
+    """Test that a full buffer drops the oldest records or samples, and counts it"""
+    handler = GatedHandler(max_buffer=10, batch_size=1)
+    for i in range(50):
+        handler.emit({"i": i})
+    handler.gate.set()
+    handler.shutdown()
+    # One record may already be with the stalled writer
+    assert handler.records[-10:] == [{"i": i} for i in range(40, 50)]
+    assert handler.dropped == 50 - len(handler.records)
+
+    sampled = GatedHandler(max_buffer=10, batch_size=1, overflow="sample")
+    for i in range(100):
+        sampled.emit({"i": i})
+    sampled.gate.set()
+    sampled.shutdown()
+    assert sampled.get_stats()["dropped"] == 100 - len(sampled.records)
+    assert 5 < len(sampled.records) <= 16
+
+
+def test_block_policy_is_lossless_and_shutdown_is_prompt():
+    """Test that blocking emit loses nothing and shutdown does not poll"""
+    handler = GatedHandler(max_buffer=5, overflow="block")
+    emitter = threading.Thread(
+        target=lambda: [handler.emit({"i": i}) for i in range(100)]
+    )
+    emitter.start()
+    time.sleep(0.05)
+    assert emitter.is_alive()
+    handler.gate.set()
+    emitter.join()
+
+    assert handler.flush(timeout=5)
+    assert len(handler.records) == 100
+    start = time.perf_counter()
+    handler.shutdown()
+    assert time.perf_counter() - start < 0.5
+    assert handler.get_stats()["dropped"] == 0
+
+
+def test_summarize_payload_bounds_large_values():
+    """Test that oversized arrays and strings keep a head, counts and a hash"""
+    documents = [{"id": i, "title": "x" * 10} for i in range(1000)]
+    summary = summarize_payload({"documents": documents, "note": "y" * 5000})
+
+    assert summary["documents"]["_summary"] == "list"
+    assert summary["documents"]["count"] == 1000
+    assert summary["documents"]["bytes"] == len(
+        json.dumps(documents, separators=(",", ":"))
+    )
+    assert summary["documents"]["head"] == documents[:3]
+    assert summary["note"]["length"] == 5000
+    assert len(summary["note"]["head"]) == 1024
+    assert summarize_payload({"a": [1, 2]}) == {"a": [1, 2]}
+    assert summary["documents"]["sha256"] == summarize_payload(list(documents))[
+        "sha256"
+    ]
+    # Fingerprints encoded in slices match a one-shot encoding
+    by_id = {str(i): document for i, document in enumerate(documents)}
+    encoded = json.dumps(by_id, separators=(",", ":")).encode()
+    fingerprint = summarize_payload(by_id)
+    assert fingerprint["bytes"] == len(encoded)
+    assert fingerprint["sha256"] == hashlib.sha256(encoded).hexdigest()[:16]
+
+
+def test_logger_writes_summarized_records(tmp_path):
+    """Test that large tool arguments reach the log file summarized"""
+    logger = MCPLogger("test-summarized", str(tmp_path))
+    arguments = {"indexUid": "movies", "documents": [{"id": i} for i in range(5000)]}
+    logger.error("Error executing tool add-documents", arguments=arguments)
+    logger.shutdown()
+
+    (record,) = read_records(tmp_path)
+    assert record["arguments"]["indexUid"] == "movies"
+    assert record["arguments"]["documents"]["count"] == 5000
+    assert len(json.dumps(record)) < 2000
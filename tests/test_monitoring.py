@@ -0,0 +1,116 @@
+import asyncio
+
+import httpx
+
+from src.meilisearch_mcp.client import MeilisearchClient
+from src.meilisearch_mcp.monitoring import RingBuffer
+
+STATS = {
+    "databaseSize": 4096,
+    "lastUpdate": "2024-01-01T10:00:00Z",
+    "indexes": {
+        "movies": {"numberOfDocuments": 10, "isIndexing": False},
+        "books": {
+            "numberOfDocuments": 3,
+            "isIndexing": True,
+            "fieldDistribution": {"id": 3},
+        },
+    },
+}
+
+
+def run_health_check(detailed):
+    paths = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        paths.append(request.url.path)
+        if request.url.path == "/stats":
+            return httpx.Response(200, json=STATS)
+        return httpx.Response(
+            200,
+            json={
+                "numberOfDocuments": 10,
+                "isIndexing": False,
+                "fieldDistribution": {"id": 10},
+            },
+        )
+
+    async def run():
+        client = MeilisearchClient(
+            "http://meili.test", http_transport=httpx.MockTransport(handler)
+        )
+        status = await client.monitoring.get_health_status(detailed)
+        await client.close()
+        return status
+
+    return asyncio.run(run()), paths
+
+
+def test_health_status_uses_one_request():
+    """Test that the health check is built from a single /stats response"""
+    status, paths = run_health_check(detailed=False)
+    assert paths == ["/stats"]
+    assert status.indexes_count == 2
+    assert {info["uid"]: info["documents_count"] for info in status.indexes_info} == {
+        "movies": 10,
+        "books": 3,
+    }
+
+
+def test_detailed_health_status_fetches_only_missing_indexes():
+    """Test that detail falls back to per-index stats only where needed"""
+    status, paths = run_health_check(detailed=True)
+    assert paths == ["/stats", "/indexes/movies/stats"]
+    assert {
+        info["uid"]: info["field_distribution"] for info in status.indexes_info
+    } == {"movies": {"id": 10}, "books": {"id": 3}}
+
+
+def test_ring_buffer_keeps_latest_samples():
+    """Test that the ring buffer overwrites its oldest samples"""
+    buffer = RingBuffer(3)
+    for i in range(5):
+        buffer.append(float(i), float(i * 10))
+    assert buffer.since(0) == [(2.0, 20.0), (3.0, 30.0), (4.0, 40.0)]
+    assert buffer.since(3.5) == [(4.0, 40.0)]
+
+
+def test_metrics_history_reports_rates_without_requests():
+    """Test that history is summarized from recorded samples"""
+    counts = iter([100, 150, 200])
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        documents = next(counts)
+        return httpx.Response(
+            200,
+            json={
+                "databaseSize": documents * 10,
+                "indexes": {
+                    "movies": {
+                        "numberOfDocuments": documents,
+                        "isIndexing": documents < 200,
+                    }
+                },
+            },
+        )
+
+    async def run():
+        client = MeilisearchClient(
+            "http://meili.test", http_transport=httpx.MockTransport(handler)
+        )
+        for _ in range(3):
+            await client.monitoring.sampler.sample()
+        await client.close()
+        return client.monitoring.sampler
+
+    sampler = asyncio.run(run())
+    history = sampler.get_history(window=60)
+    movies = history["indexes"]["movies"]
+    assert movies["documents"]["min"] == 100
+    assert movies["documents"]["max"] == 200
+    assert movies["documents"]["rate_per_second"] > 0
+    assert movies["indexing_ratio"] == 2 / 3
+    assert history["database_size"]["latest"] == 2000
+    assert len(requests) == 3
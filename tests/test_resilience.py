@@ -0,0 +1,129 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from src.meilisearch_mcp.client import MeilisearchClient
+from src.meilisearch_mcp.errors import (
+    CircuitOpenError,
+    MeilisearchConnectionError,
+    MeilisearchNotFoundError,
+    MeilisearchServerError,
+    parse_retry_after,
+)
+from src.meilisearch_mcp.resilience import ResilienceConfig
+
+
+def make_client(handler, **resilience):
+    return MeilisearchClient(
+        "http://meili.test",
+        "secret",
+        http_transport=httpx.MockTransport(handler),
+        resilience=ResilienceConfig(backoff=0.001, **resilience),
+    )
+
+
+def test_reads_are_retried_honouring_retry_after():
+    """Test that reads retry transient failures and writes do not"""
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        if len(calls) == 1:
+            return httpx.Response(503, headers={"Retry-After": "0.05"})
+        if len(calls) == 2:
+            raise httpx.ConnectError("connection reset", request=request)
+        if request.url.path == "/tasks":
+            return httpx.Response(200, json={"results": []})
+        if request.method == "GET":
+            return httpx.Response(200, json={"databaseSize": 1})
+        return httpx.Response(503, json={"message": "busy", "code": "busy"})
+
+    async def run():
+        client = make_client(handler)
+        start = time.perf_counter()
+        stats = await client.get_stats()
+        elapsed = time.perf_counter() - start
+        try:
+            with pytest.raises(MeilisearchServerError):
+                await client.settings.update_settings("movies", {"stopWords": []})
+        finally:
+            await client.close()
+        return stats, elapsed
+
+    stats, elapsed = asyncio.run(run())
+    assert stats == {"databaseSize": 1}
+    assert elapsed >= 0.05
+    # update-settings reads pending tasks and current settings before its PATCH
+    assert calls == ["GET", "GET", "GET", "GET", "GET", "PATCH"]
+
+
+def test_circuit_opens_and_closes_after_a_trial_request():
+    """Test that a failing node is failed fast until its reset timeout"""
+    calls = []
+    failing = [True]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if failing[0]:
+            raise httpx.ConnectError("connection refused", request=request)
+        return httpx.Response(200, json={"results": []})
+
+    async def run():
+        client = make_client(
+            handler, retries=0, failure_threshold=2, reset_timeout=0.05
+        )
+        errors = []
+        for _ in range(3):
+            try:
+                await client.transport.get("/indexes")
+            except MeilisearchConnectionError as e:
+                errors.append(type(e))
+        failing[0] = False
+        await asyncio.sleep(0.06)
+        result = await client.transport.get("/indexes")
+        state = client.transport.endpoints.primary.breaker.state
+        await client.close()
+        return errors, result, state
+
+    errors, result, state = asyncio.run(run())
+    assert errors == [
+        MeilisearchConnectionError,
+        MeilisearchConnectionError,
+        CircuitOpenError,
+    ]
+    # The third call failed fast without reaching the node
+    assert len(calls) == 3
+    assert result == {"results": []}
+    assert state == "closed"
+
+
+def test_errors_are_typed_and_structured():
+    """Test that manager errors keep their Meilisearch type and fields"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            404,
+            json={
+                "message": "Index `missing` not found.",
+                "code": "index_not_found",
+                "type": "invalid_request",
+                "link": "https://docs.meilisearch.com/errors#index_not_found",
+            },
+        )
+
+    async def run():
+        client = make_client(handler)
+        try:
+            await client.settings.get_settings("missing")
+        finally:
+            await client.close()
+
+    with pytest.raises(MeilisearchNotFoundError) as info:
+        asyncio.run(run())
+    assert str(info.value).startswith("Failed to get settings: ")
+    assert info.value.to_dict()["code"] == "index_not_found"
+    assert info.value.to_dict()["type"] == "invalid_request"
+    assert not info.value.retryable
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
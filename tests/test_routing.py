@@ -0,0 +1,138 @@
+import asyncio
+
+import httpx
+
+from src.meilisearch_mcp.client import MeilisearchClient
+from src.meilisearch_mcp.routing import is_read_request
+
+PRIMARY = "http://primary.test"
+REPLICAS = ["http://replica-1.test", "http://replica-2.test"]
+
+
+def make_client(handler):
+    return MeilisearchClient(
+        PRIMARY,
+        "secret",
+        http_transport=httpx.MockTransport(handler),
+        replicas=REPLICAS,
+    )
+
+
+def test_is_read_request():
+    """Test that only searches, document and settings reads and stats are reads"""
+    assert is_read_request("POST", "/indexes/movies/search")
+    assert is_read_request("POST", "/multi-search")
+    assert is_read_request("POST", "/indexes/movies/documents/fetch")
+    assert is_read_request("GET", "/indexes/movies/documents/42")
+    assert is_read_request("GET", "/indexes/movies/settings/ranking-rules")
+    assert is_read_request("GET", "/stats")
+    assert not is_read_request("POST", "/indexes/movies/documents")
+    assert not is_read_request("PATCH", "/indexes/movies/settings")
+    assert not is_read_request("GET", "/tasks")
+    assert not is_read_request("GET", "/keys")
+
+
+def test_reads_spread_over_replicas_and_writes_go_to_primary():
+    """Test least-outstanding read routing across stand-in nodes"""
+    hosts = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        hosts.append(request.url.host)
+        if request.url.path.endswith("/search"):
+            # Slow searches keep every node busy, so each takes one
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"hits": []})
+        return httpx.Response(202, json={"taskUid": 1})
+
+    async def run():
+        client = make_client(handler)
+        await asyncio.gather(
+            *(
+                client.transport.post("/indexes/movies/search", {"q": str(i)})
+                for i in range(3)
+            )
+        )
+        reads = sorted(hosts)
+        hosts.clear()
+        await client.documents.add_documents("movies", [{"id": 1}])
+        await client.close()
+        return reads
+
+    reads = asyncio.run(run())
+    assert reads == ["primary.test", "replica-1.test", "replica-2.test"]
+    assert hosts == ["primary.test"]
+
+
+def test_failed_replica_is_ejected_and_readmitted():
+    """Test failover on a dead replica and re-admission by the health probe"""
+    down = {"replica-1.test"}
+    hosts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        if host in down:
+            raise httpx.ConnectError("connection refused", request=request)
+        if request.url.path == "/health":
+            return httpx.Response(200, json={"status": "available"})
+        hosts.append(host)
+        return httpx.Response(200, json={"numberOfDocuments": 1})
+
+    async def run():
+        client = make_client(handler)
+        pool = client.transport.endpoints
+        # replica-1 is picked after the primary is busy with another read
+        pool.primary.outstanding = 1
+        pool.replicas[1].outstanding = 1
+        stats = await client.transport.get("/indexes/movies/stats")
+        ejected = [endpoint.healthy for endpoint in pool.endpoints]
+
+        down.clear()
+        await pool.probe(client.transport.check_health)
+        readmitted = [endpoint.healthy for endpoint in pool.endpoints]
+        pool.primary.outstanding = pool.replicas[1].outstanding = 0
+        await client.close()
+        return stats, ejected, readmitted
+
+    stats, ejected, readmitted = asyncio.run(run())
+    assert stats == {"numberOfDocuments": 1}
+    # The read failed over from replica-1 to the next least-loaded node
+    assert hosts == ["primary.test"]
+    assert ejected == [True, False, True]
+    assert readmitted == [True, True, True]
+
+
+def test_new_url_drops_the_replicas():
+    """Test that switching to another primary stops routing to old replicas"""
+    hosts = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        hosts.append(request.url.host)
+        return httpx.Response(200, json={"numberOfDocuments": 1})
+
+    async def run():
+        client = make_client(handler)
+        pool = client.transport.endpoints
+        pool.primary.breaker.state = "open"
+        await client.update_connection(api_key="rotated")
+        kept = len(pool.replicas)
+
+        await client.update_connection(url="http://other.test")
+        for _ in range(3):
+            await client.transport.get("/indexes/movies/stats")
+        await client.close()
+        return kept, pool.get_stats()
+
+    kept, stats = asyncio.run(run())
+    assert kept == 2
+    assert hosts == ["other.test"] * 3
+    assert stats == [
+        {
+            "url": "http://other.test",
+            "role": "primary",
+            "healthy": True,
+            "circuit": "closed",
+            "outstanding": 0,
+            "requests": 3,
+            "failures": 0,
+        }
+    ]
@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+
+from src.meilisearch_mcp.instrumentation import ServerMetrics
+from src.meilisearch_mcp.scheduling import (
+    AdmissionRejected,
+    ClassLimits,
+    ToolScheduler,
+)
+
+
+def test_class_limits_and_priority_order():
+    """Test that bulk calls queue by priority without holding up interactive ones"""
+    metrics = ServerMetrics()
+    scheduler = ToolScheduler({"bulk": ClassLimits(1, 8)}, metrics)
+    order = []
+
+    async def call(name, tool_class, priority, gate):
+        async with scheduler.admit(tool_class, priority):
+            order.append(name)
+            await gate.wait()
+
+    async def run():
+        gate = asyncio.Event()
+        blocker = asyncio.create_task(call("export", "bulk", 1, gate))
+        await asyncio.sleep(0)
+        queued = [
+            asyncio.create_task(call("import", "bulk", 1, gate)),
+            asyncio.create_task(call("add", "bulk", 0, gate)),
+        ]
+        await asyncio.sleep(0.01)
+        # The interactive class has its own slots
+        search_gate = asyncio.Event()
+        search_gate.set()
+        await asyncio.wait_for(call("search", "interactive", 0, search_gate), 0.1)
+        stats = scheduler.get_stats()["bulk"]
+        gate.set()
+        await asyncio.gather(blocker, *queued)
+        return stats
+
+    stats = asyncio.run(run())
+    assert order == ["export", "search", "add", "import"]
+    assert stats["running"] == 1
+    assert stats["queued"] == 2
+    assert metrics.queue_wait["bulk"].count == 3
+    assert metrics.queue_wait["bulk"].sum > 0
+    assert "meilisearch_mcp_queue_wait_seconds_count" in metrics.exposition()
+
+
+def test_full_queue_rejects_with_retry_hint():
+    """Test fast rejection once a class's queue is full"""
+    metrics = ServerMetrics()
+    scheduler = ToolScheduler({"bulk": ClassLimits(1, 1)}, metrics)
+
+    async def hold(gate):
+        async with scheduler.admit("bulk"):
+            await gate.wait()
+
+    async def run():
+        gate = asyncio.Event()
+        tasks = [asyncio.create_task(hold(gate)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        try:
+            with pytest.raises(AdmissionRejected) as info:
+                async with scheduler.admit("bulk"):
+                    pass
+        finally:
+            gate.set()
+            await asyncio.gather(*tasks)
+        # Slots are free again once the queue drains
+        async with scheduler.admit("bulk"):
+            pass
+        return info.value
+
+    error = asyncio.run(run())
+    assert error.tool_class == "bulk"
+    assert error.retry_after > 0
+    assert "retry in" in str(error)
+    assert metrics.rejected == {"bulk": 1}
+    assert scheduler.get_stats()["bulk"]["running"] == 0
+
+
+def test_task_waits_do_not_hold_admin_slots():
+    """Test that long task waits leave the admin class free"""
+    scheduler = ToolScheduler()
+
+    async def run():
+        gate = asyncio.Event()
+
+        async def wait():
+            async with scheduler.admit("wait"):
+                await gate.wait()
+
+        waits = [asyncio.create_task(wait()) for _ in range(16)]
+        await asyncio.sleep(0.01)
+        async with scheduler.admit("admin") as waited:
+            stats = scheduler.get_stats()
+        gate.set()
+        await asyncio.gather(*waits)
+        return waited, stats
+
+    waited, stats = asyncio.run(run())
+    assert waited < 0.01
+    assert stats["wait"]["running"] == 16
+    assert stats["admin"]["running"] == 1
@@ -1,4 +1,19 @@
+import asyncio
+import socket
+
+import httpx
 import pytest
+import uvicorn
+from mcp import ClientSession
+
+try:
+    from mcp.client.streamable_http import streamable_http_client
+except ImportError:  # SDK versions before the rename
+    from mcp.client.streamable_http import (
+        streamablehttp_client as streamable_http_client,
+    )
+
+from src.meilisearch_mcp.client import MeilisearchClient
 from src.meilisearch_mcp.server import create_server
 
 
@@ -7,3 +22,207 @@ def test_server_creation():
     server = create_server()
     assert server is not None
     assert server.meili_client is not None
+
+
+class RecordingSession:
+    def __init__(self):
+        self.messages = []
+
+    async def send_log_message(self, level, data, logger=None):
+        self.messages.append((level, data))
+
+
+def test_task_status_changes_are_pushed_to_session():
+    """Test that watched tasks send a log notification per status change"""
+    statuses = iter(["enqueued", "processing", "processing", "succeeded"])
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        status = next(statuses)
+        task = {"uid": 5, "indexUid": "movies", "status": status, "type": "x"}
+        if status == "succeeded":
+            task["details"] = {"indexedDocuments": 3}
+            task["duration"] = "PT0.5S"
+        return httpx.Response(200, json={"results": [task]})
+
+    async def run():
+        server = create_server(task_notifications=True)
+        server.meili_client = MeilisearchClient(
+            "http://meili.test", http_transport=httpx.MockTransport(handler)
+        )
+        server.meili_client.tasks.min_poll_interval = 0.01
+        server.meili_client.tasks.add_status_listener(server._notify_task_status)
+        session = RecordingSession()
+        server._task_sessions[5] = session
+        server.meili_client.tasks.watch_tasks([5])
+        await server.meili_client.tasks._poller
+        await server.meili_client.close()
+        return server, session
+
+    server, session = asyncio.run(run())
+    assert [data["status"] for _, data in session.messages] == [
+        "enqueued",
+        "processing",
+        "succeeded",
+    ]
+    assert session.messages[-1][1]["indexedDocuments"] == 3
+    assert server._task_sessions == {}
+
+
+def test_tool_list_is_built_once():
+    """Test that every tool is listed and the list is cached"""
+    server = create_server()
+    tools = server.tools.list_tools()
+    assert tools is server.tools.list_tools()
+    assert len({tool.name for tool in tools}) == len(tools)
+    assert "search" in server.tools
+
+
+def test_invalid_arguments_are_rejected_before_any_request():
+    """Test that schema violations fail fast without calling Meilisearch"""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/tasks":
+            return httpx.Response(
+                200, json={"results": [{"uid": 1, "status": "succeeded"}]}
+            )
+        return httpx.Response(200, json={"hits": []})
+
+    async def run():
+        server = create_server()
+        server.meili_client = MeilisearchClient(
+            "http://meili.test", http_transport=httpx.MockTransport(handler)
+        )
+        results = [
+            await server.dispatch_tool("search", {"indexUid": "movies"}),
+            await server.dispatch_tool("search", {"query": "dune", "limit": "10"}),
+            await server.dispatch_tool("get-task", {"taskUid": True}),
+            await server.dispatch_tool("no-such-tool", {}),
+            await server.dispatch_tool(
+                "search", {"query": "dune", "indexUid": "movies", "offset": None}
+            ),
+            await server.dispatch_tool(
+                "wait-for-tasks", {"taskUids": [1], "timeoutMs": None}
+            ),
+        ]
+        await server.meili_client.close()
+        return [result[0].text for result in results], sorted(server.metrics.tools)
+
+    texts, tracked = asyncio.run(run())
+    assert texts[0] == "Error: arguments.query is required"
+    assert texts[1] == "Error: arguments.limit must be of type integer"
+    assert texts[2] == "Error: arguments.taskUid must be of type integer"
+    assert texts[3] == "Error: Unknown tool: no-such-tool"
+    assert texts[4].startswith("Search results for 'dune'")
+    # Null optional arguments fall back to their defaults
+    assert texts[5].startswith("Tasks: ")
+    assert len(requests) == 2
+    # Unregistered tool names share one metrics series
+    assert tracked == ["get-task", "search", "unknown"]
+
+
+def test_http_transport_serves_sessions_from_one_client():
+    """Test that concurrent streamable HTTP sessions share one Meilisearch client"""
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"hits": [{"id": 1}]})
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    async def session(url):
+        async with streamable_http_client(url) as (read_stream, write_stream, _):
+            async with ClientSession(read_stream, write_stream) as client:
+                await client.initialize()
+                result = await client.call_tool(
+                    "search", {"query": "dune", "indexUid": "movies"}
+                )
+                return result.content[0].text
+
+    async def run():
+        server = create_server()
+        server.meili_client = MeilisearchClient(
+            "http://meili.test", http_transport=httpx.MockTransport(handler)
+        )
+        http = uvicorn.Server(
+            uvicorn.Config(
+                server.create_http_app("127.0.0.1", port),
+                host="127.0.0.1",
+                port=port,
+                log_level="error",
+            )
+        )
+        serving = asyncio.create_task(http.serve())
+        while not http.started:
+            await asyncio.sleep(0.01)
+        url = f"http://127.0.0.1:{port}/mcp"
+        texts = await asyncio.gather(session(url), session(url), session(url))
+        http.should_exit = True
+        await serving
+        await server.meili_client.close()
+        return (
+            texts,
+            server.meili_client.search_cache.get_stats(),
+            server.meili_client.transport.flights.get_stats(),
+        )
+
+    texts, cache_stats, flight_stats = asyncio.run(run())
+    assert all(text.startswith("Search results for 'dune'") for text in texts)
+    assert cache_stats["hits"] + cache_stats["misses"] == 3
+    # Concurrent misses share one request
+    assert len(requests) == cache_stats["misses"] - flight_stats["coalesced"]
+
+
+def test_http_app_requires_token_and_checks_hosts():
+    """Test bearer auth, DNS rebinding protection and restricted HTTP tools"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    initialize = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2025-03-26",
+            "capabilities": {},
+            "clientInfo": {"name": "test", "version": "1"},
+        },
+    }
+    headers = {"Accept": "application/json, text/event-stream"}
+
+    async def run():
+        server = create_server()
+        with pytest.raises(ValueError, match="MEILI_MCP_HTTP_TOKEN"):
+            server.create_http_app("0.0.0.0", port)
+        app = server.create_http_app("127.0.0.1", port, token="s3cret")
+        tools = [tool.name for tool in server.tools.list_tools()]
+        http = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=port, log_level="error")
+        )
+        serving = asyncio.create_task(http.serve())
+        while not http.started:
+            await asyncio.sleep(0.01)
+        url = f"http://127.0.0.1:{port}/mcp"
+        async with httpx.AsyncClient() as client:
+            anonymous = await client.post(url, json=initialize, headers=headers)
+            authorized = {**headers, "Authorization": "Bearer s3cret"}
+            rebound = await client.post(
+                url,
+                json=initialize,
+                headers={**authorized, "Host": f"attacker.test:{port}"},
+            )
+            accepted = await client.post(url, json=initialize, headers=authorized)
+        http.should_exit = True
+        await serving
+        await server.meili_client.close()
+        return tools, anonymous.status_code, rebound.status_code, accepted.status_code
+
+    tools, anonymous, rebound, accepted = asyncio.run(run())
+    assert "search" in tools
+    assert "import-documents" not in tools
+    assert "update-connection-settings" not in tools
+    assert (anonymous, rebound, accepted) == (401, 421, 200)
@@ -0,0 +1,59 @@
+import gzip
+import json
+
+from src.meilisearch_mcp.streams import DocumentFileReader, detect_format
+
+
+def test_detect_format():
+    assert detect_format("movies.ndjson.gz") == "ndjson"
+    assert detect_format("movies.jsonl") == "ndjson"
+    assert detect_format("movies.CSV") == "csv"
+    assert detect_format("movies.json") == "json"
+
+
+def test_ndjson_chunks_are_size_bounded(tmp_path):
+    """Test that gzip NDJSON is split on line boundaries within the byte bound"""
+    path = tmp_path / "movies.ndjson.gz"
+    with gzip.open(path, "wt") as f:
+        for i in range(100):
+            f.write(json.dumps({"id": i, "title": f"Movie {i}"}) + "\n")
+
+    with DocumentFileReader(str(path), max_chunk_bytes=256) as reader:
+        chunks = list(reader.chunks())
+        assert reader.compressed
+        assert reader.documents == 100
+        assert reader.content_type == "application/x-ndjson"
+
+    assert all(len(chunk) <= 256 for chunk in chunks)
+    ids = [json.loads(line)["id"] for chunk in chunks for line in chunk.splitlines()]
+    assert ids == list(range(100))
+
+
+def test_csv_chunks_keep_header_and_quoted_newlines(tmp_path):
+    """Test that CSV chunks repeat the header and never split a quoted field"""
+    path = tmp_path / "movies.csv"
+    rows = ['{},"Line one\nline two, ""quoted"""'.format(i) for i in range(20)]
+    path.write_text("id,overview\n" + "\n".join(rows) + "\n")
+
+    with DocumentFileReader(str(path), max_chunk_bytes=120) as reader:
+        chunks = list(reader.chunks())
+        assert reader.documents == 20
+
+    assert len(chunks) > 1
+    for chunk in chunks:
+        assert chunk.startswith(b"id,overview\n")
+        assert chunk.count(b'"') % 2 == 0
+
+
+def test_json_array_is_streamed_as_ndjson(tmp_path, monkeypatch):
+    """Test that JSON arrays decode incrementally across read blocks"""
+    monkeypatch.setattr("src.meilisearch_mcp.streams.READ_BLOCK", 16)
+    path = tmp_path / "movies.json"
+    documents = [{"id": i, "tags": ["a", "b"], "text": "x" * i} for i in range(30)]
+    path.write_text(json.dumps(documents, indent=2))
+
+    with DocumentFileReader(str(path), max_chunk_bytes=200) as reader:
+        chunks = list(reader.chunks())
+
+    decoded = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert decoded == documents
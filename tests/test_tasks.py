@@ -0,0 +1,119 @@
+import asyncio
+
+import httpx
+import pytest
+
+from src.meilisearch_mcp.client import MeilisearchClient
+
+
+def test_concurrent_waits_share_one_poll_per_tick():
+    """Test that waiters on different tasks are resolved by batched polls"""
+    polls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        uids = [int(uid) for uid in request.url.params["uids"].split(",")]
+        polls.append(uids)
+        status = "succeeded" if len(polls) >= 3 else "enqueued"
+        return httpx.Response(
+            200,
+            json={"results": [{"uid": uid, "status": status} for uid in uids]},
+        )
+
+    async def run():
+        client = MeilisearchClient(
+            "http://meili.test", http_transport=httpx.MockTransport(handler)
+        )
+        client.tasks.min_poll_interval = 0.01
+        results = await asyncio.gather(
+            client.tasks.wait_for_tasks([1, 2]),
+            client.tasks.wait_for_tasks([2, 3]),
+        )
+        await client.close()
+        return results
+
+    first, second = asyncio.run(run())
+    assert [task["uid"] for task in first["tasks"]] == [1, 2]
+    assert [task["uid"] for task in second["tasks"]] == [2, 3]
+    assert not first["timedOut"] and not second["timedOut"]
+    assert len(polls) == 3
+    assert polls[-1] == [1, 2, 3]
+
+
+def test_wait_times_out_with_pending_tasks():
+    """Test that a timeout reports the tasks that are still pending"""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200, json={"results": [{"uid": 7, "status": "processing"}]}
+        )
+
+    async def run():
+        client = MeilisearchClient(
+            "http://meili.test", http_transport=httpx.MockTransport(handler)
+        )
+        result = await client.tasks.wait_for_tasks([7], timeout=0.1)
+        waiters = dict(client.tasks._waiters)
+        await client.close()
+        return result, waiters
+
+    result, waiters = asyncio.run(run())
+    assert result == {"tasks": [], "pending": [7], "timedOut": True}
+    assert waiters == {}
+
+
+def test_failed_polls_back_off_before_giving_up():
+    """Test that a failed poll is retried, and repeated failures fail waits"""
+    polls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        polls.append(request)
+        if len(polls) <= 2 or request.url.params["uids"] == "9":
+            return httpx.Response(
+                401, json={"message": "Invalid key", "code": "invalid_api_key"}
+            )
+        return httpx.Response(
+            200, json={"results": [{"uid": 7, "status": "succeeded"}]}
+        )
+
+    async def run():
+        client = MeilisearchClient(
+            "http://meili.test", http_transport=httpx.MockTransport(handler)
+        )
+        client.tasks.min_poll_interval = 0.01
+        client.tasks.max_poll_failures = 3
+        abandoned = []
+        client.tasks.add_abandon_listener(abandoned.extend)
+        recovered = await client.tasks.wait_for_tasks([7])
+
+        client.tasks.watch_tasks([9])
+        with pytest.raises(Exception, match="invalid_api_key"):
+            await client.tasks.wait_for_tasks([9])
+        watched = set(client.tasks._watched)
+        await client.close()
+        return recovered, abandoned, watched
+
+    recovered, abandoned, watched = asyncio.run(run())
+    assert recovered["tasks"] == [{"uid": 7, "status": "succeeded"}]
+    assert len(polls) == 6
+    assert abandoned == [9]
+    assert watched == set()
+
+
+def test_wait_without_task_uids_returns_at_once():
+    """Test that an empty wait neither polls nor fails"""
+    polls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        polls.append(request)
+        return httpx.Response(200, json={"results": []})
+
+    async def run():
+        client = MeilisearchClient(
+            "http://meili.test", http_transport=httpx.MockTransport(handler)
+        )
+        result = await client.tasks.wait_for_tasks([])
+        await client.close()
+        return result
+
+    assert asyncio.run(run()) == {"tasks": [], "pending": [], "timedOut": False}
+    assert polls == []